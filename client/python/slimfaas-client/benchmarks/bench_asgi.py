@@ -0,0 +1,138 @@
+"""
+Micro-benchmark of the ASGI adapter.
+
+Measures the per-request cost of serving a minimal ASGI application:
+
+- called directly with in-memory ``receive``/``send`` (the floor),
+- through :class:`ASGIHandler` and the client's sync request path, from the
+  SYNC_REQUEST_START frame to the last encoded response frame,
+- over HTTP/1.1 keep-alive on loopback with uvicorn (if installed), i.e.
+  the same application served directly.
+
+Run:
+    uv run --with uvicorn benchmarks/bench_asgi.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import time
+
+from slimfaas_client import ASGIHandler, SlimFaasClient, SlimFaasClientConfig
+from slimfaas_client._models import BinaryFrame, MessageType
+
+ITERATIONS = 20_000
+BODY = b'{"order": 42, "items": [1, 2, 3]}' * 8
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def direct(iterations: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/orders", "headers": [], "query_string": b""}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(scope, receive, send)
+    return time.perf_counter() - started
+
+
+class NullWebSocket:
+    async def send(self, data, text=None) -> None:
+        pass
+
+
+async def adapter(iterations: int) -> float:
+    client = SlimFaasClient("ws://bench", SlimFaasClientConfig(function_name="bench"))
+    ws = NullWebSocket()
+    client._ws = ws  # type: ignore[assignment]
+    client.on_sync_request(ASGIHandler(app, lifespan="off"))
+    start_payload = json.dumps({
+        "method": "POST",
+        "path": "/orders",
+        "query": "",
+        "headers": {"Content-Type": ["application/json"], "Content-Length": [str(len(BODY))]},
+    }).encode()
+    tasks = client.concurrency.sync_requests._tasks
+    started = time.perf_counter()
+    for i in range(iterations):
+        corr = f"{i:036d}"
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start_payload)))  # type: ignore[arg-type]
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, corr, BODY)))  # type: ignore[arg-type]
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+        for task in list(tasks):
+            await task
+    return time.perf_counter() - started
+
+
+async def http(iterations: int) -> float:
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error", lifespan="off"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (
+        b"POST /orders HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+    )
+    started = time.perf_counter()
+    for _ in range(iterations):
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+    elapsed = time.perf_counter() - started
+    writer.close()
+    server.should_exit = True
+    await serving
+    return elapsed
+
+
+def main() -> None:
+    candidates = [("ASGI direct", direct), ("ASGIHandler", adapter)]
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        print(f"{'uvicorn HTTP':<16} not installed")
+    else:
+        candidates.append(("uvicorn HTTP", http))
+
+    reference = None
+    for name, func in candidates:
+        seconds = min(asyncio.run(func(ITERATIONS)) for _ in range(3))
+        per_request = seconds / ITERATIONS * 1e6
+        reference = reference or per_request
+        print(
+            f"{name:<16} {per_request:7.2f} µs/request  "
+            f"{ITERATIONS / seconds:>10,.0f} requests/s  x{reference / per_request:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark of the JSON codecs on SlimFaas control messages.
+
+Measures the per-message cost of decoding an AsyncRequest envelope and
+encoding its AsyncCallback, for every codec installed.
+
+Run:
+    uv run --with orjson --with msgspec benchmarks/bench_json_codec.py
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import timeit
+
+from slimfaas_client import MsgspecJsonCodec, OrjsonCodec, StdlibJsonCodec
+from slimfaas_client._models import MessageType
+
+ITERATIONS = 50_000
+
+ASYNC_REQUEST = json.dumps({
+    "type": MessageType.ASYNC_REQUEST,
+    "correlationId": "0b7c5d1e-8a0f-4f4e-9f53-0f5d8b6f2b11",
+    "payload": {
+        "elementId": "0b7c5d1e-8a0f-4f4e-9f53-0f5d8b6f2b11",
+        "method": "POST",
+        "path": "/orders/42/process",
+        "query": "?priority=high",
+        "headers": {
+            "Content-Type": ["application/json"],
+            "Accept": ["application/json"],
+            "traceparent": ["00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"],
+            "User-Agent": ["bench/1.0"],
+        },
+        "body": base64.b64encode(b'{"order": 42, "items": [1, 2, 3]}' * 8).decode(),
+        "isLastTry": False,
+        "tryNumber": 1,
+    },
+})
+
+CALLBACK = {
+    "type": MessageType.ASYNC_CALLBACK,
+    "correlationId": "0b7c5d1e-8a0f-4f4e-9f53-0f5d8b6f2b11",
+    "payload": {"elementId": "0b7c5d1e-8a0f-4f4e-9f53-0f5d8b6f2b11", "statusCode": 200},
+}
+
+
+def baseline() -> None:
+    # What the client did before codecs: json.loads + json.dumps + str -> bytes.
+    json.loads(ASYNC_REQUEST)
+    json.dumps(CALLBACK).encode("utf-8")
+
+
+def main() -> None:
+    candidates = [("stdlib (before)", baseline)]
+    for factory in (StdlibJsonCodec, OrjsonCodec, MsgspecJsonCodec):
+        try:
+            codec = factory()
+        except ImportError:
+            print(f"{factory.name:<16} not installed")
+            continue
+
+        def run(codec=codec) -> None:
+            codec.loads(ASYNC_REQUEST)
+            codec.dumps(CALLBACK)
+
+        candidates.append((codec.name, run))
+
+    reference = None
+    for name, func in candidates:
+        seconds = min(timeit.repeat(func, number=ITERATIONS, repeat=5))
+        per_message = seconds / ITERATIONS * 1e6
+        reference = reference or per_message
+        print(
+            f"{name:<16} {per_message:7.2f} µs/message  "
+            f"{ITERATIONS / seconds:>10,.0f} messages/s  x{reference / per_message:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -43,13 +43,44 @@ Quick start::
     asyncio.run(main())
 """
 
+from slimfaas_client._asgi import ASGIHandler
+from slimfaas_client._buffering import ResponseBuffering
 from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._compression import ResponseCompression
+from slimfaas_client._concurrency import ConcurrencyBudget, ConcurrencyLimiter
+from slimfaas_client._executors import (
+    BlockingBodyReader,
+    BlockingResponseWriter,
+    ProcessPoolHandler,
+    ThreadPoolHandler,
+)
+from slimfaas_client._flow_control import SyncBodyFlowControl
+from slimfaas_client._idempotency import IdempotencyCache
+from slimfaas_client._loop_monitor import LoopMonitor
+from slimfaas_client._metrics import ClientMetrics, Histogram
+from slimfaas_client._json import (
+    JsonCodec,
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    default_json_codec,
+)
+from slimfaas_client._outbound import OutboundQueue, SendPriority
+from slimfaas_client._outbox import CallbackOutbox
+from slimfaas_client._pool import SlimFaasClientPool
+from slimfaas_client._response_cache import ResponseCache
+from slimfaas_client._router import Router
+from slimfaas_client._single_flight import SingleFlight
+from slimfaas_client._spool import BodySpooler, SpooledBody
+from slimfaas_client._tracing import OpenTelemetryTracer, TraceContext, Tracer, get_trace_context
+from slimfaas_client._wsgi import WSGIHandler
 from slimfaas_client._models import (
     AsyncRequest,
     AsyncCallback,
     BinaryFrame,
     FunctionVisibility,
     FunctionTrust,
+    Headers,
     PublishEvent,
     SlimFaasClientConfig,
     SubscribeEventConfig,
@@ -62,18 +93,52 @@ from slimfaas_client._models import (
 
 __all__ = [
     "SlimFaasClient",
+    "SlimFaasClientPool",
     "SlimFaasClientConfig",
+    "Router",
+    "ASGIHandler",
+    "WSGIHandler",
+    "ClientMetrics",
+    "Histogram",
+    "LoopMonitor",
+    "Tracer",
+    "TraceContext",
+    "OpenTelemetryTracer",
+    "get_trace_context",
+    "ConcurrencyBudget",
+    "ConcurrencyLimiter",
+    "ProcessPoolHandler",
+    "ThreadPoolHandler",
+    "BlockingBodyReader",
+    "BlockingResponseWriter",
     "FunctionVisibility",
     "FunctionTrust",
     "SubscribeEventConfig",
     "PathVisibilityConfig",
     "AsyncRequest",
     "AsyncCallback",
+    "Headers",
     "BinaryFrame",
     "PublishEvent",
     "SyncBodyStream",
+    "SyncBodyFlowControl",
+    "OutboundQueue",
+    "CallbackOutbox",
+    "IdempotencyCache",
+    "SendPriority",
+    "BodySpooler",
+    "SpooledBody",
+    "JsonCodec",
+    "StdlibJsonCodec",
+    "OrjsonCodec",
+    "MsgspecJsonCodec",
+    "default_json_codec",
     "SyncRequest",
     "SyncResponse",
     "SyncResponseWriter",
+    "ResponseBuffering",
+    "ResponseCompression",
+    "ResponseCache",
+    "SingleFlight",
 ]
 
@@ -0,0 +1,212 @@
+"""
+ASGI adapter: serve an ASGI application (FastAPI, Starlette, …) through the
+synchronous streaming path.
+
+Each :class:`SyncRequest` becomes an ASGI ``http`` scope. Request body
+chunks are handed to the application as they arrive, and response messages
+are written to the :class:`SyncResponseWriter` as they are sent, so neither
+direction is buffered by the adapter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, MutableMapping, Optional
+from urllib.parse import unquote
+
+from slimfaas_client._models import SyncRequest
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]], Awaitable[None]]
+
+_ASGI = {"version": "3.0", "spec_version": "2.3"}
+
+
+def _encode_headers(headers: dict[str, list[str]]) -> list[tuple[bytes, bytes]]:
+    return [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, values in headers.items()
+        for value in values
+    ]
+
+
+def _decode_headers(raw: Any) -> dict[str, list[str]]:
+    headers: dict[str, list[str]] = {}
+    for name, value in raw or ():
+        headers.setdefault(bytes(name).decode("latin-1"), []).append(bytes(value).decode("latin-1"))
+    return headers
+
+
+class ASGIHandler:
+    """
+    Sync request handler running an ASGI 3 application.
+
+    ::
+
+        from fastapi import FastAPI
+        from slimfaas_client import ASGIHandler
+
+        app = FastAPI()
+        client.on_sync_request(ASGIHandler(app))
+
+    The application's lifespan (``startup``/``shutdown`` events, e.g.
+    FastAPI ``lifespan=`` or ``on_event`` handlers) runs when the client
+    starts, before it registers with SlimFaas, and when it is closed. With
+    ``lifespan="auto"`` (default) an application that does not support the
+    lifespan protocol is accepted; ``"on"`` makes that an error and
+    ``"off"`` skips it.
+
+    Parameters
+    ----------
+    app:
+        The ASGI application.
+    lifespan:
+        ``"auto"``, ``"on"`` or ``"off"``.
+    root_path:
+        ``root_path`` of every scope, e.g. ``/function/my-function`` so the
+        application builds URLs as seen through SlimFaas.
+    """
+
+    def __init__(self, app: ASGIApp, *, lifespan: str = "auto", root_path: str = "") -> None:
+        if lifespan not in ("auto", "on", "off"):
+            raise ValueError("lifespan must be 'auto', 'on' or 'off'")
+        self.app = app
+        self.lifespan = lifespan
+        self.root_path = root_path
+        self.state: dict[str, Any] = {}
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._started: Optional[asyncio.Future] = None
+        self._stopped: Optional[asyncio.Future] = None
+
+    # ── Requests ─────────────────────────────────────────────────────────
+
+    async def __call__(self, req: SyncRequest) -> None:
+        scope: Scope = {
+            "type": "http",
+            "asgi": _ASGI,
+            "http_version": "1.1",
+            "method": req.method.upper(),
+            "scheme": "http",
+            "path": unquote(req.path),
+            "raw_path": req.path.encode("latin-1"),
+            "query_string": req.query.lstrip("?").encode("latin-1"),
+            "root_path": self.root_path,
+            "headers": _encode_headers(req.headers),
+            "client": None,
+            "server": None,
+            "state": dict(self.state),
+        }
+        chunks = req.body.__aiter__()
+        body_done = False
+        response_done = asyncio.Event()
+        writer = req.response
+
+        async def receive() -> Message:
+            nonlocal body_done
+            if not body_done:
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    body_done = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                return {"type": "http.request", "body": bytes(chunk), "more_body": True}
+            # Nothing more to read: report the disconnection once the response is sent.
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            kind = message["type"]
+            if kind == "http.response.start":
+                await writer.start(message["status"], _decode_headers(message.get("headers")))
+            elif kind == "http.response.body":
+                body = message.get("body", b"")
+                if body:
+                    await writer.write(body)
+                if not message.get("more_body", False):
+                    await writer.complete()
+                    response_done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_done.set()
+
+    # ── Lifespan (startup/shutdown hooks awaited by the client) ──────────
+
+    async def startup(self) -> None:
+        """Run the application's lifespan startup. Idempotent."""
+        if self.lifespan == "off":
+            return
+        if self._started is not None:
+            await asyncio.shield(self._started)
+            return
+        loop = asyncio.get_running_loop()
+        self._started = loop.create_future()
+        self._stopped = loop.create_future()
+        self._lifespan_queue = asyncio.Queue()
+        self._lifespan_queue.put_nowait({"type": "lifespan.startup"})
+        self._lifespan_task = asyncio.create_task(self._run_lifespan())
+        try:
+            await asyncio.shield(self._started)
+        except BaseException:
+            await self._reset()
+            raise
+
+    async def shutdown(self) -> None:
+        """Run the application's lifespan shutdown. Idempotent."""
+        if self._lifespan_task is None or self._lifespan_queue is None or self._stopped is None:
+            return
+        if not self._lifespan_task.done():
+            self._lifespan_queue.put_nowait({"type": "lifespan.shutdown"})
+        try:
+            await self._stopped
+        except Exception as exc:
+            logger.warning("ASGI lifespan shutdown failed: %s", exc)
+        await self._reset()
+
+    async def _reset(self) -> None:
+        task, self._lifespan_task = self._lifespan_task, None
+        self._started = self._stopped = self._lifespan_queue = None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
+
+    async def _run_lifespan(self) -> None:
+        started, stopped, queue = self._started, self._stopped, self._lifespan_queue
+        assert started is not None and stopped is not None and queue is not None
+
+        async def send(message: Message) -> None:
+            kind = message["type"]
+            if kind == "lifespan.startup.complete":
+                started.set_result(None)
+            elif kind == "lifespan.startup.failed":
+                started.set_exception(RuntimeError(f"ASGI lifespan startup failed: {message.get('message', '')}"))
+            elif kind == "lifespan.shutdown.complete":
+                stopped.set_result(None)
+            elif kind == "lifespan.shutdown.failed":
+                stopped.set_exception(RuntimeError(message.get("message", "")))
+
+        scope = {"type": "lifespan", "asgi": _ASGI, "state": self.state}
+        try:
+            await self.app(scope, queue.get, send)
+        except Exception as exc:
+            if not started.done():
+                if self.lifespan == "on":
+                    started.set_exception(exc)
+                else:
+                    logger.info("ASGI application does not support lifespan (%s)", exc)
+                    started.set_result(None)
+            elif not stopped.done():
+                stopped.set_exception(exc)
+        finally:
+            for future in (started, stopped):
+                if not future.done():
+                    future.set_result(None)
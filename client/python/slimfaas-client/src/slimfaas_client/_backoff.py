@@ -0,0 +1,51 @@
+"""
+Reconnection backoff.
+"""
+
+from __future__ import annotations
+
+import random
+
+
+class ExponentialBackoff:
+    """
+    Exponential reconnection delays with jitter.
+
+    The n-th consecutive failure waits a random delay between
+    ``(1 - jitter)`` and ``1`` times ``min(maximum, initial * multiplier ** n)``,
+    so that many workers disconnected at once do not reconnect in lockstep.
+    :meth:`reset` is called once a connection has been registered again.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        maximum: float = 60.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+    ) -> None:
+        if initial < 0 or maximum < initial:
+            raise ValueError("Delays must satisfy 0 <= initial <= maximum")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._attempts = 0
+
+    @property
+    def attempts(self) -> int:
+        """Consecutive failures since the last :meth:`reset`."""
+        return self._attempts
+
+    def next_delay(self) -> float:
+        """Delay before the next attempt; counts one more failure."""
+        ceiling = min(self.maximum, self.initial * self.multiplier ** min(self._attempts, 64))
+        self._attempts += 1
+        return ceiling * (1 - self.jitter * random.random())
+
+    def reset(self) -> None:
+        self._attempts = 0
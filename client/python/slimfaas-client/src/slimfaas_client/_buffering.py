@@ -0,0 +1,75 @@
+"""
+Write coalescing for synchronous responses.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+DEFAULT_FRAME_SIZE = 64 * 1024
+DEFAULT_MAX_FRAME_SIZE = 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 0.01
+
+
+class ResponseBuffering:
+    """
+    Coalesce small ``SyncResponseWriter.write()`` calls into larger frames.
+
+    Writes are buffered until ``frame_size`` bytes are pending, then sent as
+    one ``SYNC_RESPONSE_CHUNK`` frame; writes larger than ``max_frame_size``
+    are split into frames of at most that size so a single huge write does
+    not hold the socket. Buffered bytes are also sent ``flush_interval``
+    seconds after the first one was written (``None`` to only flush on
+    ``frame_size``, ``flush()`` and ``complete()``)::
+
+        buffering = ResponseBuffering(frame_size=32 * 1024, flush_interval=0.005)
+        client = SlimFaasClient(url, config, response_buffering=buffering)
+
+        buffering.snapshot()
+        # {"responses": 120, "frames": 480, "frames_per_response": 4.0, "bytes_per_frame": 31850.2, ...}
+
+    A single instance can be shared by several clients; it holds the
+    settings and totals for every completed response.
+    """
+
+    def __init__(
+        self,
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        if frame_size < 1 or max_frame_size < frame_size:
+            raise ValueError("Frame sizes must satisfy 1 <= frame_size <= max_frame_size")
+        if flush_interval is not None and flush_interval < 0:
+            raise ValueError("flush_interval must be positive or zero")
+        self.frame_size = frame_size
+        self.max_frame_size = max_frame_size
+        self.flush_interval = flush_interval
+        self._responses = 0
+        self._frames = 0
+        self._bytes = 0
+
+    def _record(self, frames: int, nbytes: int) -> None:
+        self._responses += 1
+        self._frames += frames
+        self._bytes += nbytes
+
+    @property
+    def frames_per_response(self) -> float:
+        """Average number of body frames per completed response."""
+        return self._frames / self._responses if self._responses else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        """Average size of the body frames sent."""
+        return self._bytes / self._frames if self._frames else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        """Totals and averages over completed responses."""
+        return {
+            "responses": self._responses,
+            "frames": self._frames,
+            "bytes": self._bytes,
+            "frames_per_response": self.frames_per_response,
+            "bytes_per_frame": self.bytes_per_frame,
+        }
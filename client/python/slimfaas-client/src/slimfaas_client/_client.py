@@ -5,18 +5,38 @@ SlimFaasClient — main WebSocket connection.
 from __future__ import annotations
 
 import asyncio
-import json
+import concurrent.futures
 import logging
+import signal
+import time
 import uuid
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, Optional, TypeVar, Union
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
+from slimfaas_client._backoff import ExponentialBackoff
+from slimfaas_client._buffering import ResponseBuffering
+from slimfaas_client._compression import ResponseCompression
+from slimfaas_client._concurrency import ConcurrencyLimiter
+from slimfaas_client._executors import as_async_handler, is_async_handler, run_handler_hooks
+from slimfaas_client._flow_control import SyncBodyFlowControl
+from slimfaas_client._idempotency import IdempotencyCache
+from slimfaas_client._json import JsonCodec, default_json_codec
+from slimfaas_client._loop_monitor import LoopMonitor
+from slimfaas_client._metrics import ClientMetrics
+from slimfaas_client._outbound import OutboundQueue, SendPriority
+from slimfaas_client._outbox import CallbackOutbox
+from slimfaas_client._response_cache import ResponseCache
+from slimfaas_client._router import Router
+from slimfaas_client._single_flight import Flight, SingleFlight
+from slimfaas_client._spool import BodySpooler
+from slimfaas_client._tracing import TracedResponse, Tracer, request_span
 from slimfaas_client._models import (
     AsyncCallback,
     AsyncRequest,
     BinaryFrame,
+    BytesLike,
     MessageType,
     PublishEvent,
     SlimFaasClientConfig,
@@ -24,14 +44,28 @@ from slimfaas_client._models import (
     SyncRequest,
     SyncResponse,
     SyncResponseWriter,
+    as_byte_view,
 )
 
 logger = logging.getLogger(__name__)
 
-# Type des callbacks
-AsyncRequestHandler = Callable[[AsyncRequest], Awaitable[int]]
-PublishEventHandler = Callable[[PublishEvent], Awaitable[None]]
-SyncRequestHandler = Callable[[SyncRequest], Awaitable[None]]
+DEFAULT_DRAIN_TIMEOUT = 30.0
+DRAIN_POLL_INTERVAL = 0.05
+
+# Type des callbacks (async, or blocking functions run on the handler thread pool)
+AsyncRequestHandler = Callable[[AsyncRequest], Union[Awaitable[int], int]]
+PublishEventHandler = Callable[[PublishEvent], Union[Awaitable[None], None]]
+SyncRequestHandler = Callable[[SyncRequest], Union[Awaitable[None], None]]
+H = TypeVar("H", bound=Callable)
+
+
+def _is_immutable(data: "BytesLike") -> bool:
+    return isinstance(data, bytes) or memoryview(data).readonly
+
+
+def _wire_size(text: str) -> int:
+    """UTF-8 size of a text frame; ASCII text (the usual case) is not re-encoded."""
+    return len(text) if text.isascii() else len(text.encode())
 
 
 class SlimFaasRegistrationError(Exception):
@@ -61,7 +95,10 @@ class SlimFaasClient:
 
     Callbacks registered via :meth:`on_async_request` and
     :meth:`on_publish_event` are invoked in separate asyncio tasks so they
-    do not block the read loop.
+    do not block the read loop. The number of tasks running at once is
+    bounded by a :class:`ConcurrencyLimiter`; work beyond the limit is
+    queued, and rejected once the queue is full (async requests are then
+    answered with 503 so SlimFaas retries them).
 
     Parameters
     ----------
@@ -70,9 +107,71 @@ class SlimFaasClient:
     config:
         Function/job configuration.
     reconnect_delay:
-        Seconds between reconnection attempts (default: 5 s).
+        Delay before the first reconnection attempt (default: 5 s). Later
+        attempts back off exponentially, with jitter.
+    max_reconnect_delay:
+        Upper bound of the reconnection delay (default: 60 s).
     ping_interval:
         Seconds between keepalive pings (default: 30 s, 0 to disable).
+    concurrency:
+        Admission controller for handler tasks. Defaults to
+        ``ConcurrencyLimiter.from_config(config)``, i.e. one budget of
+        ``number_parallel_request_per_pod`` per kind of work.
+    handler_threads:
+        Size of the thread pool running blocking (non-async) handlers
+        (default: ``ThreadPoolExecutor`` default).
+    flow_control:
+        Watermarks and global byte budget for buffered sync request bodies
+        (default: 1 MiB / 256 KiB per stream, 64 MiB in total). The read
+        loop stops pulling from the socket while a stream is over budget.
+    json_codec:
+        JSON codec for control messages. Defaults to :func:`default_json_codec`
+        (orjson, then msgspec, then the standard library).
+    spooler:
+        Spools request bodies above its threshold to temporary files
+        (:class:`SpooledBody`) instead of memory. Disabled by default.
+    outbound:
+        Outbound queue: every message is sent by a single writer task,
+        callbacks and pings ahead of sync response frames, with a byte
+        budget (default 4 MiB) that slows down fast response writers.
+    response_buffering:
+        Coalesce small sync response writes into larger frames and split
+        huge ones (see :class:`ResponseBuffering`). Disabled by default:
+        every ``write()`` is one frame.
+    response_compression:
+        Compress sync response bodies (gzip/br) for callers whose
+        ``Accept-Encoding`` allows it (see :class:`ResponseCompression`).
+        Disabled by default.
+    outbox:
+        Callbacks that cannot be sent while disconnected are kept here and
+        answer the redelivery of their element. Pass a :class:`CallbackOutbox`
+        with a ``path`` to persist them across restarts (default: in memory).
+    response_cache:
+        Cache of sync responses, bounded in bytes, with ``Cache-Control``
+        lifetimes and ``If-None-Match`` handling: hits are streamed from the
+        stored chunks without calling the handler (see
+        :class:`ResponseCache`). Disabled by default.
+    single_flight:
+        Identical concurrent sync requests share one handler execution and
+        receive copies of its response (see :class:`SingleFlight`).
+        Disabled by default.
+    idempotency:
+        Cache of the status computed per ``elementId``: redelivered async
+        requests are answered from it, or wait for the attempt already
+        running, instead of running the handler again. Disabled by default.
+    metrics:
+        Latency histograms and counters filled by the client (see
+        :class:`ClientMetrics` and :meth:`metrics`). Pass one with a
+        ``prometheus_port`` to serve them to Prometheus. Always recorded.
+    tracer:
+        Tracing hooks (see :class:`Tracer` and :class:`OpenTelemetryTracer`):
+        the caller's ``traceparent``/``tracestate`` are exposed through
+        :func:`get_trace_context` and spans are emitted for the queue wait,
+        the handler and the sync response stream. Disabled by default.
+    loop_monitor:
+        Measures event loop lag and reports, with their stack, the handlers
+        blocking the loop or running for too long, into :meth:`metrics`
+        (see :class:`LoopMonitor`). Disabled by default.
     """
 
     def __init__(
@@ -81,24 +180,72 @@ class SlimFaasClient:
         config: SlimFaasClientConfig,
         *,
         reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
         ping_interval: float = 30.0,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        handler_threads: Optional[int] = None,
+        flow_control: Optional[SyncBodyFlowControl] = None,
+        json_codec: Optional[JsonCodec] = None,
+        spooler: Optional[BodySpooler] = None,
+        outbound: Optional[OutboundQueue] = None,
+        response_buffering: Optional[ResponseBuffering] = None,
+        response_compression: Optional[ResponseCompression] = None,
+        outbox: Optional[CallbackOutbox] = None,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        idempotency: Optional[IdempotencyCache] = None,
+        metrics: Optional[ClientMetrics] = None,
+        tracer: Optional[Tracer] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
     ) -> None:
         self._url = url
         self._config = config
-        self._reconnect_delay = reconnect_delay
+        self._backoff = ExponentialBackoff(reconnect_delay, max(reconnect_delay, max_reconnect_delay))
         self._ping_interval = ping_interval
+        self._concurrency = concurrency or ConcurrencyLimiter.from_config(config)
+        self._handler_threads = handler_threads
+        self._flow_control = flow_control or SyncBodyFlowControl()
+        self._json = json_codec or default_json_codec()
+        self._spooler = spooler
+        self._outbound = outbound or OutboundQueue()
+        self._response_buffering = response_buffering
+        self._response_compression = response_compression
+        self._outbox = outbox if outbox is not None else CallbackOutbox()
+        self._response_cache = response_cache
+        self._single_flight = single_flight
+        self._idempotency = idempotency
+        self._metrics = metrics if metrics is not None else ClientMetrics()
+        self._metrics_started = False
+        self._tracer = tracer
+        self._loop_monitor = loop_monitor
+        self._thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # False for clients of a SlimFaasClientPool: the pool runs the shared handlers'
+        # hooks and closes the shared idempotency cache and outbox once.
+        self._owns_shared_state = True
 
         self._async_request_handler: Optional[AsyncRequestHandler] = None
         self._publish_event_handler: Optional[PublishEventHandler] = None
         self._sync_request_handler: Optional[SyncRequestHandler] = None
+        self._router: Optional[Router] = None
+        # Set by SlimFaasClientPool: whether this connection handles the events it receives.
+        self._event_gate: Optional[Callable[[], bool]] = None
 
         self._connection_id: Optional[str] = None
         self._ws: Optional[ClientConnection] = None
         self._running = False
+        self._draining = False
         self._stop_event = asyncio.Event()
 
         # Pending sync request body streams: correlationId -> SyncBodyStream
         self._pending_sync_bodies: dict[str, SyncBodyStream] = {}
+        # Sync requests waiting for a concurrency slot: correlationId -> SyncRequest
+        self._queued_sync_requests: dict[str, SyncRequest] = {}
+
+        # Element IDs whose handler returned 202 and still await send_callback()
+        self._deferred_callbacks: set[str] = set()
+
+        # Strong references to fire-and-forget tasks
+        self._background_tasks: set[asyncio.Task] = set()
 
     # ------------------------------------------------------------------
     # Async context manager
@@ -124,12 +271,18 @@ class SlimFaasClient:
         SlimFaas uses this code to manage retries.
         Returning 202 signals long-running processing: the callback is then
         responsible for sending the final result via :meth:`send_callback`.
+
+        A plain (non-async) function is run on the client's handler thread pool.
         """
-        self._async_request_handler = handler
+        self._async_request_handler = self._as_async_handler(handler)
 
     def on_publish_event(self, handler: PublishEventHandler) -> None:
-        """Register the callback invoked for each publish/subscribe event."""
-        self._publish_event_handler = handler
+        """
+        Register the callback invoked for each publish/subscribe event.
+
+        A plain (non-async) function is run on the client's handler thread pool.
+        """
+        self._publish_event_handler = self._as_async_handler(handler)
 
     def on_sync_request(self, handler: SyncRequestHandler) -> None:
         """
@@ -144,8 +297,105 @@ class SlimFaasClient:
                 await req.response.complete()
 
             client.on_sync_request(handle_sync)
+
+        A plain (non-async) function is run on the client's handler thread
+        pool; it then receives a blocking file-like ``req.body`` and a
+        blocking ``req.response`` (see :class:`BlockingResponseWriter`)::
+
+            def handle_sync(req):
+                data = req.body.read()
+                req.response.start(200, {"Content-Type": ["text/plain"]})
+                req.response.write(data)
+        """
+        self._sync_request_handler = self._as_async_handler(handler)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(self, method: str, path: str) -> Callable[[H], H]:
         """
-        self._sync_request_handler = handler
+        Decorator registering an async request handler for ``method`` and ``path``.
+
+        ``path`` may contain ``{name}`` parameters (one segment) and a final
+        ``{name:path}`` parameter (the rest of the path); their values are
+        in ``req.path_params``. ``method`` may be ``"*"``::
+
+            @client.route("POST", "/orders/{id}")
+            async def create_order(req: AsyncRequest) -> int:
+                order_id = req.path_params["id"]
+                return 200
+
+        Requests matching no route go to the handler registered with
+        :meth:`on_async_request` before the first route, if any, and are
+        answered with 404 (or 405 for a known path) otherwise.
+        """
+        def decorator(handler: H) -> H:
+            router = self.router
+            router.async_routes.add(method, path, self._as_async_handler(handler))
+            if self._async_request_handler is not router.async_handler:
+                router.async_fallback = self._async_request_handler
+                self._async_request_handler = router.async_handler
+            return handler
+        return decorator
+
+    def sync_route(self, method: str, path: str) -> Callable[[H], H]:
+        """
+        Decorator registering a sync request handler for ``method`` and ``path``
+        (same path syntax as :meth:`route`)::
+
+            @client.sync_route("GET", "/items/{id}")
+            async def get_item(req: SyncRequest) -> None:
+                await req.response.write(load(req.path_params["id"]))
+
+        Unmatched requests go to the previous :meth:`on_sync_request` handler,
+        or get a 404 (or 405) response.
+        """
+        def decorator(handler: H) -> H:
+            router = self.router
+            router.sync_routes.add(method, path, self._as_async_handler(handler))
+            if self._sync_request_handler is not router.sync_handler:
+                router.sync_fallback = self._sync_request_handler
+                self._sync_request_handler = router.sync_handler
+            return handler
+        return decorator
+
+    def on_event(self, event_name: str) -> Callable[[H], H]:
+        """
+        Decorator registering the handler of one publish/subscribe event::
+
+            @client.on_event("order-created")
+            async def order_created(evt: PublishEvent) -> None:
+                ...
+
+        Other events go to the previous :meth:`on_publish_event` handler, if any.
+        """
+        def decorator(handler: H) -> H:
+            router = self.router
+            if event_name in router.event_handlers:
+                raise ValueError(f"A handler for event '{event_name}' is already registered")
+            router.event_handlers[event_name] = self._as_async_handler(handler)
+            if self._publish_event_handler is not router.event_handler:
+                router.event_fallback = self._publish_event_handler
+                self._publish_event_handler = router.event_handler
+            return handler
+        return decorator
+
+    @property
+    def router(self) -> Router:
+        """Routes registered with :meth:`route`, :meth:`sync_route` and :meth:`on_event`."""
+        if self._router is None:
+            self._router = Router()
+        return self._router
+
+    def _as_async_handler(self, handler: Callable) -> Callable:
+        if is_async_handler(handler):
+            return handler
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._handler_threads, thread_name_prefix="slimfaas-handler"
+            )
+        return as_async_handler(handler, self._thread_pool)
 
     # ------------------------------------------------------------------
     # Main loop
@@ -158,6 +408,13 @@ class SlimFaasClient:
         """
         self._running = True
         self._stop_event.clear()
+        if self._owns_shared_state:
+            await self._run_handler_hooks("startup")
+        if not self._metrics_started:
+            self._metrics_started = True
+            await self._metrics.start()
+            if self._loop_monitor is not None:
+                await self._loop_monitor.start(self._metrics)
 
         while self._running:
             try:
@@ -168,12 +425,99 @@ class SlimFaasClient:
             except Exception as exc:
                 if not self._running:
                     break
+                delay = self._backoff.next_delay()
+                self._metrics.reconnects += 1
                 logger.warning(
-                    "WebSocket disconnected (%s). Reconnecting in %.1f s…",
+                    "WebSocket disconnected (%s). Reconnecting in %.1f s (attempt %d)…",
                     exc,
-                    self._reconnect_delay,
+                    delay,
+                    self._backoff.attempts,
+                )
+                await self._sleep_unless_closed(delay)
+            else:
+                if not self._running:
+                    break
+                delay = self._backoff.next_delay()
+                self._metrics.reconnects += 1
+                logger.info("WebSocket closed by SlimFaas. Reconnecting in %.1f s…", delay)
+                await self._sleep_unless_closed(delay)
+
+    async def _sleep_unless_closed(self, delay: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> bool:
+        """
+        Finish the work in progress, then :meth:`close` the client.
+
+        New AsyncRequests are answered with 503 and new sync requests get a
+        503 response, so SlimFaas retries them on another replica, while the
+        connection stays open for the work already accepted: running and
+        queued handlers complete, callbacks of handlers that returned 202
+        are awaited, and the outbound queue is flushed. Events keep being
+        handled until the client closes.
+
+        Returns ``True`` if everything finished within ``timeout`` seconds.
+        Callbacks still missing at the deadline are answered by SlimFaas
+        with 503 when the connection closes.
+        """
+        self._draining = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        logger.info(
+            "Draining: %d handler(s) running, %d queued, %d deferred callback(s)",
+            self._concurrency.in_flight, self._concurrency.queued, len(self._deferred_callbacks),
+        )
+        while not self._is_drained():
+            if loop.time() >= deadline:
+                logger.warning(
+                    "Drain timed out after %.1f s: %d handler(s) running, %d queued, %d deferred callback(s)",
+                    timeout, self._concurrency.in_flight, self._concurrency.queued, len(self._deferred_callbacks),
                 )
-                await asyncio.sleep(self._reconnect_delay)
+                break
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+        drained = self._is_drained()
+        await self.close()
+        return drained
+
+    def _is_drained(self) -> bool:
+        return (
+            self._concurrency.in_flight == 0
+            and self._concurrency.queued == 0
+            and not self._deferred_callbacks
+            and self._outbound.queued == 0
+        )
+
+    def drain_on_signals(
+        self,
+        timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        signals: tuple[signal.Signals, ...] = (signal.SIGTERM,),
+    ) -> None:
+        """
+        Call :meth:`drain` when the process receives one of ``signals``.
+
+        Must be called from the running event loop, typically right before
+        :meth:`run_forever`, which then returns once the drain completes::
+
+            client.drain_on_signals(timeout=25)   # below terminationGracePeriodSeconds
+            await client.run_forever()
+
+        Not supported on Windows (logged and ignored).
+        """
+        loop = asyncio.get_running_loop()
+        for sig in signals:
+            try:
+                loop.add_signal_handler(sig, self._on_drain_signal, sig, timeout)
+            except (NotImplementedError, RuntimeError) as exc:
+                logger.warning("Cannot install a handler for %s: %s", sig.name, exc)
+
+    def _on_drain_signal(self, sig: signal.Signals, timeout: float) -> None:
+        if self._draining:
+            return
+        logger.info("Received %s: draining for up to %.1f s", sig.name, timeout)
+        self._spawn(self.drain(timeout))
 
     async def close(self) -> None:
         """Shut down the client cleanly."""
@@ -181,6 +525,25 @@ class SlimFaasClient:
         self._stop_event.set()
         if self._ws is not None:
             await self._ws.close()
+        if self._owns_shared_state:
+            await self._run_handler_hooks("shutdown")
+            if self._idempotency is not None:
+                self._idempotency.close()
+            await self._outbox.persist()
+        if self._thread_pool is not None:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._metrics_started:
+            self._metrics_started = False
+            await self._metrics.stop()
+            if self._loop_monitor is not None:
+                await self._loop_monitor.stop()
+
+    async def _run_handler_hooks(self, name: str) -> None:
+        """Await the optional ``startup()``/``shutdown()`` hook of each handler (e.g. executors)."""
+        await run_handler_hooks(
+            (self._async_request_handler, self._publish_event_handler, self._sync_request_handler), name
+        )
 
     # ------------------------------------------------------------------
     # Manual callback (for long-running processing — status 202)
@@ -191,17 +554,17 @@ class SlimFaasClient:
         Manually send the result of an asynchronous request.
 
         Use this when the handler returned 202 to indicate long-running processing.
+        While the WebSocket is disconnected, the callback is kept in the
+        outbox and answers the redelivery of the element.
         """
+        self._deferred_callbacks.discard(element_id)
+        if self._idempotency is not None:
+            self._idempotency.put(element_id, status_code)
         if self._ws is None:
-            raise RuntimeError("WebSocket is not connected")
-        await self._send_json({
-            "type": MessageType.ASYNC_CALLBACK,
-            "correlationId": element_id,
-            "payload": {
-                "elementId": element_id,
-                "statusCode": status_code,
-            },
-        })
+            logger.info("Not connected: callback for elementId=%s queued in the outbox", element_id)
+            self._outbox.add(element_id, status_code)
+            return
+        await self._send_callback(self._ws, element_id, status_code)
 
     # ------------------------------------------------------------------
     # Internal implementation
@@ -215,7 +578,10 @@ class SlimFaasClient:
             logger.info("Connected. Registering function '%s' …", self._config.function_name)
 
             await self._register(ws)
+            self._backoff.reset()
 
+            self._outbound._attach(ws)
+            writer_task = asyncio.create_task(self._outbound._run())
             ping_task = asyncio.create_task(self._ping_loop(ws)) if self._ping_interval > 0 else None
 
             try:
@@ -223,7 +589,9 @@ class SlimFaasClient:
                     if isinstance(raw, bytes):
                         # Could be a binary sync frame
                         if len(raw) >= BinaryFrame.HEADER_SIZE:
-                            self._handle_binary_frame(ws, raw)
+                            congested = self._handle_binary_frame(ws, raw)
+                            if congested is not None:
+                                await congested._wait_drained()
                         else:
                             # Try to decode as UTF-8 text
                             try:
@@ -235,10 +603,13 @@ class SlimFaasClient:
             finally:
                 if ping_task is not None:
                     ping_task.cancel()
+                self._outbound._detach()
+                writer_task.cancel()
                 # Close all in-progress body streams (connection lost)
                 for stream in self._pending_sync_bodies.values():
                     stream._close()
                 self._pending_sync_bodies.clear()
+                self._queued_sync_requests.clear()
                 self._ws = None
 
     async def _register(self, ws: ClientConnection) -> None:
@@ -253,15 +624,14 @@ class SlimFaasClient:
 
         # Wait for the registration response
         async for raw in ws:
-            if isinstance(raw, bytes):
-                raw = raw.decode("utf-8")
-            msg = json.loads(raw)
+            msg = self._json.loads(raw)
             if msg.get("type") == MessageType.REGISTER_RESPONSE:
                 resp_payload = msg.get("payload", {})
                 if not resp_payload.get("success"):
                     error = resp_payload.get("error", "Unknown registration error")
                     raise SlimFaasRegistrationError(error)
                 self._connection_id = resp_payload.get("connectionId")
+                self._metrics.connections += 1
                 logger.info(
                     "Registered successfully. connectionId=%s",
                     self._connection_id,
@@ -271,9 +641,10 @@ class SlimFaasClient:
             logger.debug("Ignoring message during registration: type=%s", msg.get("type"))
 
     async def _handle_message(self, ws: ClientConnection, raw: str) -> None:
+        received = time.perf_counter()
         try:
-            msg = json.loads(raw)
-        except json.JSONDecodeError:
+            msg = self._json.loads(raw)
+        except ValueError:
             logger.warning("Received invalid JSON: %s", raw[:200])
             return
 
@@ -284,15 +655,54 @@ class SlimFaasClient:
             if payload is None:
                 logger.warning("AsyncRequest without payload")
                 return
-            req = AsyncRequest.from_payload(payload)
-            asyncio.create_task(self._dispatch_async_request(ws, req))
+            req = AsyncRequest.from_payload(payload, self._spooler)
+            metrics = self._metrics.async_request
+            metrics.bytes_in += _wire_size(raw)
+            submitted = time.perf_counter()
+            metrics.decode.observe(submitted - received)
+            known = self._outbox.take(req.element_id)
+            if known is None and self._idempotency is not None:
+                known = self._idempotency.lookup(req.element_id)
+            if known is not None:
+                # Redelivery of a completed (or 202-deferred) request, or one whose callback
+                # was lost with the previous connection: answer without waiting for a slot.
+                logger.info("AsyncRequest %s already handled (try %d): status %d", req.element_id, req.try_number, known)
+                if known == 202:
+                    self._deferred_callbacks.add(req.element_id)
+                else:
+                    req._release_body()
+                    await self._send_callback(ws, req.element_id, known)
+            elif self._draining:
+                logger.info("AsyncRequest %s refused while draining. Returning 503.", req.element_id)
+                await self._send_callback(ws, req.element_id, 503)
+            elif not self._concurrency.async_requests.submit(
+                lambda: self._dispatch_async_request(ws, req, submitted)
+            ):
+                logger.warning(
+                    "AsyncRequest %s rejected: concurrency queue is full. Returning 503.",
+                    req.element_id,
+                )
+                await self._send_callback(ws, req.element_id, 503)
 
         elif msg_type == MessageType.PUBLISH_EVENT:
             if payload is None:
                 logger.warning("PublishEvent without payload")
                 return
-            evt = PublishEvent.from_payload(payload)
-            asyncio.create_task(self._dispatch_publish_event(evt))
+            if self._event_gate is not None and not self._event_gate():
+                logger.debug("PublishEvent '%s' left to another connection of the pool", payload.get("eventName"))
+                return
+            evt = PublishEvent.from_payload(payload, self._spooler)
+            metrics = self._metrics.publish_event
+            metrics.bytes_in += _wire_size(raw)
+            submitted = time.perf_counter()
+            metrics.decode.observe(submitted - received)
+            if not self._concurrency.publish_events.submit(
+                lambda: self._dispatch_publish_event(evt, submitted)
+            ):
+                logger.warning(
+                    "PublishEvent '%s' dropped: concurrency queue is full.",
+                    evt.event_name,
+                )
 
         elif msg_type == MessageType.PONG:
             logger.debug("Pong received")
@@ -304,7 +714,15 @@ class SlimFaasClient:
         else:
             logger.debug("Unhandled message type: %s", msg_type)
 
-    async def _dispatch_async_request(self, ws: ClientConnection, req: AsyncRequest) -> None:
+    async def _dispatch_async_request(
+        self, ws: ClientConnection, req: AsyncRequest, submitted: Optional[float] = None
+    ) -> None:
+        metrics = self._metrics.async_request
+        started = time.perf_counter()
+        if submitted is not None:
+            metrics.slot_wait.observe(started - submitted)
+        if self._loop_monitor is not None:
+            self._loop_monitor.track("async_request", req.element_id, req.path)
         if self._async_request_handler is None:
             logger.warning(
                 "Received AsyncRequest for %s but no handler registered. Returning 500.",
@@ -313,35 +731,86 @@ class SlimFaasClient:
             await self._send_callback(ws, req.element_id, 500)
             return
 
+        if self._tracer is None:
+            status_code = await self._handle_async_request(req)
+        else:
+            attributes = {
+                "slimfaas.element_id": req.element_id,
+                "slimfaas.try_number": req.try_number,
+                "http.request.method": req.method,
+                "url.path": req.path,
+            }
+            with request_span(self._tracer, "async_request", req.headers, attributes, submitted, "consumer") as outcome:
+                status_code = await self._handle_async_request(req)
+                outcome["http.response.status_code"] = status_code
+        handled = time.perf_counter()
+        metrics.handler.observe(handled - started)
+
+        # 202 = the client will manage the callback itself (and may still need the body)
+        if status_code == 202:
+            self._deferred_callbacks.add(req.element_id)
+        else:
+            req._release_body()
+            await self._send_callback(ws, req.element_id, status_code)
+            metrics.callback_send.observe(time.perf_counter() - handled)
+
+    async def _handle_async_request(self, req: AsyncRequest) -> int:
+        if self._idempotency is None:
+            return await self._run_async_request_handler(req)
+        return await self._idempotency.run(req.element_id, lambda: self._run_async_request_handler(req))
+
+    async def _run_async_request_handler(self, req: AsyncRequest) -> int:
         try:
-            status_code = await self._async_request_handler(req)
+            return await self._async_request_handler(req)  # type: ignore[misc]
         except Exception as exc:
             logger.error("AsyncRequest handler raised an exception: %s", exc, exc_info=True)
-            status_code = 500
-
-        # 202 = the client will manage the callback itself
-        if status_code != 202:
-            await self._send_callback(ws, req.element_id, status_code)
-
-    async def _dispatch_publish_event(self, evt: PublishEvent) -> None:
+            return 500
+
+    async def _dispatch_publish_event(self, evt: PublishEvent, submitted: Optional[float] = None) -> None:
+        metrics = self._metrics.publish_event
+        started = time.perf_counter()
+        if submitted is not None:
+            metrics.slot_wait.observe(started - submitted)
+        if self._loop_monitor is not None:
+            self._loop_monitor.track("publish_event", evt.event_name, evt.path)
         if self._publish_event_handler is None:
             logger.debug("Received PublishEvent '%s' but no handler registered.", evt.event_name)
             return
 
         try:
-            await self._publish_event_handler(evt)
+            if self._tracer is None:
+                await self._publish_event_handler(evt)
+            else:
+                attributes = {"slimfaas.event_name": evt.event_name, "url.path": evt.path}
+                with request_span(self._tracer, "publish_event", evt.headers, attributes, submitted, "consumer"):
+                    await self._publish_event_handler(evt)
         except Exception as exc:
             logger.error("PublishEvent handler raised an exception: %s", exc, exc_info=True)
+        finally:
+            evt._release_body()
+            metrics.handler.observe(time.perf_counter() - started)
 
     async def _send_callback(self, ws: ClientConnection, element_id: str, status_code: int) -> None:
-        await self._send_json({
+        """Send a callback, or keep it in the outbox if the connection is gone."""
+        try:
+            await self._deliver_callback(ws, element_id, status_code)
+        except (RuntimeError, OSError, websockets.ConnectionClosed) as exc:
+            logger.info("Callback for elementId=%s queued in the outbox (%s)", element_id, exc)
+            self._outbox.add(element_id, status_code)
+
+    async def _deliver_callback(self, ws: ClientConnection, element_id: str, status_code: int) -> None:
+        data = self._json.dumps({
             "type": MessageType.ASYNC_CALLBACK,
             "correlationId": element_id,
             "payload": {
                 "elementId": element_id,
                 "statusCode": status_code,
             },
-        }, ws=ws)
+        })
+        self._metrics.async_request.bytes_out += len(data)
+        await self._send(
+            data, SendPriority.CONTROL, text=True, ws=ws, on_drop=lambda: self._outbox.add(element_id, status_code)
+        )
 
     async def _ping_loop(self, ws: ClientConnection) -> None:
         while True:
@@ -355,56 +824,171 @@ class SlimFaasClient:
             except Exception:
                 break
 
-    async def _send_json(self, data: dict, *, ws: Optional[ClientConnection] = None) -> None:
-        target = ws or self._ws
-        if target is None:
-            raise RuntimeError("WebSocket is not connected")
-        await target.send(json.dumps(data))
+    async def _send_json(
+        self,
+        data: dict,
+        *,
+        ws: Optional[ClientConnection] = None,
+        priority: SendPriority = SendPriority.CONTROL,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
+        # Already UTF-8 encoded: send as a text frame without a str round-trip.
+        await self._send(self._json.dumps(data), priority, text=True, ws=ws, on_drop=on_drop)
+
+    async def _send_binary(
+        self,
+        data: "BytesLike | list[BytesLike]",
+        *,
+        ws: Optional[ClientConnection] = None,
+        priority: SendPriority = SendPriority.BULK,
+    ) -> None:
+        await self._send(data, priority, ws=ws)
 
-    async def _send_binary(self, data: bytes, *, ws: Optional[ClientConnection] = None) -> None:
+    async def _send(
+        self,
+        data: "BytesLike | list[BytesLike]",
+        priority: SendPriority,
+        *,
+        text: Optional[bool] = None,
+        ws: Optional[ClientConnection] = None,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
         target = ws or self._ws
         if target is None:
             raise RuntimeError("WebSocket is not connected")
-        await target.send(data)
+        if self._outbound.is_attached(target):
+            await self._outbound.put(data, priority, text=text, on_drop=on_drop)
+        else:
+            # Registration handshake, or a connection without a writer task.
+            await target.send(data, text=text)
+
+    async def _send_frame(
+        self,
+        msg_type: int,
+        correlation_id: str,
+        payload: "BytesLike" = b"",
+        flags: int = 0,
+        priority: SendPriority = SendPriority.BULK,
+    ) -> None:
+        # Large payloads go out as [header, payload] fragments so they are never copied here.
+        if len(payload) >= BinaryFrame.FRAGMENT_THRESHOLD:
+            if self._outbound.is_attached(self._ws) and not _is_immutable(payload):
+                # Queued frames leave after this returns: the caller may reuse a writable buffer.
+                payload = bytes(payload)
+            frame = BinaryFrame.encode_fragments(msg_type, correlation_id, payload, flags)
+        else:
+            frame = BinaryFrame.encode(msg_type, correlation_id, payload, flags)
+        await self._send_binary(frame, priority=priority)
 
     # ------------------------------------------------------------------
     # Synchronous streaming — binary frames
     # ------------------------------------------------------------------
 
-    def _handle_binary_frame(self, ws: ClientConnection, data: bytes) -> None:
-        """Route an incoming binary frame for synchronous streaming."""
-        msg_type, correlation_id, flags, payload_length = BinaryFrame.decode_header(data)
-        payload = data[BinaryFrame.HEADER_SIZE:BinaryFrame.HEADER_SIZE + payload_length]
+    def _handle_binary_frame(self, ws: ClientConnection, data: bytes) -> Optional[SyncBodyStream]:
+        """
+        Route an incoming binary frame for synchronous streaming.
+
+        Returns the body stream the read loop must wait on before reading the
+        socket again (flow control), or ``None``.
+        """
+        received = time.perf_counter()
+        msg_type, correlation_id, flags, payload = BinaryFrame.decode(data)
+        metrics = self._metrics.sync_request
+        metrics.bytes_in += len(data)
 
         if msg_type == MessageType.SYNC_REQUEST_START:
             try:
-                start = json.loads(payload.decode("utf-8"))
+                start = self._json.loads(payload)
             except Exception as exc:
                 logger.warning("Failed to parse SyncRequestStart: %s", exc)
                 return
-            body_stream = SyncBodyStream(asyncio.Queue())
-            self._pending_sync_bodies[correlation_id] = body_stream
+            method = start.get("method", "GET")
+            path = start.get("path", "")
+            query = start.get("query", "")
+            headers = start.get("headers", {})
+            submitted = time.perf_counter()
+            metrics.decode.observe(submitted - received)
+            senders = (self.send_sync_response_start, self.send_sync_response_chunk, self.send_sync_response_end)
+            send_flush: Optional[Callable] = None
+            if self._response_compression is not None:
+                compressed = self._response_compression.for_request(method, headers, *senders)
+                if compressed is not None:
+                    senders = (compressed.start, compressed.chunk, compressed.end)
+                    send_flush = compressed.flush
+            flight: Optional[Flight] = None
+            traced: Optional[TracedResponse] = None
+            if not self._draining:
+                cache, cache_key = self._response_cache, None
+                if cache is not None:
+                    cache_key = cache.key(method, path, query, headers)
+                    entry = cache.lookup(cache_key, headers) if cache_key is not None else None
+                    if entry is not None:
+                        self._spawn(cache.serve(entry, correlation_id, headers, *senders))
+                        return
+                flights, flight_key = self._single_flight, None
+                if flights is not None:
+                    flight_key = flights.key(method, path, query, headers)
+                    if flight_key is not None and flights.join(flight_key, *senders, correlation_id):
+                        return
+                if cache is not None and cache_key is not None:
+                    caching = cache.for_request(cache_key, headers, *senders)
+                    senders = (caching.start, caching.chunk, caching.end)
+                if flights is not None and flight_key is not None:
+                    flight = flights.lead(flight_key, *senders)
+                    senders = (flight.start, flight.chunk, flight.end)
+                if self._tracer is not None:
+                    traced = TracedResponse(self._tracer, *senders)
+                    senders = (traced.start, traced.chunk, traced.end)
+            body_stream = SyncBodyStream(self._flow_control, self._spooler)
             response_writer = SyncResponseWriter(
                 correlation_id,
-                send_start=self.send_sync_response_start,
-                send_chunk=self.send_sync_response_chunk,
-                send_end=self.send_sync_response_end,
+                send_start=senders[0],
+                send_chunk=senders[1],
+                send_end=senders[2],
+                buffering=self._response_buffering,
+                send_flush=send_flush,
             )
             req = SyncRequest(
                 correlation_id=correlation_id,
-                method=start.get("method", "GET"),
-                path=start.get("path", ""),
-                query=start.get("query", ""),
-                headers=start.get("headers", {}),
+                method=method,
+                path=path,
+                query=query,
+                headers=headers,
                 body=body_stream,
                 response=response_writer,
             )
-            asyncio.create_task(self._dispatch_sync_request(ws, req))
+            if self._draining:
+                logger.info("SyncRequest %s refused while draining. Returning 503.", correlation_id)
+                self._spawn(self._reject_sync_request(req))
+            elif self._concurrency.sync_requests.submit(
+                lambda: self._dispatch_sync_request(ws, req, flight, submitted, traced)
+            ):
+                self._pending_sync_bodies[correlation_id] = body_stream
+                self._queued_sync_requests[correlation_id] = req
+            else:
+                logger.warning(
+                    "SyncRequest %s rejected: concurrency queue is full. Returning 503.",
+                    correlation_id,
+                )
+                self._spawn(self._reject_sync_request(req))
 
         elif msg_type == MessageType.SYNC_REQUEST_CHUNK:
             stream = self._pending_sync_bodies.get(correlation_id)
             if stream is not None:
                 stream._feed(payload)
+                if stream._needs_pause():
+                    return stream
+                if stream._over_queue_budget():
+                    queued = self._queued_sync_requests.pop(correlation_id, None)
+                    if queued is not None:
+                        logger.warning(
+                            "SyncRequest %s rejected: body buffered while waiting for a slot "
+                            "exceeds the flow-control budget. Returning 503.",
+                            correlation_id,
+                        )
+                        del self._pending_sync_bodies[correlation_id]
+                        stream._reject()
+                        self._spawn(self._reject_sync_request(queued))
 
         elif msg_type == MessageType.SYNC_REQUEST_END:
             stream = self._pending_sync_bodies.pop(correlation_id, None)
@@ -419,7 +1003,50 @@ class SlimFaasClient:
         else:
             logger.debug("Unhandled binary frame type: 0x%02x", msg_type)
 
-    async def _dispatch_sync_request(self, ws: ClientConnection, req: SyncRequest) -> None:
+    async def _dispatch_sync_request(
+        self,
+        ws: ClientConnection,
+        req: SyncRequest,
+        flight: Optional[Flight] = None,
+        submitted: Optional[float] = None,
+        traced: Optional[TracedResponse] = None,
+    ) -> None:
+        self._queued_sync_requests.pop(req.correlation_id, None)
+        if req.body._rejected:
+            # Already answered with a 503 while it waited for this slot.
+            if traced is not None:
+                traced.close()
+            if flight is not None:
+                await flight.abandon()
+            return
+        metrics = self._metrics.sync_request
+        started = time.perf_counter()
+        if submitted is not None:
+            metrics.slot_wait.observe(started - submitted)
+        if self._loop_monitor is not None:
+            self._loop_monitor.track("sync_request", req.correlation_id, req.path)
+        req.body._start_reading()
+        try:
+            if self._tracer is None:
+                await self._run_sync_request_handler(req)
+            else:
+                attributes = {
+                    "slimfaas.correlation_id": req.correlation_id,
+                    "http.request.method": req.method,
+                    "url.path": req.path,
+                }
+                with request_span(self._tracer, "sync_request", req.headers, attributes, submitted):
+                    await self._run_sync_request_handler(req)
+        finally:
+            metrics.handler.observe(time.perf_counter() - started)
+            if traced is not None:
+                traced.close()
+            # Release body bytes the handler did not read; later chunks are dropped.
+            req.body._discard()
+            if flight is not None:
+                await flight.abandon()
+
+    async def _run_sync_request_handler(self, req: SyncRequest) -> None:
         if self._sync_request_handler is None:
             logger.warning(
                 "Received SyncRequest for %s but no handler registered. Returning 500.",
@@ -440,39 +1067,102 @@ class SlimFaasClient:
             except Exception:
                 pass
 
+    async def _reject_sync_request(self, req: SyncRequest) -> None:
+        try:
+            await req.response.start(503)
+            await req.response.complete()
+        except Exception as exc:
+            logger.debug("Failed to reject SyncRequest %s: %s", req.correlation_id, exc)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def send_sync_response_start(self, correlation_id: str, response: SyncResponse) -> None:
         """Send the beginning of the sync response (status + headers)."""
-        payload_json = json.dumps({
+        payload_json = self._json.dumps({
             "statusCode": response.status_code,
             "headers": response.headers,
-        }).encode("utf-8")
-        frame = BinaryFrame.encode(MessageType.SYNC_RESPONSE_START, correlation_id, payload_json)
-        await self._send_binary(frame)
+        })
+        await self._send_frame(
+            MessageType.SYNC_RESPONSE_START, correlation_id, payload_json, priority=SendPriority.RESPONSE_START
+        )
 
-    async def send_sync_response_chunk(self, correlation_id: str, chunk: bytes) -> None:
-        """Send a chunk of the sync response body."""
-        frame = BinaryFrame.encode(MessageType.SYNC_RESPONSE_CHUNK, correlation_id, chunk)
-        await self._send_binary(frame)
+    async def send_sync_response_chunk(self, correlation_id: str, chunk: "BytesLike") -> None:
+        """Send a chunk of the sync response body (any bytes-like object)."""
+        chunk = as_byte_view(chunk)
+        self._metrics.sync_request.bytes_out += len(chunk)
+        await self._send_frame(MessageType.SYNC_RESPONSE_CHUNK, correlation_id, chunk)
 
     async def send_sync_response_end(self, correlation_id: str) -> None:
         """Signal end of the sync response body."""
-        frame = BinaryFrame.encode(MessageType.SYNC_RESPONSE_END, correlation_id, flags=BinaryFrame.FLAG_END_OF_STREAM)
-        await self._send_binary(frame)
+        await self._send_frame(MessageType.SYNC_RESPONSE_END, correlation_id, flags=BinaryFrame.FLAG_END_OF_STREAM)
 
     async def send_sync_cancel(self, correlation_id: str) -> None:
         """Cancel an in-progress sync stream."""
-        frame = BinaryFrame.encode(MessageType.SYNC_CANCEL, correlation_id)
-        await self._send_binary(frame)
+        await self._send_frame(MessageType.SYNC_CANCEL, correlation_id)
 
     # ------------------------------------------------------------------
     # Properties
     # ------------------------------------------------------------------
 
+    def metrics(self) -> dict:
+        """
+        Snapshot of the latency histograms, byte counters and connection
+        counters (see :class:`ClientMetrics`).
+        """
+        return self._metrics.snapshot()
+
     @property
     def connection_id(self) -> Optional[str]:
         """Connection ID assigned by SlimFaas after registration."""
         return self._connection_id
 
+    def owns_callback(self, element_id: str) -> bool:
+        """True if ``element_id`` was received by this client and still awaits :meth:`send_callback`."""
+        return element_id in self._deferred_callbacks
+
+    @property
+    def concurrency(self) -> ConcurrencyLimiter:
+        """Admission controller bounding the number of running handler tasks."""
+        return self._concurrency
+
+    @property
+    def outbox(self) -> CallbackOutbox:
+        """Callbacks waiting for a connection."""
+        return self._outbox
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Cache of sync responses, if enabled."""
+        return self._response_cache
+
+    @property
+    def single_flight(self) -> Optional[SingleFlight]:
+        """Coalescing of identical concurrent sync requests, if enabled."""
+        return self._single_flight
+
+    @property
+    def idempotency(self) -> Optional[IdempotencyCache]:
+        """Status cache for redelivered async requests, if enabled."""
+        return self._idempotency
+
+    @property
+    def outbound(self) -> OutboundQueue:
+        """Outbound queue: depth per priority lane, byte budget and send-stall time."""
+        return self._outbound
+
+    @property
+    def flow_control(self) -> SyncBodyFlowControl:
+        """Flow control state (current/peak buffered bytes) for sync request bodies."""
+        return self._flow_control
+
+    @property
+    def is_draining(self) -> bool:
+        """True once :meth:`drain` has been called: new requests are refused with 503."""
+        return self._draining
+
     @property
     def is_connected(self) -> bool:
         """True if the WebSocket is currently connected and registered."""
@@ -0,0 +1,303 @@
+"""
+Streaming compression of synchronous responses.
+
+:class:`ResponseCompression` negotiates an encoding with the request's
+``Accept-Encoding`` header and compresses the response body chunk by chunk
+between :class:`SyncResponseWriter` and the WebSocket, so handlers do not
+change. ``gzip`` is always available; ``br`` needs the optional
+`brotli <https://pypi.org/project/Brotli/>`_ package.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import zlib
+from typing import Any, Callable, Mapping, Optional
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+# Content types that are already compressed (or must reach the caller unbuffered).
+INCOMPRESSIBLE_CONTENT_TYPES = frozenset({
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/zstd",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/octet-stream",
+    "application/pdf",
+    "font/woff",
+    "font/woff2",
+    "text/event-stream",
+})
+INCOMPRESSIBLE_CONTENT_TYPE_PREFIXES = ("image/", "video/", "audio/")
+COMPRESSIBLE_EXCEPTIONS = frozenset({"image/svg+xml"})
+
+
+class _Compressor:
+    """
+    Incremental compressor: ``compress()`` for each chunk, ``flush()`` to
+    emit everything compressed so far without ending the stream, ``finish()`` once.
+    """
+
+    def __init__(
+        self,
+        compress: Callable[[Any], bytes],
+        flush: Callable[[], bytes],
+        finish: Callable[[], bytes],
+    ) -> None:
+        self.compress = compress
+        self.flush = flush
+        self.finish = finish
+
+
+def _gzip_compressor(level: int) -> _Compressor:
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _Compressor(c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush)
+
+
+def _brotli_compressor(level: int) -> _Compressor:
+    import brotli
+
+    c = brotli.Compressor(quality=min(level, 11))
+    return _Compressor(c.process, c.flush, c.finish)
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+_FACTORIES: dict[str, Callable[[int], _Compressor]] = {
+    "br": _brotli_compressor,
+    "gzip": _gzip_compressor,
+}
+
+
+def _header(headers: Mapping[str, list[str]], name: str) -> Optional[str]:
+    for key, values in headers.items():
+        if key.lower() == name and values:
+            return values[0]
+    return None
+
+
+class ResponseCompression:
+    """
+    Opt-in compression of sync responses.
+
+    The encoding is negotiated with the request's ``Accept-Encoding``
+    (q-values honoured, ties broken by the order of ``encodings``). The
+    response is left untouched when the client does not accept any of
+    them, for ``HEAD`` requests, for statuses without a body or with a
+    partial one (1xx, 204, 206, 304), when the handler already set
+    ``Content-Encoding``, for already compressed content types (images,
+    archives, …) and for bodies smaller than ``min_size`` bytes.
+
+    Chunks of at least ``offload_threshold`` bytes are compressed on
+    ``executor`` (default: the loop's executor) instead of the event loop::
+
+        compression = ResponseCompression(level=5, min_size=2048)
+        client = SlimFaasClient(url, config, response_compression=compression)
+
+        compression.snapshot()
+        # {"responses": 40, "compressed": 32, "bytes_in": 5242880, "bytes_out": 917504, "ratio": 0.175}
+    """
+
+    def __init__(
+        self,
+        encodings: tuple[str, ...] = ("br", "gzip"),
+        level: int = 6,
+        min_size: int = DEFAULT_MIN_SIZE,
+        offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        unknown = [e for e in encodings if e not in _FACTORIES]
+        if unknown:
+            raise ValueError(f"Unsupported encodings: {unknown}")
+        self.encodings = tuple(e for e in encodings if e != "br" or _brotli_available())
+        self.level = level
+        self.min_size = min_size
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self._responses = 0
+        self._compressed = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Pick the encoding to use for an ``Accept-Encoding`` value, or ``None``."""
+        if not accept_encoding or not self.encodings:
+            return None
+        accepted: dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            q = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            accepted[name.strip().lower()] = q
+        best: Optional[str] = None
+        best_q = 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def for_request(
+        self,
+        method: str,
+        headers: Mapping[str, list[str]],
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> "Optional[CompressedResponse]":
+        """Wrap the senders of one response, or return ``None`` if it cannot be compressed."""
+        if method.upper() == "HEAD":
+            return None
+        encoding = self.negotiate(_header(headers, "accept-encoding"))
+        if encoding is None:
+            return None
+        return CompressedResponse(self, encoding, send_start, send_chunk, send_end)
+
+    def is_compressible(self, status_code: int, headers: Mapping[str, list[str]]) -> bool:
+        """True if a response with this status and headers may be compressed."""
+        if status_code < 200 or status_code in (204, 206, 304):
+            return False
+        if _header(headers, "content-encoding"):
+            return False
+        content_type = (_header(headers, "content-type") or "").split(";")[0].strip().lower()
+        if content_type in COMPRESSIBLE_EXCEPTIONS:
+            return True
+        return content_type not in INCOMPRESSIBLE_CONTENT_TYPES and not content_type.startswith(
+            INCOMPRESSIBLE_CONTENT_TYPE_PREFIXES
+        )
+
+    def _record(self, compressed: bool, bytes_in: int, bytes_out: int) -> None:
+        self._responses += 1
+        if compressed:
+            self._compressed += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+
+    def snapshot(self) -> dict[str, float]:
+        """Responses seen/compressed and body bytes before/after compression."""
+        return {
+            "responses": self._responses,
+            "compressed": self._compressed,
+            "bytes_in": self._bytes_in,
+            "bytes_out": self._bytes_out,
+            "ratio": self._bytes_out / self._bytes_in if self._bytes_in else 1.0,
+        }
+
+
+class CompressedResponse:
+    """
+    Compression state of one response, sitting between the writer and the client.
+
+    When the response length is unknown, the start frame is held back until
+    ``min_size`` body bytes have been written (or the response completes),
+    so that small bodies are sent uncompressed.
+    """
+
+    def __init__(
+        self,
+        compression: ResponseCompression,
+        encoding: str,
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> None:
+        self._compression = compression
+        self._encoding = encoding
+        self._send_start = send_start
+        self._send_chunk = send_chunk
+        self._send_end = send_end
+        self._pending_start: Any = None
+        self._pending = bytearray()
+        self._compressor: Optional[_Compressor] = None
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    async def start(self, correlation_id: str, response: Any) -> None:
+        compression = self._compression
+        if not compression.is_compressible(response.status_code, response.headers):
+            await self._send_start(correlation_id, response)
+            return
+        length = _header(response.headers, "content-length")
+        if length is None:
+            self._pending_start = response
+            return
+        if not length.isdigit() or int(length) < compression.min_size:
+            await self._send_start(correlation_id, response)
+            return
+        await self._begin(correlation_id, response)
+
+    async def chunk(self, correlation_id: str, data: Any) -> None:
+        if self._pending_start is not None:
+            self._pending += data
+            if len(self._pending) < self._compression.min_size:
+                return
+            response, self._pending_start = self._pending_start, None
+            await self._begin(correlation_id, response)
+            data, self._pending = self._pending, bytearray()
+        if self._compressor is None:
+            await self._send_chunk(correlation_id, data)
+            return
+        self._bytes_in += len(data)
+        await self._emit(correlation_id, await self._run(self._compressor.compress, data))
+
+    async def flush(self, correlation_id: str) -> None:
+        """Send every byte written so far in a form the caller can decode now."""
+        if self._pending_start is not None:
+            response, self._pending_start = self._pending_start, None
+            await self._begin(correlation_id, response)
+            data, self._pending = self._pending, bytearray()
+            await self.chunk(correlation_id, data)
+        if self._compressor is not None:
+            await self._emit(correlation_id, self._compressor.flush())
+
+    async def end(self, correlation_id: str) -> None:
+        if self._pending_start is not None:
+            # Completed below min_size: send it as is.
+            response, self._pending_start = self._pending_start, None
+            await self._send_start(correlation_id, response)
+            if self._pending:
+                await self._send_chunk(correlation_id, bytes(self._pending))
+        elif self._compressor is not None:
+            await self._emit(correlation_id, self._compressor.finish())
+        self._compression._record(self._compressor is not None, self._bytes_in, self._bytes_out)
+        await self._send_end(correlation_id)
+
+    async def _begin(self, correlation_id: str, response: Any) -> None:
+        vary = [v for k, values in response.headers.items() if k.lower() == "vary" for v in values]
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "vary")}
+        headers["Content-Encoding"] = [self._encoding]
+        if not any("accept-encoding" in v.lower() or v.strip() == "*" for v in vary):
+            vary.append("Accept-Encoding")
+        headers["Vary"] = vary
+        self._compressor = _FACTORIES[self._encoding](self._compression.level)
+        response = type(response)(status_code=response.status_code, headers=headers)
+        await self._send_start(correlation_id, response)
+
+    async def _emit(self, correlation_id: str, out: bytes) -> None:
+        if out:
+            self._bytes_out += len(out)
+            await self._send_chunk(correlation_id, out)
+
+    async def _run(self, func: Callable[[Any], bytes], data: Any) -> bytes:
+        if len(data) < self._compression.offload_threshold:
+            return func(data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._compression.executor, func, data)
@@ -0,0 +1,179 @@
+"""
+Admission control for handler tasks.
+
+Every AsyncRequest, PublishEvent and SyncRequestStart received by the client
+is turned into a handler task. Without a limit, a burst (for example right
+after a reconnection) can start thousands of tasks in a single worker.
+:class:`ConcurrencyLimiter` caps the number of handlers running at once and
+keeps excess work in a bounded FIFO queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable
+
+from slimfaas_client._models import SlimFaasClientConfig
+
+logger = logging.getLogger(__name__)
+
+Work = Callable[[], Awaitable[None]]
+
+DEFAULT_MAX_QUEUED = 1000
+
+
+class ConcurrencyBudget:
+    """
+    Bounded number of concurrently running handler tasks for one kind of work.
+
+    Work submitted while ``limit`` handlers are already running is queued
+    (FIFO) and started as soon as a slot is released. Once ``max_queued``
+    items are waiting, :meth:`submit` rejects new work and returns ``False``.
+    """
+
+    def __init__(self, limit: int, max_queued: int = DEFAULT_MAX_QUEUED) -> None:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        if max_queued < 0:
+            raise ValueError("max_queued must be positive or zero")
+        self._limit = limit
+        self._max_queued = max_queued
+        self._in_flight = 0
+        self._rejected = 0
+        self._queue: deque[Work] = deque()
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, work: Work) -> bool:
+        """
+        Run ``work()`` in a new task, or queue it if the budget is exhausted.
+
+        Returns ``False`` if the work was rejected because the queue is full.
+        """
+        if self._in_flight < self._limit:
+            self._start(work)
+            return True
+        if len(self._queue) < self._max_queued:
+            self._queue.append(work)
+            return True
+        self._rejected += 1
+        return False
+
+    def _start(self, work: Work) -> None:
+        self._in_flight += 1
+        task = asyncio.create_task(self._run(work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, work: Work) -> None:
+        try:
+            await work()
+        except Exception as exc:
+            logger.error("Handler task raised an exception: %s", exc, exc_info=True)
+        finally:
+            self._in_flight -= 1
+            if self._queue and self._in_flight < self._limit:
+                self._start(self._queue.popleft())
+
+    @property
+    def limit(self) -> int:
+        """Maximum number of handlers running at once."""
+        return self._limit
+
+    @property
+    def max_queued(self) -> int:
+        """Maximum number of work items waiting for a slot."""
+        return self._max_queued
+
+    @property
+    def in_flight(self) -> int:
+        """Number of handlers currently running."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of work items waiting for a slot."""
+        return len(self._queue)
+
+    @property
+    def rejected(self) -> int:
+        """Total number of work items rejected because the queue was full."""
+        return self._rejected
+
+
+class ConcurrencyLimiter:
+    """
+    Admission controller with separate budgets for async requests,
+    publish/subscribe events and synchronous streams.
+
+    By default (see :meth:`from_config`) every budget is set to
+    ``SlimFaasClientConfig.number_parallel_request_per_pod``, which is the
+    number of parallel requests SlimFaas sends to a single virtual replica.
+
+    A single limiter can be shared by several clients so they draw from the
+    same budget::
+
+        limiter = ConcurrencyLimiter(async_requests=8, publish_events=32, sync_requests=16)
+        client = SlimFaasClient(url, config, concurrency=limiter)
+
+        limiter.in_flight   # handlers currently running, all budgets
+        limiter.queued      # work waiting for a slot, all budgets
+    """
+
+    def __init__(
+        self,
+        async_requests: int = 10,
+        publish_events: int = 10,
+        sync_requests: int = 10,
+        *,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ) -> None:
+        self.async_requests = ConcurrencyBudget(async_requests, max_queued)
+        """Budget for AsyncRequest handlers."""
+
+        self.publish_events = ConcurrencyBudget(publish_events, max_queued)
+        """Budget for PublishEvent handlers."""
+
+        self.sync_requests = ConcurrencyBudget(sync_requests, max_queued)
+        """Budget for synchronous streaming request handlers."""
+
+    @classmethod
+    def from_config(
+        cls,
+        config: SlimFaasClientConfig,
+        *,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+    ) -> "ConcurrencyLimiter":
+        """Build a limiter whose budgets all equal ``number_parallel_request_per_pod``."""
+        limit = max(1, config.number_parallel_request_per_pod)
+        return cls(limit, limit, limit, max_queued=max_queued)
+
+    def _budgets(self) -> dict[str, ConcurrencyBudget]:
+        return {
+            "async_requests": self.async_requests,
+            "publish_events": self.publish_events,
+            "sync_requests": self.sync_requests,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        """Number of handlers currently running, across all budgets."""
+        return sum(b.in_flight for b in self._budgets().values())
+
+    @property
+    def queued(self) -> int:
+        """Number of work items waiting for a slot, across all budgets."""
+        return sum(b.queued for b in self._budgets().values())
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Per-budget ``limit``/``in_flight``/``queued``/``rejected`` counters."""
+        return {
+            name: {
+                "limit": b.limit,
+                "in_flight": b.in_flight,
+                "queued": b.queued,
+                "rejected": b.rejected,
+            }
+            for name, b in self._budgets().items()
+        }
@@ -0,0 +1,378 @@
+"""
+Execution modes for handlers that must not run on the event loop.
+
+Handlers registered on :class:`SlimFaasClient` run on the same event loop as
+the WebSocket read loop. A handler that burns CPU stalls pings and every
+other request. The wrappers in this module move that work off the loop while
+still looking like a regular async handler to the client.
+
+Wrappers may expose ``startup()`` and ``shutdown()`` coroutines; the client
+awaits them before its first connection and when it is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import copy
+import dataclasses
+import functools
+import inspect
+import io
+import logging
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+
+from slimfaas_client._models import (
+    BytesLike,
+    SyncBodyStream,
+    SyncRequest,
+    SyncResponseWriter,
+    as_byte_view,
+)
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+DEFAULT_SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+
+async def run_handler_hooks(handlers: Iterable[Any], name: str) -> None:
+    """Await the ``name`` hook (``startup`` or ``shutdown``) of each distinct handler that has one."""
+    seen: set[int] = set()
+    for handler in handlers:
+        hook = getattr(handler, name, None)
+        if hook is None or id(handler) in seen:
+            continue
+        seen.add(id(handler))
+        try:
+            await hook()
+        except Exception as exc:
+            if name == "startup":
+                raise
+            logger.warning("Handler %s hook failed: %s", name, exc)
+
+
+def _warm_up() -> None:
+    """No-op task: submitting one per worker makes the executor spawn them all."""
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Workers share the parent's resource tracker (see ProcessPoolHandler.startup),
+    # so registering the block again here is a no-op and the parent's unlink
+    # unregisters it.
+    return shared_memory.SharedMemory(name=name)
+
+
+def _run_in_worker(func: Callable[[Any], R], message: Any, shm_name: Optional[str], size: int) -> R:
+    """Worker-side entry point: attach the shared body and call ``func``."""
+    if shm_name is None:
+        return func(message)
+    shm = _attach_shared_memory(shm_name)
+    view = shm.buf[:size].toreadonly()
+    try:
+        message.body = view
+        return func(message)
+    finally:
+        message.body = None
+        view.release()
+        try:
+            shm.close()
+        except BufferError:
+            logger.warning("Handler kept a reference to the shared request body; it will be released at exit.")
+
+
+class ProcessPoolHandler:
+    """
+    Run a CPU-bound handler in a pool of worker processes.
+
+    ``func`` is a plain (non-async), picklable callable — typically a
+    module-level function — receiving an :class:`AsyncRequest` (or a
+    :class:`PublishEvent`) and returning what the handler would return
+    (the HTTP status code for async requests)::
+
+        def resize_image(req: AsyncRequest) -> int:
+            image = Image.open(io.BytesIO(req.body))
+            ...
+            return 200
+
+        client.on_async_request(ProcessPoolHandler(resize_image, workers=4))
+
+    Bodies of at least ``shared_memory_threshold`` bytes are copied once into
+    a :class:`multiprocessing.shared_memory.SharedMemory` block instead of
+    being pickled through the pool pipe. Inside the worker, ``req.body`` is
+    then a read-only ``memoryview`` that is only valid during the call; use
+    ``bytes(req.body)`` to keep a copy.
+
+    The worker processes are spawned by :meth:`startup`, which the client
+    awaits before connecting, so the first requests do not pay the spawn
+    cost.
+
+    Parameters
+    ----------
+    func:
+        Picklable callable executed in the worker processes.
+    workers:
+        Number of worker processes (default: ``os.cpu_count()``).
+    shared_memory_threshold:
+        Minimum body size, in bytes, sent through shared memory.
+    initializer / initargs:
+        Optional per-worker initializer, as for ``ProcessPoolExecutor``.
+    mp_context:
+        Optional multiprocessing context (e.g. ``multiprocessing.get_context("spawn")``).
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Any], Any],
+        *,
+        workers: Optional[int] = None,
+        shared_memory_threshold: int = DEFAULT_SHARED_MEMORY_THRESHOLD,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple = (),
+        mp_context: Any = None,
+    ) -> None:
+        self._func = func
+        self._workers = workers
+        self._max_workers = workers or getattr(os, "process_cpu_count", os.cpu_count)() or 1
+        self._shared_memory_threshold = shared_memory_threshold
+        self._initializer = initializer
+        self._initargs = initargs
+        self._mp_context = mp_context
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._startup_lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        """Create the pool and spawn every worker process. Idempotent."""
+        async with self._startup_lock:
+            if self._executor is not None:
+                return
+            # Start the resource tracker before the workers so they inherit it
+            # instead of each starting their own.
+            resource_tracker.ensure_running()
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=self._mp_context,
+                initializer=self._initializer,
+                initargs=self._initargs,
+            )
+            # Tasks submitted while no worker is idle each spawn a new worker:
+            # submitting them all before awaiting any starts the whole pool.
+            loop = asyncio.get_running_loop()
+            warm_ups = [loop.run_in_executor(self._executor, _warm_up) for _ in range(self._max_workers)]
+            await asyncio.gather(*warm_ups)
+            logger.info("Process pool started with %d workers", self._max_workers)
+
+    async def shutdown(self) -> None:
+        """Stop the worker processes. Idempotent."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __call__(self, message: Any) -> Any:
+        if self._executor is None:
+            await self.startup()
+        assert self._executor is not None
+        loop = asyncio.get_running_loop()
+
+        body = message.body
+        if body is None or len(body) < self._shared_memory_threshold:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(_run_in_worker, self._func, message, None, 0)
+            )
+
+        size = len(body)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            shm.buf[:size] = body
+            shallow = copy.copy(message)
+            shallow.body = None
+            return await loop.run_in_executor(
+                self._executor, functools.partial(_run_in_worker, self._func, shallow, shm.name, size)
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @property
+    def workers(self) -> Optional[int]:
+        """Configured number of worker processes."""
+        return self._workers
+
+
+# ---------------------------------------------------------------------------
+# Blocking (non-async) handlers on a thread pool
+# ---------------------------------------------------------------------------
+
+class BlockingBodyReader(io.RawIOBase):
+    """
+    Blocking, file-like view over a :class:`SyncBodyStream`, for handlers
+    running in a worker thread.
+
+    Each read waits for the event loop to deliver the requested bytes, so it
+    must never be called from the event loop thread itself.
+    """
+
+    def __init__(self, stream: SyncBodyStream, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__()
+        self._stream = stream
+        self._loop = loop
+
+    def _call(self, coro: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()  # type: ignore[arg-type]
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+        return self._call(self._stream.read(size))
+
+    def readall(self) -> bytes:
+        return self._call(self._stream.readall())
+
+    def readinto(self, buffer: Any) -> int:
+        """Copy the bytes already received (at least one, ``0`` at end of stream) into ``buffer``."""
+        return self._call(self._stream.readinto(memoryview(buffer).cast("B")))
+
+
+class BlockingResponseWriter:
+    """
+    Blocking counterpart of :class:`SyncResponseWriter` for handlers running
+    in a worker thread.
+
+    Every call is forwarded to the event loop and waits until the frame has
+    been handed to the WebSocket, which applies the loop's send backpressure
+    to the writing thread.
+    """
+
+    def __init__(self, writer: SyncResponseWriter, loop: asyncio.AbstractEventLoop) -> None:
+        self._writer = writer
+        self._loop = loop
+
+    def _call(self, coro: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()  # type: ignore[arg-type]
+
+    def start(self, status_code: int = 200, headers: Optional[dict[str, list[str]]] = None) -> None:
+        """Send the beginning of the response (status code + headers)."""
+        self._call(self._writer.start(status_code, headers))
+
+    def write(self, data: BytesLike) -> int:
+        """Send a chunk of the response body. Returns the number of bytes written."""
+        data = as_byte_view(data)
+        self._call(self._writer.write(data))
+        return len(data)
+
+    def write_file(self, file: Any, offset: int = 0, length: Optional[int] = None, **kwargs: Any) -> int:
+        """Stream a file (see :meth:`SyncResponseWriter.write_file`). Returns the bytes sent."""
+        return self._call(self._writer.write_file(file, offset, length, **kwargs))
+
+    def writelines(self, lines: Any) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        """Send buffered bytes now (see :meth:`SyncResponseWriter.flush`)."""
+        self._call(self._writer.flush())
+
+    def complete(self) -> None:
+        """Signal end of response. Idempotent."""
+        self._call(self._writer.complete())
+
+
+class ThreadPoolHandler:
+    """
+    Run a blocking (non-async) handler on a bounded thread pool.
+
+    Lets handlers keep using blocking libraries (database drivers, boto,
+    requests, …) without stalling the event loop::
+
+        def handle_request(req: AsyncRequest) -> int:
+            requests.post("https://example.org", data=req.body)
+            return 200
+
+        client.on_async_request(ThreadPoolHandler(handle_request, workers=16))
+
+    Plain functions passed to ``on_async_request``, ``on_publish_event`` or
+    ``on_sync_request`` are wrapped automatically on the client's shared pool
+    (see the ``handler_threads`` client option).
+
+    For a :class:`SyncRequest` the function receives a copy of the request
+    whose ``body`` is a :class:`BlockingBodyReader` and whose ``response`` is
+    a :class:`BlockingResponseWriter`, both bridged back to the event loop.
+
+    Parameters
+    ----------
+    func:
+        Blocking callable.
+    workers:
+        Size of the thread pool owned by this handler (ignored if ``executor`` is given).
+    executor:
+        Existing executor to share between several handlers; it is not shut
+        down by :meth:`shutdown`.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Any], Any],
+        *,
+        workers: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        self._func = func
+        self._workers = workers
+        self._owns_executor = executor is None
+        self._executor = executor
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="slimfaas-handler"
+            )
+        return self._executor
+
+    async def startup(self) -> None:
+        """Create the thread pool. Idempotent."""
+        self._get_executor()
+
+    async def shutdown(self) -> None:
+        """Stop the thread pool if this handler owns it. Idempotent."""
+        if self._owns_executor and self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False)
+
+    async def __call__(self, message: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if isinstance(message, SyncRequest):
+            message = dataclasses.replace(
+                message,
+                body=BlockingBodyReader(message.body, loop),
+                response=BlockingResponseWriter(message.response, loop),
+            )
+        ctx = contextvars.copy_context()
+        result = await loop.run_in_executor(self._get_executor(), ctx.run, self._func, message)
+        if inspect.isawaitable(result):
+            # A plain callable wrapping a coroutine function, e.g. ``lambda req: handle(req, 1)``.
+            result = await result
+        return result
+
+
+def is_async_handler(handler: Any) -> bool:
+    """True if calling ``handler`` returns an awaitable (coroutine function or object with an async ``__call__``)."""
+    return inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+        getattr(handler, "__call__", None)
+    )
+
+
+def as_async_handler(handler: Any, executor: concurrent.futures.Executor) -> Any:
+    """Return ``handler`` unchanged if it is async, otherwise wrap it on ``executor``."""
+    if is_async_handler(handler):
+        return handler
+    return ThreadPoolHandler(handler, executor=executor)
@@ -0,0 +1,90 @@
+"""
+Flow control for incoming synchronous request bodies.
+"""
+
+from __future__ import annotations
+
+DEFAULT_HIGH_WATERMARK = 1024 * 1024
+DEFAULT_LOW_WATERMARK = 256 * 1024
+DEFAULT_MAX_BUFFERED_BYTES = 64 * 1024 * 1024
+
+
+class SyncBodyFlowControl:
+    """
+    Per-stream watermarks and a global byte budget for buffered request bodies.
+
+    Every :class:`SyncBodyStream` created by a client accounts its buffered
+    bytes here. When a stream whose handler is reading holds more than
+    ``high_watermark`` bytes, or when all streams together hold more than
+    ``max_buffered_bytes``, the client stops reading from the WebSocket until
+    that stream has been drained below ``low_watermark`` (or completely, if
+    the global budget is still exceeded by other streams). Bytes of streams
+    still waiting for a concurrency slot count against the same budget; such
+    a stream cannot pause the client, so it is rejected with a 503 if it
+    receives a chunk while the budget is exceeded.
+
+    A single instance can be shared by several clients (e.g. a
+    :class:`SlimFaasClientPool`) to bound the whole process::
+
+        flow = SyncBodyFlowControl(max_buffered_bytes=256 * 1024 * 1024)
+        client = SlimFaasClient(url, config, flow_control=flow)
+
+        flow.buffered_bytes        # currently buffered
+        flow.peak_buffered_bytes   # high-water mark since start
+    """
+
+    def __init__(
+        self,
+        high_watermark: int = DEFAULT_HIGH_WATERMARK,
+        low_watermark: int = DEFAULT_LOW_WATERMARK,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+    ) -> None:
+        if low_watermark < 0 or high_watermark < low_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low_watermark <= high_watermark")
+        if max_buffered_bytes < 1:
+            raise ValueError("max_buffered_bytes must be at least 1")
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.max_buffered_bytes = max_buffered_bytes
+        self._buffered = 0
+        self._peak = 0
+        self._pauses = 0
+
+    def _acquire(self, n: int) -> None:
+        self._buffered += n
+        if self._buffered > self._peak:
+            self._peak = self._buffered
+
+    def _release(self, n: int) -> None:
+        self._buffered -= n
+
+    @property
+    def over_budget(self) -> bool:
+        """True if all streams together hold more than ``max_buffered_bytes``."""
+        return self._buffered > self.max_buffered_bytes
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes currently buffered across all streams."""
+        return self._buffered
+
+    @property
+    def peak_buffered_bytes(self) -> int:
+        """Highest value reached by :attr:`buffered_bytes`."""
+        return self._peak
+
+    @property
+    def pauses(self) -> int:
+        """Number of times the read loop was paused to let a stream drain."""
+        return self._pauses
+
+    def snapshot(self) -> dict[str, int]:
+        """Current/peak buffered bytes, limits and pause count."""
+        return {
+            "buffered_bytes": self._buffered,
+            "peak_buffered_bytes": self._peak,
+            "max_buffered_bytes": self.max_buffered_bytes,
+            "high_watermark": self.high_watermark,
+            "low_watermark": self.low_watermark,
+            "pauses": self._pauses,
+        }
@@ -0,0 +1,228 @@
+"""
+Idempotency cache for async requests.
+
+When an AsyncCallback is lost (disconnection, timeout), SlimFaas delivers
+the same ``elementId`` again with a higher ``tryNumber``. The cache
+remembers the status code computed for each element so the redelivery is
+answered without running the handler a second time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dbm
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Container, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 3600.0
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU + TTL map from ``elementId`` to the handler's status code.
+
+    A redelivered request whose status is cached gets its callback right
+    away. A redelivery arriving while the first attempt is still running
+    waits for that attempt and reuses its status instead of starting the
+    handler again. Only statuses in ``statuses`` are stored (default: 2xx),
+    so failures are still retried by SlimFaas. After a ``202`` the element
+    counts as running until :meth:`SlimFaasClient.send_callback` records its
+    final status: a redelivery in between also gets ``202`` and the
+    callback is sent for both. Such pending elements expire after ``ttl``
+    and share the ``max_entries`` bound, so a callback that never comes
+    does not pin them in memory.
+
+    With a ``path``, entries are also written to a :mod:`dbm` database and
+    reloaded on start, so a restarted worker still recognises requests it
+    already processed::
+
+        cache = IdempotencyCache(max_entries=50_000, ttl=6 * 3600, path="/var/lib/my-job/done")
+        client = SlimFaasClient(url, config, idempotency=cache)
+
+        cache.snapshot()
+        # {"entries": 812, "hits": 14, "attached": 2, "misses": 830, "evictions": 0}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        path: Optional[str] = None,
+        statuses: Container[int] = range(200, 300),
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.statuses = statuses
+        # elementId -> (status code, expiry as a time.time() timestamp), least recently used first
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._running: dict[str, asyncio.Future] = {}
+        # Elements whose handler returned 202 and still await send_callback():
+        # elementId -> expiry as a time.time() timestamp, oldest first
+        self._deferred: OrderedDict[str, float] = OrderedDict()
+        self._db = None
+        self._hits = 0
+        self._attached = 0
+        self._misses = 0
+        self._evictions = 0
+        if path is not None:
+            self._open(path)
+
+    def get(self, element_id: str) -> Optional[int]:
+        """Cached status code for ``element_id``, or ``None``."""
+        entry = self._entries.get(element_id)
+        if entry is None:
+            return None
+        status_code, expires = entry
+        if expires <= time.time():
+            self._remove(element_id)
+            return None
+        self._entries.move_to_end(element_id)
+        return status_code
+
+    def put(self, element_id: str, status_code: int) -> None:
+        """Record the final status of ``element_id`` if it is cacheable."""
+        if status_code == 202:
+            now = time.time()
+            self._deferred[element_id] = now + self.ttl
+            self._deferred.move_to_end(element_id)
+            # Same TTL for all: the oldest entries expire first.
+            while self._deferred and next(iter(self._deferred.values())) <= now:
+                self._deferred.popitem(last=False)
+            while len(self._deferred) > self.max_entries:
+                self._deferred.popitem(last=False)
+                self._evictions += 1
+            return
+        self._deferred.pop(element_id, None)
+        if status_code not in self.statuses:
+            return
+        expires = time.time() + self.ttl
+        self._entries[element_id] = (status_code, expires)
+        self._entries.move_to_end(element_id)
+        if self._db is not None:
+            self._db[element_id] = f"{status_code} {expires}"
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def lookup(self, element_id: str) -> Optional[int]:
+        """
+        Status a redelivery of ``element_id`` can be answered with right away:
+        the cached status, ``202`` while its callback is pending, else ``None``.
+        """
+        status_code = self.get(element_id)
+        if status_code is not None:
+            self._hits += 1
+            return status_code
+        if self._is_deferred(element_id):
+            self._attached += 1
+            return 202
+        return None
+
+    async def run(self, element_id: str, attempt: Callable[[], Awaitable[int]]) -> int:
+        """
+        Return the status for ``element_id``: cached, shared with the attempt
+        already running, or computed by ``attempt()`` and cached.
+        """
+        status_code = self.lookup(element_id)
+        if status_code is not None:
+            return status_code
+        running = self._running.get(element_id)
+        if running is not None:
+            self._attached += 1
+            return await asyncio.shield(running)
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._running[element_id] = future
+        try:
+            status_code = await attempt()
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Attached redeliveries see the exception; nobody else may be waiting.
+            future.exception()
+            raise
+        else:
+            self.put(element_id, status_code)
+            future.set_result(status_code)
+            return status_code
+        finally:
+            del self._running[element_id]
+
+    def is_running(self, element_id: str) -> bool:
+        """True while an attempt for ``element_id`` runs or awaits its 202 callback."""
+        return element_id in self._running or self._is_deferred(element_id)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, element_id: object) -> bool:
+        return isinstance(element_id, str) and self.get(element_id) is not None
+
+    def close(self) -> None:
+        """Close the on-disk database, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def snapshot(self) -> dict[str, int]:
+        """Entry count and hit/attach/miss/eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "attached": self._attached,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    def _open(self, path: str) -> None:
+        try:
+            self._db = dbm.open(path, "c")
+        except OSError as exc:
+            logger.warning("Idempotency cache %s unavailable, keeping it in memory: %s", path, exc)
+            return
+        now = time.time()
+        loaded: list[tuple[float, str, int]] = []
+        for key in self._db.keys():
+            element_id = key.decode()
+            try:
+                status, expires = self._db[key].decode().split()
+                loaded.append((float(expires), element_id, int(status)))
+            except ValueError:
+                del self._db[key]
+        # Oldest expiry first: the closest thing to the LRU order we had.
+        for expires, element_id, status_code in sorted(loaded):
+            if expires <= now:
+                del self._db[element_id]
+            else:
+                self._entries[element_id] = (status_code, expires)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _is_deferred(self, element_id: str) -> bool:
+        expires = self._deferred.get(element_id)
+        if expires is None:
+            return False
+        if expires <= time.time():
+            del self._deferred[element_id]
+            return False
+        return True
+
+    def _remove(self, element_id: str) -> None:
+        del self._entries[element_id]
+        if self._db is not None:
+            try:
+                del self._db[element_id]
+            except KeyError:
+                pass
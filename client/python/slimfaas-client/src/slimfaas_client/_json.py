@@ -0,0 +1,107 @@
+"""
+Pluggable JSON codecs for control messages.
+
+Every AsyncRequest, PublishEvent, callback and SyncRequestStart/SyncResponseStart
+goes through a JSON codec. :func:`default_json_codec` picks the fastest one
+installed: `orjson <https://pypi.org/project/orjson/>`_, then
+`msgspec <https://pypi.org/project/msgspec/>`_, then the standard library.
+All codecs encode straight to UTF-8 ``bytes``.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+from typing import Any, Union
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+
+
+class JsonCodec(abc.ABC):
+    """
+    Interface of a JSON codec.
+
+    ``loads`` must raise :class:`ValueError` on invalid input; ``dumps``
+    returns compact UTF-8 encoded ``bytes``.
+    """
+
+    name = "abstract"
+
+    @abc.abstractmethod
+    def loads(self, data: JsonInput) -> Any:
+        """Decode ``data``."""
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encode ``obj`` to compact UTF-8 ``bytes``."""
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class StdlibJsonCodec(JsonCodec):
+    """Codec based on the standard :mod:`json` module."""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+
+    def loads(self, data: JsonInput) -> Any:
+        if isinstance(data, str):
+            return self._decoder.decode(data)
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec based on ``orjson``."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data: JsonInput) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+
+class MsgspecJsonCodec(JsonCodec):
+    """Codec based on ``msgspec.json``."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data: JsonInput) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+def default_json_codec() -> JsonCodec:
+    """Return the fastest available codec: orjson, then msgspec, then stdlib."""
+    for codec in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            return codec()
+        except ImportError:
+            continue
+    return StdlibJsonCodec()
@@ -0,0 +1,230 @@
+"""
+Event loop lag monitor and slow handler detector.
+
+A handler doing blocking work on the event loop stalls the WebSocket read
+loop: pings, callbacks and every other request wait, and SlimFaas ends up
+answering callers with timeouts. :class:`LoopMonitor` measures the loop lag
+continuously and records, with its stack, the request whose handler was
+running when the loop stalled or that has been running for too long.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Optional
+
+from slimfaas_client._metrics import ClientMetrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.1
+DEFAULT_LAG_THRESHOLD = 0.1
+DEFAULT_SLOW_HANDLER_THRESHOLD = 5.0
+
+
+def _task_stack(task: asyncio.Task) -> str:
+    # Task.get_stack() stops at the task's own coroutine: follow the chain of
+    # awaited coroutines down to the one actually suspended.
+    frames = []
+    awaited: Any = task.get_coro()
+    while awaited is not None:
+        frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+    return "".join(traceback.StackSummary.extract(frames).format())
+
+
+class _Tracked:
+    """A running handler task and what it is handling."""
+
+    __slots__ = ("kind", "ident", "path", "started", "reported")
+
+    def __init__(self, kind: str, ident: str, path: str) -> None:
+        self.kind = kind
+        self.ident = ident
+        self.path = path
+        self.started = time.monotonic()
+        self.reported = False
+
+
+class LoopMonitor:
+    """
+    Measure event loop lag and catch the handlers that cause it.
+
+    A task on the loop wakes up every ``interval`` seconds and records how
+    late it woke up in the ``loop_lag_seconds`` histogram of the client's
+    :class:`ClientMetrics`. A watchdog thread checks that this task keeps
+    running: when the loop has been blocked for more than
+    ``lag_threshold`` seconds, it captures the stack of the loop thread,
+    i.e. of the code blocking it, and the request whose handler is
+    running. Handlers (async ones too) running for more than
+    ``slow_handler_threshold`` seconds are reported with the stack of their
+    task. Reports are logged and kept in the metrics::
+
+        client = SlimFaasClient(url, config, loop_monitor=LoopMonitor(lag_threshold=0.2))
+
+        client.metrics()["slow_reports"]
+        # [{"kind": "loop_stall", "seconds": 1.52, "message": "async_request",
+        #   "id": "0b7c…", "path": "/resize", "stack": "  File …", "time": 1760000000.0}]
+
+    Parameters
+    ----------
+    interval:
+        Seconds between two lag measurements.
+    lag_threshold:
+        Loop lag, in seconds, above which a stall is reported.
+    slow_handler_threshold:
+        Handler duration, in seconds, above which the handler is reported
+        (``None`` to disable).
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        lag_threshold: float = DEFAULT_LAG_THRESHOLD,
+        slow_handler_threshold: Optional[float] = DEFAULT_SLOW_HANDLER_THRESHOLD,
+    ) -> None:
+        if interval <= 0 or lag_threshold <= 0:
+            raise ValueError("interval and lag_threshold must be positive")
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.slow_handler_threshold = slow_handler_threshold
+        self._tracked: dict[asyncio.Task, _Tracked] = {}
+        self._metrics: Optional[ClientMetrics] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = 0.0
+        # Captured by the watchdog thread while the loop is blocked, read by the loop.
+        self._stall: Optional[tuple[Optional[_Tracked], str]] = None
+        self._users = 0
+
+    # ── Lifecycle (called by every client sharing the monitor) ───────────
+
+    async def start(self, metrics: ClientMetrics) -> None:
+        """Start monitoring the running loop, recording into ``metrics``."""
+        self._users += 1
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._metrics = metrics
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._measure())
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(loop, threading.get_ident()), name="slimfaas-loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring once the last client using the monitor stops."""
+        self._users = max(0, self._users - 1)
+        if self._users or self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stopped.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        self._watchdog = None
+
+    # ── Handler tracking (called by the client's dispatch) ───────────────
+
+    def track(self, kind: str, ident: str, path: str) -> None:
+        """Attach request details to the current handler task until it finishes."""
+        task = asyncio.current_task()
+        if task is None or self._task is None:
+            return
+        self._tracked[task] = _Tracked(kind, ident, path)
+        task.add_done_callback(self._untrack)
+
+    def _untrack(self, task: asyncio.Task) -> None:
+        self._tracked.pop(task, None)
+
+    # ── Measurement ──────────────────────────────────────────────────────
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - before - self.interval)
+            self._heartbeat = time.monotonic()
+            metrics = self._metrics
+            assert metrics is not None
+            metrics.loop_lag.observe(lag)
+            if lag >= self.lag_threshold:
+                metrics.loop_stalls += 1
+                tracked, stack = self._stall or (None, "")
+                self._report(metrics, "loop_stall", lag, tracked, stack)
+            self._stall = None
+            if self.slow_handler_threshold is not None:
+                self._check_slow_handlers(metrics, self.slow_handler_threshold)
+
+    def _check_slow_handlers(self, metrics: ClientMetrics, threshold: float) -> None:
+        now = time.monotonic()
+        for task, tracked in list(self._tracked.items()):
+            elapsed = now - tracked.started
+            if tracked.reported or elapsed < threshold:
+                continue
+            tracked.reported = True
+            metrics.slow_handlers += 1
+            self._report(metrics, "slow_handler", elapsed, tracked, _task_stack(task))
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        # Runs in its own thread: the only way to see what blocks the loop is
+        # to look at the loop thread's stack while it is blocked.
+        check_every = min(self.interval, self.lag_threshold) / 2
+        while not self._stopped.wait(check_every):
+            blocked = time.monotonic() - self._heartbeat - self.interval
+            if blocked < self.lag_threshold or self._stall is not None:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            try:
+                task = asyncio.current_task(loop)
+            except RuntimeError:
+                task = None
+            self._stall = (self._tracked.get(task) if task is not None else None, stack)  # type: ignore[arg-type]
+
+    def _report(
+        self, metrics: ClientMetrics, kind: str, seconds: float, tracked: Optional[_Tracked], stack: str
+    ) -> None:
+        report: dict[str, Any] = {
+            "kind": kind,
+            "seconds": seconds,
+            "message": tracked.kind if tracked else None,
+            "id": tracked.ident if tracked else None,
+            "path": tracked.path if tracked else None,
+            "stack": stack,
+            "time": time.time(),
+        }
+        metrics.slow_reports.append(report)
+        if tracked is None:
+            logger.warning("Event loop blocked for %.3f s\n%s", seconds, stack)
+        elif kind == "loop_stall":
+            logger.warning(
+                "Event loop blocked for %.3f s by %s %s (%s)\n%s",
+                seconds, tracked.kind, tracked.ident, tracked.path, stack,
+            )
+        else:
+            logger.warning(
+                "Handler for %s %s (%s) running for %.3f s\n%s",
+                tracked.kind, tracked.ident, tracked.path, seconds, stack,
+            )
+
+    @property
+    def running_handlers(self) -> int:
+        """Number of handler tasks currently tracked."""
+        return len(self._tracked)
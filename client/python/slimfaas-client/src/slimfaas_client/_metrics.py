@@ -0,0 +1,258 @@
+"""
+Low-overhead instrumentation of the client.
+
+Latencies go into fixed-bucket histograms: recording a value is one binary
+search over a short tuple and two additions, whatever the number of
+messages already recorded. Counters and histograms are plain attributes
+updated from the event loop thread, so no locking is involved.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+MESSAGE_KINDS = ("async_request", "publish_event", "sync_request")
+
+DEFAULT_MAX_SLOW_REPORTS = 20
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus semantics: a value lands in the
+    first bucket whose upper bound is greater than or equal to it).
+    """
+
+    __slots__ = ("bounds", "_counts", "_sum")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        if list(bounds) != sorted(bounds):
+            raise ValueError("bucket bounds must be sorted")
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """``(upper bound, values <= bound)`` pairs, ending with ``+inf``."""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.bounds + (math.inf,), self._counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def snapshot(self) -> dict[str, Any]:
+        """``count``, ``sum`` and cumulative ``buckets`` keyed by upper bound."""
+        buckets = self.cumulative()
+        return {"count": buckets[-1][1], "sum": self._sum, "buckets": dict(buckets)}
+
+
+class MessageMetrics:
+    """Histograms and byte counters of one kind of message."""
+
+    __slots__ = ("decode", "slot_wait", "handler", "callback_send", "bytes_in", "bytes_out")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.decode = Histogram(bounds)
+        """Time to parse the message and build the request object."""
+        self.slot_wait = Histogram(bounds)
+        """Time waiting for a concurrency slot before the handler starts."""
+        self.handler = Histogram(bounds)
+        """Handler duration (for sync requests: until the response is complete)."""
+        self.callback_send = Histogram(bounds)
+        """Time to hand the AsyncCallback to the connection (async requests only)."""
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _histograms(self) -> dict[str, Histogram]:
+        return {
+            "decode_seconds": self.decode,
+            "slot_wait_seconds": self.slot_wait,
+            "handler_seconds": self.handler,
+            "callback_send_seconds": self.callback_send,
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        result: dict[str, Any] = {name: h.snapshot() for name, h in self._histograms().items()}
+        result["bytes_in"] = self.bytes_in
+        result["bytes_out"] = self.bytes_out
+        return result
+
+
+class ClientMetrics:
+    """
+    Per-message-type latency histograms, byte counters and connection
+    counters, filled by the client.
+
+    Every client records into one by default; pass the same instance to
+    several clients (as :class:`SlimFaasClientPool` does) to aggregate
+    them::
+
+        client.metrics()
+        # {"async_request": {"decode_seconds": {"count": 120, "sum": 0.004, "buckets": {...}},
+        #                    "slot_wait_seconds": {...}, "handler_seconds": {...},
+        #                    "callback_send_seconds": {...}, "bytes_in": 48210, "bytes_out": 9120},
+        #  "publish_event": {...}, "sync_request": {...},
+        #  "connections": 3, "reconnects": 2,
+        #  "loop_lag_seconds": {...}, "loop_stalls": 0, "slow_handlers": 0, "slow_reports": []}
+
+    The ``loop_*`` and ``slow_*`` entries are filled by a :class:`LoopMonitor`,
+    when one is installed; ``slow_reports`` keeps the last
+    ``max_slow_reports`` stalls and slow handlers with their stack.
+
+    With ``prometheus_port``, the same data is served in the Prometheus
+    text format on ``http://<prometheus_host>:<port>/metrics`` while the
+    client runs::
+
+        client = SlimFaasClient(url, config, metrics=ClientMetrics(prometheus_port=9464))
+
+    Parameters
+    ----------
+    buckets:
+        Upper bounds, in seconds, of the latency histogram buckets.
+    prometheus_port:
+        Port of the Prometheus endpoint (disabled by default, ``0`` picks a
+        free port, see :attr:`prometheus_address`).
+    prometheus_host:
+        Interface of the Prometheus endpoint (default: loopback only).
+    max_slow_reports:
+        Number of recent :class:`LoopMonitor` reports kept.
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        *,
+        prometheus_port: Optional[int] = None,
+        prometheus_host: str = "127.0.0.1",
+        max_slow_reports: int = DEFAULT_MAX_SLOW_REPORTS,
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.messages = {kind: MessageMetrics(self.buckets) for kind in MESSAGE_KINDS}
+        self.async_request = self.messages["async_request"]
+        self.publish_event = self.messages["publish_event"]
+        self.sync_request = self.messages["sync_request"]
+        self.connections = 0
+        self.reconnects = 0
+        self.loop_lag = Histogram(self.buckets)
+        """Event loop lag measured by a :class:`LoopMonitor`."""
+        self.loop_stalls = 0
+        self.slow_handlers = 0
+        self.slow_reports: deque[dict[str, Any]] = deque(maxlen=max_slow_reports)
+        self.prometheus_port = prometheus_port
+        self.prometheus_host = prometheus_host
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._users = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        result: dict[str, Any] = {kind: m.snapshot() for kind, m in self.messages.items()}
+        result["connections"] = self.connections
+        result["reconnects"] = self.reconnects
+        result["loop_lag_seconds"] = self.loop_lag.snapshot()
+        result["loop_stalls"] = self.loop_stalls
+        result["slow_handlers"] = self.slow_handlers
+        result["slow_reports"] = list(self.slow_reports)
+        return result
+
+    # ── Prometheus exposition ────────────────────────────────────────────
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        histograms: dict[str, list[tuple[str, Histogram]]] = {}
+        for kind, m in self.messages.items():
+            for name, histogram in m._histograms().items():
+                histograms.setdefault(name, []).append((kind, histogram))
+        for name, series in histograms.items():
+            metric = f"slimfaas_client_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for kind, histogram in series:
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f'{metric}_bucket{{kind="{kind}",le="{le}"}} {count}')
+                lines.append(f'{metric}_sum{{kind="{kind}"}} {histogram.sum!r}')
+                lines.append(f'{metric}_count{{kind="{kind}"}} {histogram.count}')
+        for name in ("bytes_in", "bytes_out"):
+            metric = f"slimfaas_client_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for kind, m in self.messages.items():
+                lines.append(f'{metric}{{kind="{kind}"}} {getattr(m, name)}')
+        lines.append("# TYPE slimfaas_client_loop_lag_seconds histogram")
+        for bound, count in self.loop_lag.cumulative():
+            le = "+Inf" if bound == math.inf else repr(bound)
+            lines.append(f'slimfaas_client_loop_lag_seconds_bucket{{le="{le}"}} {count}')
+        lines.append(f"slimfaas_client_loop_lag_seconds_sum {self.loop_lag.sum!r}")
+        lines.append(f"slimfaas_client_loop_lag_seconds_count {self.loop_lag.count}")
+        for name in ("connections", "reconnects", "loop_stalls", "slow_handlers"):
+            metric = f"slimfaas_client_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {getattr(self, name)}")
+        return "\n".join(lines) + "\n"
+
+    @property
+    def prometheus_address(self) -> Optional[tuple[str, int]]:
+        """``(host, port)`` of the running Prometheus endpoint, or ``None``."""
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Start the Prometheus endpoint, if configured. Called by every client sharing these metrics."""
+        self._users += 1
+        if self.prometheus_port is None or self._server is not None:
+            return
+        self._server = await asyncio.start_server(self._serve, self.prometheus_host, self.prometheus_port)
+        logger.info("Prometheus metrics on http://%s:%d/metrics", *self.prometheus_address)  # type: ignore[misc]
+
+    async def stop(self) -> None:
+        """Stop the Prometheus endpoint once the last client using it stops."""
+        self._users = max(0, self._users - 1)
+        if self._users or self._server is None:
+            return
+        server, self._server = self._server, None
+        server.close()
+        await server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            method, _, rest = request.partition(b" ")
+            path = rest.split(b" ", 1)[0].split(b"?", 1)[0]
+            if method == b"GET" and path in (b"/metrics", b"/"):
+                body = self.prometheus_text().encode()
+                status = b"200 OK"
+                content_type = b"text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body, status, content_type = b"Not Found\n", b"404 Not Found", b"text/plain"
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\nContent-Type: " + content_type
+                + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as exc:
+            logger.debug("Metrics request failed: %s", exc)
+        finally:
+            writer.close()
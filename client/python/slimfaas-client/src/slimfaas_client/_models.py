@@ -4,10 +4,29 @@ Data models for the SlimFaas WebSocket protocol.
 
 from __future__ import annotations
 
+import asyncio
+import binascii
+import io
+import logging
+import mmap
+import os
 import struct
+from collections import deque
 from dataclasses import dataclass, field
 from enum import IntEnum, Enum
-from typing import Callable, Optional, Tuple
+from typing import IO, Any, AsyncIterator, Callable, Iterator, Mapping, Optional, Tuple, Union
+
+from slimfaas_client._buffering import ResponseBuffering
+from slimfaas_client._flow_control import SyncBodyFlowControl
+from slimfaas_client._spool import BodySpooler, SpooledBody
+
+logger = logging.getLogger(__name__)
+
+# Window size used by SyncResponseWriter.write_file().
+DEFAULT_FILE_WINDOW = 256 * 1024
+
+BytesLike = Union[bytes, bytearray, memoryview, Any]
+"""Any object supporting the buffer protocol."""
 
 
 # ---------------------------------------------------------------------------
@@ -180,49 +199,201 @@ class SlimFaasClientConfig:
 # Messages received by the client
 # ---------------------------------------------------------------------------
 
-@dataclass
-class AsyncRequest:
-    """Asynchronous request sent by SlimFaas to the WebSocket client."""
+class Headers(Mapping[str, list[str]]):
+    """
+    Read-only view over the HTTP headers of a message.
 
-    element_id: str
-    """Unique identifier of the queue entry."""
+    Lookups first try the exact key, then fall back to a case-insensitive
+    index that is only built on the first miss::
 
-    method: str
-    """HTTP method (GET, POST, PUT, DELETE, …)."""
+        req.headers["content-type"]          # ["application/json"]
+        req.headers.get_first("Content-Type")  # "application/json"
+    """
 
-    path: str
-    """Request path."""
+    __slots__ = ("_raw", "_lower")
 
-    query: str
-    """Query string (including the leading '?' if non-empty)."""
+    def __init__(self, raw: Optional[dict[str, list[str]]] = None) -> None:
+        self._raw = raw if raw is not None else {}
+        self._lower: Optional[dict[str, list[str]]] = None
 
-    headers: dict[str, list[str]]
-    """HTTP headers."""
+    def __getitem__(self, key: str) -> list[str]:
+        try:
+            return self._raw[key]
+        except KeyError:
+            pass
+        lower = self._lower
+        if lower is None:
+            lower = self._lower = {k.lower(): v for k, v in self._raw.items()}
+        return lower[key.lower()]
 
-    body: Optional[bytes]
-    """Request body (decoded from base64)."""
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
 
-    is_last_try: bool
-    """True if this is the last retry attempt."""
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
 
-    try_number: int
-    """Attempt number (starts at 1)."""
+    def __len__(self) -> int:
+        return len(self._raw)
 
-    @classmethod
-    def from_payload(cls, payload: dict) -> "AsyncRequest":
-        body_b64: Optional[str] = payload.get("body")
-        import base64
-        body = base64.b64decode(body_b64) if body_b64 else None
-        return cls(
-            element_id=payload["elementId"],
-            method=payload["method"],
-            path=payload["path"],
-            query=payload.get("query", ""),
-            headers={k: v for k, v in payload.get("headers", {}).items()},
-            body=body,
-            is_last_try=payload.get("isLastTry", False),
-            try_number=payload.get("tryNumber", 1),
+    def __repr__(self) -> str:
+        return f"Headers({self._raw!r})"
+
+    def get_first(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """First value of header ``key`` (case-insensitive), or ``default``."""
+        values = self.get(key)
+        return values[0] if values else default
+
+
+class _LazyBodyMessage:
+    """
+    Base for messages whose body arrives base64-encoded in the JSON payload.
+
+    The body is only decoded on first access of :attr:`body`; handlers that
+    only look at headers never pay for it. With a :class:`BodySpooler`, bodies
+    above its threshold are decoded into a temporary file and :attr:`body` is
+    a :class:`SpooledBody` instead of ``bytes``.
+    """
+
+    __slots__ = ("_headers", "_body", "_body_base64", "_body_decoded", "_spooler")
+
+    _fields: Tuple[str, ...] = ()
+
+    def _init_body(self, headers: Any, body: Optional[bytes]) -> None:
+        self._headers = headers if isinstance(headers, Headers) else Headers(headers)
+        self._body = body
+        self._body_base64: Optional[str] = None
+        self._body_decoded = True
+        self._spooler: Optional[BodySpooler] = None
+
+    def _init_payload_body(self, payload: dict, spooler: Optional[BodySpooler]) -> None:
+        self._headers = Headers(payload.get("headers"))
+        self._body = None
+        self._body_base64 = payload.get("body") or None
+        self._body_decoded = self._body_base64 is None
+        self._spooler = spooler
+
+    @property
+    def headers(self) -> Headers:
+        """HTTP headers (read-only, case-insensitive lookup)."""
+        return self._headers
+
+    @property
+    def body(self) -> Optional[bytes]:
+        """Request body, decoded from base64 on first access (possibly spooled to disk)."""
+        if not self._body_decoded:
+            encoded: str = self._body_base64  # type: ignore[assignment]
+            spooler = self._spooler
+            if spooler is not None and spooler.should_spool(len(encoded) // 4 * 3):
+                self._body = spooler.spool_base64(encoded)
+                # Let the encoded copy be freed; body_base64 re-encodes on demand.
+                self._body_base64 = None
+            else:
+                self._body = binascii.a2b_base64(encoded)
+            self._body_decoded = True
+        return self._body
+
+    @body.setter
+    def body(self, value: Optional[bytes]) -> None:
+        self._body = value
+        self._body_base64 = None
+        self._body_decoded = True
+
+    @property
+    def body_base64(self) -> Optional[str]:
+        """Body as received from SlimFaas (base64), without decoding it."""
+        if self._body_base64 is None and self._body is not None:
+            self._body_base64 = binascii.b2a_base64(self._body, newline=False).decode("ascii")
+        return self._body_base64
+
+    def _release_body(self) -> None:
+        """Delete the spooled body file, if any (called once the handler is done)."""
+        if isinstance(self._body, SpooledBody):
+            self._body.close()
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{f}=<{len(self.body or b'')} bytes>" if f == "body" else f"{f}={getattr(self, f)!r}"
+            for f in self._fields
         )
+        return f"{type(self).__name__}({fields})"
+
+
+class AsyncRequest(_LazyBodyMessage):
+    """
+    Asynchronous request sent by SlimFaas to the WebSocket client.
+
+    Attributes
+    ----------
+    element_id:
+        Unique identifier of the queue entry.
+    method:
+        HTTP method (GET, POST, PUT, DELETE, …).
+    path:
+        Request path.
+    query:
+        Query string (including the leading '?' if non-empty).
+    headers:
+        HTTP headers (read-only :class:`Headers` view).
+    body:
+        Request body (decoded from base64 on first access).
+    is_last_try:
+        True if this is the last retry attempt.
+    try_number:
+        Attempt number (starts at 1).
+    path_params:
+        Parameters extracted from the path by the matching route (see
+        :meth:`SlimFaasClient.route`); empty without routing.
+    """
+
+    __slots__ = ("element_id", "method", "path", "query", "is_last_try", "try_number", "path_params")
+
+    _fields = ("element_id", "method", "path", "query", "headers", "body", "is_last_try", "try_number")
+
+    def __init__(
+        self,
+        element_id: str,
+        method: str,
+        path: str,
+        query: str,
+        headers: dict[str, list[str]],
+        body: Optional[bytes],
+        is_last_try: bool,
+        try_number: int,
+    ) -> None:
+        self.element_id = element_id
+        self.method = method
+        self.path = path
+        self.query = query
+        self.is_last_try = is_last_try
+        self.try_number = try_number
+        self.path_params: dict[str, str] = {}
+        self._init_body(headers, body)
+
+    @classmethod
+    def from_payload(cls, payload: dict, spooler: Optional[BodySpooler] = None) -> "AsyncRequest":
+        self = cls.__new__(cls)
+        self.element_id = payload["elementId"]
+        self.method = payload["method"]
+        self.path = payload["path"]
+        self.query = payload.get("query", "")
+        self.is_last_try = payload.get("isLastTry", False)
+        self.try_number = payload.get("tryNumber", 1)
+        self.path_params = {}
+        self._init_payload_body(payload, spooler)
+        return self
 
 
 @dataclass
@@ -233,30 +404,37 @@ class AsyncCallback:
     status_code: int = 200
 
 
-@dataclass
-class PublishEvent:
+class PublishEvent(_LazyBodyMessage):
     """Publish/subscribe event received from SlimFaas."""
 
-    event_name: str
-    method: str
-    path: str
-    query: str
-    headers: dict[str, list[str]]
-    body: Optional[bytes]
+    __slots__ = ("event_name", "method", "path", "query")
+
+    _fields = ("event_name", "method", "path", "query", "headers", "body")
+
+    def __init__(
+        self,
+        event_name: str,
+        method: str,
+        path: str,
+        query: str,
+        headers: dict[str, list[str]],
+        body: Optional[bytes],
+    ) -> None:
+        self.event_name = event_name
+        self.method = method
+        self.path = path
+        self.query = query
+        self._init_body(headers, body)
 
     @classmethod
-    def from_payload(cls, payload: dict) -> "PublishEvent":
-        body_b64: Optional[str] = payload.get("body")
-        import base64
-        body = base64.b64decode(body_b64) if body_b64 else None
-        return cls(
-            event_name=payload["eventName"],
-            method=payload["method"],
-            path=payload["path"],
-            query=payload.get("query", ""),
-            headers={k: v for k, v in payload.get("headers", {}).items()},
-            body=body,
-        )
+    def from_payload(cls, payload: dict, spooler: Optional[BodySpooler] = None) -> "PublishEvent":
+        self = cls.__new__(cls)
+        self.event_name = payload["eventName"]
+        self.method = payload["method"]
+        self.path = payload["path"]
+        self.query = payload.get("query", "")
+        self._init_payload_body(payload, spooler)
+        return self
 
 
 # ---------------------------------------------------------------------------
@@ -269,35 +447,90 @@ class BinaryFrame:
 
     Format: [type 1B][correlationId 36B ASCII][flags 1B][length 4B BE][payload nB]
     Total header: 42 bytes.
+
+    Decoding never copies the payload: :meth:`decode` returns a ``memoryview``
+    over the received message. Encoding packs the header with a single
+    precompiled :class:`struct.Struct`; :meth:`encode_fragments` avoids
+    copying large payloads altogether by returning ``[header, payload]``,
+    which is sent as one fragmented WebSocket message.
     """
 
     HEADER_SIZE = 42
     FLAG_END_OF_STREAM = 0x01
+    FRAGMENT_THRESHOLD = 64 * 1024
+    """Payloads of at least this many bytes are sent as ``[header, payload]`` fragments."""
+
+    _HEADER = struct.Struct(">B36sBI")
+
+    @staticmethod
+    def _encode_correlation_id(correlation_id: str) -> bytes:
+        return correlation_id.encode("ascii").ljust(36)[:36]
+
+    @staticmethod
+    def encode_header(msg_type: int, correlation_id: str, length: int = 0, flags: int = 0) -> bytes:
+        """Returns the 42-byte header of a frame carrying ``length`` payload bytes."""
+        return BinaryFrame._HEADER.pack(
+            msg_type, BinaryFrame._encode_correlation_id(correlation_id), flags, length
+        )
 
     @staticmethod
-    def encode(msg_type: int, correlation_id: str, payload: bytes = b"", flags: int = 0) -> bytes:
-        corr = correlation_id.ljust(36)[:36].encode("ascii")
-        length = len(payload)
-        header = struct.pack(">B", msg_type) + corr + struct.pack(">BI", flags, length)
-        return header + payload
+    def encode(msg_type: int, correlation_id: str, payload: "BytesLike" = b"", flags: int = 0) -> bytearray:
+        """Encode a frame into one preallocated buffer (a single payload copy)."""
+        length = len(payload) if isinstance(payload, (bytes, bytearray)) else memoryview(payload).nbytes
+        frame = bytearray(BinaryFrame.HEADER_SIZE + length)
+        BinaryFrame._HEADER.pack_into(
+            frame, 0, msg_type, BinaryFrame._encode_correlation_id(correlation_id), flags, length
+        )
+        if length:
+            frame[BinaryFrame.HEADER_SIZE:] = payload
+        return frame
 
     @staticmethod
-    def decode_header(data: bytes) -> Tuple[int, str, int, int]:
+    def encode_fragments(
+        msg_type: int, correlation_id: str, payload: "BytesLike" = b"", flags: int = 0
+    ) -> list["BytesLike"]:
+        """Encode a frame as ``[header, payload]`` without copying the payload."""
+        length = len(payload) if isinstance(payload, (bytes, bytearray)) else memoryview(payload).nbytes
+        return [BinaryFrame.encode_header(msg_type, correlation_id, length, flags), payload]
+
+    @staticmethod
+    def decode_header(data: "BytesLike") -> Tuple[int, str, int, int]:
         """Returns (type, correlationId, flags, payloadLength)."""
         if len(data) < BinaryFrame.HEADER_SIZE:
             raise ValueError(f"Binary frame must be at least {BinaryFrame.HEADER_SIZE} bytes")
-        msg_type = data[0]
-        correlation_id = data[1:37].decode("ascii").strip()
-        flags = data[37]
-        length = struct.unpack(">I", data[38:42])[0]
-        return msg_type, correlation_id, flags, length
+        msg_type, corr, flags, length = BinaryFrame._HEADER.unpack_from(data)
+        return msg_type, corr.decode("ascii").strip(), flags, length
+
+    @staticmethod
+    def decode(data: "BytesLike") -> Tuple[int, str, int, memoryview]:
+        """Returns (type, correlationId, flags, payload) where payload is a zero-copy ``memoryview``."""
+        msg_type, correlation_id, flags, length = BinaryFrame.decode_header(data)
+        start = BinaryFrame.HEADER_SIZE
+        return msg_type, correlation_id, flags, memoryview(data)[start:start + length]
+
+
+def as_byte_view(data: "BytesLike") -> "BytesLike":
+    """
+    Return ``data`` as a flat bytes-like object without copying when possible.
+
+    ``bytes``/``bytearray`` are returned unchanged; other buffer-protocol
+    objects (memoryview, NumPy arrays, …) become a byte-wise ``memoryview``.
+    Non-contiguous buffers are copied.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    view = memoryview(data)
+    try:
+        return view.cast("B")
+    except TypeError:
+        return view.tobytes()
 
 
 class SyncBodyStream:
     """
     Asynchronous stream of the body of a synchronous request received via WebSocket.
 
-    Exposes the binary chunks received on the fly as a readable object in three ways:
+    Exposes the binary chunks received on the fly as a readable object in several ways:
 
     1. **Chunk-by-chunk** (async for)::
 
@@ -313,14 +546,47 @@ class SyncBodyStream:
 
         all_bytes = await req.body.readall()
 
+    4. **asyncio.StreamReader-style helpers** for parsers::
+
+        n = await req.body.readinto(buffer)          # copy directly into a buffer
+        header = await req.body.readexactly(16)      # IncompleteReadError on early EOF
+        line = await req.body.readuntil(b"\r\n")     # includes the separator
+
     The stream is finished when ``read()`` returns ``b""`` or
     when ``async for`` stops naturally.
+
+    Received chunks are kept, uncopied, in a deque with a read cursor on the
+    first chunk, so reading a large body in small pieces costs O(n) overall.
+    ``async for`` and the ``read*`` methods return ``bytes``;
+    :meth:`iter_views` yields the received chunks uncopied (usually
+    ``memoryview`` slices of the received frames).
+
+    When created with a :class:`SyncBodyFlowControl`, buffered bytes are
+    accounted against its watermarks and global budget, and the client
+    pauses its read loop while the handler catches up.
+
+    When created with a :class:`BodySpooler`, ``readall()`` (and ``read()``)
+    writes bodies larger than its threshold to a temporary file as chunks
+    arrive and returns a :class:`SpooledBody`; the file is deleted once the
+    handler returns.
     """
 
-    def __init__(self, queue: asyncio.Queue) -> None:
-        self._queue = queue
-        self._buf = b""
+    def __init__(
+        self,
+        flow_control: Optional[SyncBodyFlowControl] = None,
+        spooler: Optional[BodySpooler] = None,
+    ) -> None:
+        self._chunks: deque[BytesLike] = deque()
+        self._offset = 0
+        self._size = 0
         self._eof = False
+        self._waiter: Optional[asyncio.Future] = None
+        self._flow_control = flow_control
+        self._reading = False
+        self._rejected = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._spooler = spooler
+        self._spooled: list[SpooledBody] = []
 
     # ── async for chunk in stream ────────────────────────────────────────
 
@@ -328,16 +594,37 @@ class SyncBodyStream:
         return self
 
     async def __anext__(self) -> bytes:
-        if self._buf:
-            chunk, self._buf = self._buf, b""
-            return chunk
-        if self._eof:
-            raise StopAsyncIteration
-        chunk = await self._queue.get()
+        chunk = await self._next_chunk()
         if chunk is None:
-            self._eof = True
             raise StopAsyncIteration
-        return chunk
+        return bytes(chunk)
+
+    async def iter_views(self) -> AsyncIterator[BytesLike]:
+        """
+        Iterate over the received chunks without copying them.
+
+        Like ``async for chunk in stream``, but the chunks are the received
+        buffers themselves (usually ``memoryview`` slices of the WebSocket
+        frames) instead of ``bytes`` copies::
+
+            async for view in req.body.iter_views():
+                hasher.update(view)
+        """
+        while True:
+            chunk = await self._next_chunk()
+            if chunk is None:
+                return
+            yield chunk
+
+    async def _next_chunk(self) -> Optional[BytesLike]:
+        while not self._size:
+            if self._eof:
+                return None
+            await self._wait_for_data()
+        chunk = self._chunks.popleft()
+        start, self._offset = self._offset, 0
+        self._consumed(len(chunk) - start)
+        return memoryview(chunk)[start:] if start else chunk
 
     # ── read(n=-1) ───────────────────────────────────────────────────────
 
@@ -347,43 +634,285 @@ class SyncBodyStream:
         If ``n == -1`` (default), reads until the end of the stream.
         Returns ``b""`` at end of stream.
         """
-        if n == -1:
+        if n < 0:
             return await self.readall()
-
-        # Accumulate until we have n bytes or EOF
-        while len(self._buf) < n and not self._eof:
-            chunk = await self._queue.get()
-            if chunk is None:
-                self._eof = True
-                break
-            self._buf += chunk
-
-        result, self._buf = self._buf[:n], self._buf[n:]
-        return result
+        while self._size < n and not self._eof:
+            await self._wait_for_data()
+        return self._take(min(n, self._size))
 
     # ── readall() ────────────────────────────────────────────────────────
 
     async def readall(self) -> bytes:
-        """Reads the entire body until end of stream and returns the bytes."""
-        parts = [self._buf]
-        self._buf = b""
-        while not self._eof:
-            chunk = await self._queue.get()
-            if chunk is None:
-                self._eof = True
-                break
-            parts.append(chunk)
+        """
+        Reads the entire body until end of stream and returns the bytes.
+
+        With a spooler, bodies above its threshold are returned as a
+        :class:`SpooledBody` instead.
+        """
+        if self._spooler is None:
+            while not self._eof:
+                await self._wait_for_data()
+            return self._take(self._size)
+        return await self._spool_all(self._spooler)
+
+    async def _spool_all(self, spooler: BodySpooler) -> bytes:
+        # Chunks are consumed as they arrive, so flow control keeps reading
+        # the socket while large bodies go straight to disk.
+        parts: list[BytesLike] = []
+        total = 0
+        file = None
+        try:
+            async for chunk in self.iter_views():
+                if file is not None:
+                    file.write(chunk)
+                    continue
+                parts.append(chunk)
+                total += len(chunk)
+                if spooler.should_spool(total):
+                    file = spooler.open()
+                    file.writelines(parts)
+                    parts.clear()
+            if file is None:
+                return parts[0] if len(parts) == 1 and isinstance(parts[0], bytes) else b"".join(parts)
+            body = SpooledBody(file)
+        except BaseException:
+            if file is not None:
+                file.close()
+            raise
+        self._spooled.append(body)
+        return body  # type: ignore[return-value]
+
+    # ── StreamReader-style helpers ───────────────────────────────────────
+
+    async def readinto(self, buffer: BytesLike) -> int:
+        """
+        Copy buffered bytes directly into ``buffer`` (any writable buffer).
+
+        Waits until at least one byte is available, then copies as many
+        buffered bytes as fit without waiting further. Returns the number of
+        bytes copied, ``0`` at end of stream.
+        """
+        view = memoryview(buffer).cast("B")
+        while not self._size and not self._eof:
+            await self._wait_for_data()
+        copied = 0
+        capacity = len(view)
+        while copied < capacity and self._chunks:
+            chunk = self._chunks[0]
+            start = self._offset
+            count = min(len(chunk) - start, capacity - copied)
+            view[copied:copied + count] = memoryview(chunk)[start:start + count]
+            copied += count
+            self._advance(count)
+        self._consumed(copied)
+        return copied
+
+    async def readexactly(self, n: int) -> bytes:
+        """
+        Read exactly ``n`` bytes.
+
+        Raises :class:`asyncio.IncompleteReadError` if the end of stream is
+        reached first; its ``partial`` attribute holds the bytes read.
+        """
+        if n < 0:
+            raise ValueError("readexactly size can not be less than zero")
+        while self._size < n and not self._eof:
+            await self._wait_for_data()
+        if self._size < n:
+            raise asyncio.IncompleteReadError(self._take(self._size), n)
+        return self._take(n)
+
+    async def readuntil(self, separator: bytes = b"\n") -> bytes:
+        """
+        Read data until ``separator`` is found; the separator is included.
+
+        Raises :class:`asyncio.IncompleteReadError` if the end of stream is
+        reached before the separator; its ``partial`` attribute holds the
+        remaining bytes.
+        """
+        seplen = len(separator)
+        if seplen == 0:
+            raise ValueError("Separator should be at least one-byte string")
+        scanned = 0
+        while True:
+            if self._size >= seplen:
+                buf = self._coalesce()
+                index = buf.find(separator, self._offset + scanned)
+                if index != -1:
+                    return self._take(index + seplen - self._offset)
+                scanned = self._size - seplen + 1
+            if self._eof:
+                raise asyncio.IncompleteReadError(self._take(self._size), None)
+            await self._wait_for_data()
+
+    def at_eof(self) -> bool:
+        """True if the end of stream was received and every byte was consumed."""
+        return self._eof and not self._size
+
+    # ── Buffer management ────────────────────────────────────────────────
+
+    def _advance(self, count: int) -> None:
+        """Move the read cursor ``count`` bytes forward within the first chunk."""
+        self._offset += count
+        if self._offset == len(self._chunks[0]):
+            self._chunks.popleft()
+            self._offset = 0
+
+    def _take(self, n: int) -> bytes:
+        """Consume ``n`` buffered bytes (``n <= self._size``) into one ``bytes`` object."""
+        if n == 0:
+            return b""
+        parts: list[BytesLike] = []
+        remaining = n
+        while remaining:
+            chunk = self._chunks[0]
+            start = self._offset
+            count = min(len(chunk) - start, remaining)
+            if start == 0 and count == len(chunk):
+                parts.append(chunk)
+            else:
+                parts.append(memoryview(chunk)[start:start + count])
+            remaining -= count
+            self._advance(count)
+        self._consumed(n)
+        if len(parts) == 1 and isinstance(parts[0], bytes):
+            return parts[0]
         return b"".join(parts)
 
+    def _coalesce(self) -> bytearray:
+        """
+        Merge every buffered chunk into a single ``bytearray`` (keeping the
+        read cursor), so a separator can be searched across chunk boundaries.
+        Repeated calls only append the chunks received since the last one.
+        """
+        first = self._chunks[0]
+        if isinstance(first, bytearray):
+            self._chunks.popleft()
+            buf = first
+        else:
+            buf = bytearray(memoryview(self._chunks.popleft())[self._offset:])
+            self._offset = 0
+        while self._chunks:
+            buf += self._chunks.popleft()
+        self._chunks.append(buf)
+        return buf
+
+    async def _wait_for_data(self) -> None:
+        if self._waiter is not None:
+            raise RuntimeError("SyncBodyStream does not support concurrent readers")
+        self._waiter = asyncio.get_running_loop().create_future()
+        # The reader needs more frames: a driver paused on this stream must resume.
+        self._wake_drain_waiter()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wake_up(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    # ── Flow control ─────────────────────────────────────────────────────
+
+    def _consumed(self, n: int) -> None:
+        self._size -= n
+        if self._flow_control is not None:
+            self._flow_control._release(n)
+            if self._drain_waiter is not None and self._is_drained():
+                self._wake_drain_waiter()
+
+    def _is_drained(self) -> bool:
+        flow = self._flow_control
+        if flow is None or not self._reading or self._waiter is not None:
+            return True
+        if self._size > flow.low_watermark:
+            return False
+        return not flow.over_budget or self._size == 0
+
+    def _needs_pause(self) -> bool:
+        """
+        True if the driver should stop reading the socket until this stream drains.
+
+        Only streams whose handler is reading can be waited on; otherwise
+        pausing could deadlock while the handler waits for a concurrency slot.
+        Nor does a stream pause the driver while its reader waits for more
+        data (``readall()``, ``read(n)`` or ``readexactly(n)`` above the
+        watermark, ``readuntil()`` before the separator): only new frames
+        can satisfy it.
+        """
+        flow = self._flow_control
+        if flow is None or not self._reading or not self._size or self._waiter is not None:
+            return False
+        return self._size >= flow.high_watermark or flow.over_budget
+
+    def _over_queue_budget(self) -> bool:
+        """
+        True if this stream is still waiting for a handler while over the global budget.
+
+        A queued stream cannot pause the driver (its handler waits for a slot
+        that running handlers may only release once they receive more
+        frames), so the client rejects it instead of buffering without bound.
+        """
+        flow = self._flow_control
+        if flow is None or self._reading or not self._size:
+            return False
+        return flow.over_budget
+
+    async def _wait_drained(self) -> None:
+        """Wait until :meth:`_needs_pause` no longer holds (called by the driver)."""
+        if self._is_drained():
+            return
+        assert self._flow_control is not None
+        self._flow_control._pauses += 1
+        self._drain_waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._drain_waiter
+        finally:
+            self._drain_waiter = None
+
+    def _wake_drain_waiter(self) -> None:
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _start_reading(self) -> None:
+        """Marks the handler as started: the stream may now pause the driver."""
+        self._reading = True
+
+    def _reject(self) -> None:
+        """Drops the body of a request refused before its handler started."""
+        self._rejected = True
+        self._discard()
+
+    def _discard(self) -> None:
+        """Drops buffered data once the handler is done; later chunks are ignored."""
+        self._eof = True
+        self._reading = False
+        self._chunks.clear()
+        self._offset = 0
+        self._consumed(self._size)
+        self._wake_drain_waiter()
+        self._wake_up()
+        while self._spooled:
+            self._spooled.pop().close()
+
     # ── Internal feeding (called by the driver) ───────────────────────────
 
-    def _feed(self, chunk: bytes) -> None:
-        """Pushes a chunk into the queue (called by the driver)."""
-        self._queue.put_nowait(chunk)
+    def _feed(self, chunk: BytesLike) -> None:
+        """Appends a received chunk (called by the driver)."""
+        if self._eof or not len(chunk):
+            return
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._flow_control is not None:
+            self._flow_control._acquire(len(chunk))
+        self._wake_up()
 
     def _close(self) -> None:
-        """Signals end of stream (sentinel None)."""
-        self._queue.put_nowait(None)
+        """Signals end of stream."""
+        self._eof = True
+        self._wake_up()
 
 
 @dataclass
@@ -405,10 +934,11 @@ class SyncRequest:
     headers: dict[str, list[str]]
     """HTTP headers."""
 
-    body: "SyncBodyStream" = field(default_factory=lambda: SyncBodyStream(asyncio.Queue()))
+    body: "SyncBodyStream" = field(default_factory=SyncBodyStream)
     """
     Asynchronous stream of the request body.
-    Readable via ``async for``, ``await body.read(n)`` or ``await body.readall()``.
+    Readable via ``async for``, ``await body.read(n)``, ``await body.readall()``
+    or the ``readinto``/``readexactly``/``readuntil`` helpers.
     """
 
     response: "SyncResponseWriter" = field(default=None)  # type: ignore[assignment]
@@ -422,6 +952,9 @@ class SyncRequest:
         await req.response.complete()
     """
 
+    path_params: dict[str, str] = field(default_factory=dict)
+    """Parameters extracted from the path by the matching route (empty without routing)."""
+
 
 class SyncResponseWriter:
     """
@@ -441,6 +974,15 @@ class SyncResponseWriter:
     ``complete()`` is idempotent and can be called multiple times.
     If ``start()`` was not called before ``write()`` or ``complete()``,
     a status 200 with empty headers is sent automatically.
+
+    Without buffering, every ``write()`` is sent as one frame. With a
+    :class:`ResponseBuffering`, small writes are coalesced into frames of
+    about ``frame_size`` bytes and large ones split at ``max_frame_size``;
+    ``flush()`` sends buffered bytes immediately. :attr:`frames_sent` and
+    :attr:`bytes_sent` count the body frames of this response.
+
+    ``send_flush``, if given, is awaited by ``flush()`` once the buffer is
+    sent, so a compressing sender can emit the bytes it still holds.
     """
 
     def __init__(
@@ -449,13 +991,23 @@ class SyncResponseWriter:
         send_start: Callable,
         send_chunk: Callable,
         send_end: Callable,
+        buffering: Optional[ResponseBuffering] = None,
+        send_flush: Optional[Callable] = None,
     ) -> None:
         self._correlation_id = correlation_id
         self._send_start = send_start
         self._send_chunk = send_chunk
         self._send_end = send_end
+        self._send_flush = send_flush
         self._started = False
         self._completed = False
+        self._buffering = buffering
+        self._buffer = bytearray()
+        self._send_lock = asyncio.Lock() if buffering is not None else None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Future] = None
+        self._frames = 0
+        self._bytes = 0
 
     async def start(
         self,
@@ -473,14 +1025,120 @@ class SyncResponseWriter:
             SyncResponse(status_code=status_code, headers=headers or {}),
         )
 
-    async def write(self, data: bytes) -> None:
-        """Send a chunk of the response body."""
+    async def write(self, data: BytesLike) -> None:
+        """
+        Send a chunk of the response body.
+
+        ``data`` may be any buffer-protocol object (bytes, bytearray,
+        memoryview, NumPy array, …); contiguous buffers are sent without
+        being copied.
+        """
         if self._completed:
             raise RuntimeError("Response already completed.")
         if not self._started:
             await self.start()
-        if data:
-            await self._send_chunk(self._correlation_id, data)
+        data = as_byte_view(data)
+        if not len(data):
+            return
+        if self._buffering is None:
+            await self._send_frame(data)
+        else:
+            await self._write_buffered(memoryview(data), self._buffering)
+
+    async def flush(self) -> None:
+        """Send buffered bytes now, including those held by a compressing sender."""
+        await self._flush_buffer()
+        if self._send_flush is not None and self._started and not self._completed:
+            await self._send_flush(self._correlation_id)
+
+    async def write_file(
+        self,
+        file: "Union[str, os.PathLike[str], IO[bytes]]",
+        offset: int = 0,
+        length: Optional[int] = None,
+        *,
+        range_header: Optional[str] = None,
+        status_code: int = 200,
+        headers: Optional[dict[str, list[str]]] = None,
+        window_size: int = DEFAULT_FILE_WINDOW,
+    ) -> int:
+        """
+        Stream ``length`` bytes of a file from ``offset`` (default: to the end).
+
+        ``file`` is a path or a binary file object. Regular files are
+        memory-mapped one ``window_size`` window at a time and sent without
+        being copied; other file objects are read window by window. Every
+        window waits for send backpressure, so memory use stays bounded
+        whatever the file size.
+
+        If the response is not started yet, it is started with
+        ``status_code``, ``headers``, ``Content-Length`` and
+        ``Accept-Ranges: bytes``. Pass the request ``Range`` header as
+        ``range_header`` to answer byte ranges::
+
+            await req.response.write_file(
+                "/data/video.mp4",
+                range_header=(req.headers.get("Range") or [None])[0],
+                headers={"Content-Type": ["video/mp4"]},
+            )
+
+        A satisfiable single range is served with 206 and ``Content-Range``
+        (relative to ``offset``/``length``), an unsatisfiable one with 416.
+        Returns the number of body bytes sent.
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        owned = isinstance(file, (str, os.PathLike))
+        fileobj: IO[bytes] = open(file, "rb") if owned else file  # type: ignore[assignment, arg-type]
+        try:
+            size = _file_size(fileobj)
+            if length is None:
+                length = max(0, size - offset)
+            length = max(0, min(length, size - offset))
+            if not self._started:
+                response_headers = dict(headers or {})
+                response_headers.setdefault("Accept-Ranges", ["bytes"])
+                byte_range = _parse_byte_range(range_header, length) if range_header else None
+                if byte_range == ():
+                    response_headers["Content-Range"] = [f"bytes */{length}"]
+                    response_headers["Content-Length"] = ["0"]
+                    await self.start(416, response_headers)
+                    return 0
+                if byte_range:
+                    first, last = byte_range
+                    response_headers["Content-Range"] = [f"bytes {first}-{last}/{length}"]
+                    offset, length, status_code = offset + first, last - first + 1, 206
+                if not any(k.lower() == "content-length" for k in response_headers):
+                    response_headers["Content-Length"] = [str(length)]
+                await self.start(status_code, response_headers)
+            if self._completed:
+                raise RuntimeError("Response already completed.")
+            await self._flush_buffer()
+            if self._buffering is not None:
+                window_size = min(window_size, self._buffering.max_frame_size)
+            return await self._send_file_windows(fileobj, offset, length, window_size)
+        finally:
+            if owned:
+                fileobj.close()
+
+    async def _send_file_windows(self, fileobj: IO[bytes], offset: int, length: int, window_size: int) -> int:
+        try:
+            fd = fileobj.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            fd = -1
+        sent = 0
+        while sent < length:
+            count = min(window_size, length - sent)
+            window = _map_window(fd, offset + sent, count) if fd >= 0 else None
+            if window is None:
+                # Not mappable (pipe, socket, in-memory file): read the window instead.
+                fileobj.seek(offset + sent)
+                window = fileobj.read(count)
+                if not window:
+                    break
+            await self._send_frame(window)  # type: ignore[arg-type]
+            sent += len(window)
+        return sent
 
     async def complete(self) -> None:
         """Signal end of response. Idempotent."""
@@ -488,9 +1146,141 @@ class SyncResponseWriter:
             return
         if not self._started:
             await self.start()
+        await self._flush_buffer()
         self._completed = True
+        if self._buffering is not None:
+            self._buffering._record(self._frames, self._bytes)
         await self._send_end(self._correlation_id)
 
+    @property
+    def frames_sent(self) -> int:
+        """Number of body frames sent so far."""
+        return self._frames
+
+    @property
+    def bytes_sent(self) -> int:
+        """Number of body bytes sent so far."""
+        return self._bytes
+
+    # ── Buffering ────────────────────────────────────────────────────────
+
+    async def _write_buffered(self, data: memoryview, buffering: ResponseBuffering) -> None:
+        frame_size = buffering.frame_size
+        if len(self._buffer) + len(data) < frame_size:
+            self._buffer += data
+            self._arm_flush_timer(buffering.flush_interval)
+            return
+        assert self._send_lock is not None
+        async with self._send_lock:
+            offset = 0
+            if self._buffer:
+                # Top the pending frame up to frame_size, then send it.
+                offset = max(0, frame_size - len(self._buffer))
+                self._buffer += data[:offset]
+                await self._send_buffer()
+            # Send what is left straight from the caller's buffer, in bounded frames.
+            while len(data) - offset >= frame_size:
+                count = min(len(data) - offset, buffering.max_frame_size)
+                await self._send_frame(data[offset:offset + count])
+                offset += count
+            if offset < len(data):
+                self._buffer += data[offset:]
+                self._arm_flush_timer(buffering.flush_interval)
+
+    async def _send_buffer(self) -> None:
+        self._cancel_flush_timer()
+        if not self._buffer:
+            return
+        pending, self._buffer = self._buffer, bytearray()
+        # Never modified again: a read-only view lets the sender skip its copy.
+        await self._send_frame(memoryview(pending).toreadonly())
+
+    async def _send_frame(self, data: memoryview) -> None:
+        self._frames += 1
+        self._bytes += len(data)
+        await self._send_chunk(self._correlation_id, data)
+
+    def _arm_flush_timer(self, interval: Optional[float]) -> None:
+        if interval is None or self._flush_timer is not None:
+            return
+        self._flush_timer = asyncio.get_running_loop().call_later(interval, self._on_flush_timer)
+
+    async def _flush_buffer(self) -> None:
+        """Send the bytes coalesced by :class:`ResponseBuffering` (no-op without buffering)."""
+        self._cancel_flush_timer()
+        if self._send_lock is None:
+            return
+        async with self._send_lock:
+            await self._send_buffer()
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _on_flush_timer(self) -> None:
+        self._flush_timer = None
+        if self._completed:
+            return
+        self._flush_task = asyncio.ensure_future(self._flush_buffer())
+        self._flush_task.add_done_callback(_log_flush_error)
+
+
+def _file_size(fileobj: IO[bytes]) -> int:
+    try:
+        return os.fstat(fileobj.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        position = fileobj.tell()
+        size = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+        return size
+
+
+def _map_window(fd: int, position: int, count: int) -> Optional[memoryview]:
+    """Read-only view of ``count`` bytes at ``position``, or ``None`` if ``fd`` cannot be mapped."""
+    aligned = position - position % mmap.ALLOCATIONGRANULARITY
+    try:
+        mapped = mmap.mmap(fd, position - aligned + count, access=mmap.ACCESS_READ, offset=aligned)
+    except (OSError, ValueError):
+        return None
+    # The mapping is released with the last view, once the frame has been sent.
+    return memoryview(mapped)[position - aligned:]
+
+
+def _parse_byte_range(header: str, size: int) -> "Optional[Tuple[int, int]] | Tuple[()]":
+    """
+    Parse a single ``bytes=first-last`` range against ``size``.
+
+    Returns ``(first, last)`` (inclusive), ``()`` if the range cannot be
+    satisfied, or ``None`` to ignore the header (malformed or multi-range).
+    """
+    unit, _, spec = header.strip().partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first_s, sep, last_s = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first_s:
+            suffix = int(last_s)
+            if suffix <= 0:
+                return ()
+            return (max(0, size - suffix), size - 1) if size else ()
+        first = int(first_s)
+        last = int(last_s) if last_s else size - 1
+    except ValueError:
+        return None
+    if first < 0 or (last_s and last < first):
+        return None
+    if first >= size:
+        return ()
+    return first, min(last, size - 1)
+
+
+def _log_flush_error(task: asyncio.Future) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Response auto-flush failed: %s", task.exception())
+
 
 @dataclass
 class SyncResponse:
@@ -0,0 +1,230 @@
+"""
+Single-writer outbound queue.
+
+Every message sent by a connected client goes through one writer task that
+drains priority lanes in order, so a handler streaming a large response
+cannot delay callbacks and pings queued behind it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFERED_BYTES = 4 * 1024 * 1024
+DEFAULT_SLOW_SEND_THRESHOLD = 1.0
+
+
+class SendPriority(IntEnum):
+    """Outbound lanes, drained in this order."""
+
+    CONTROL = 0           # register, ping, async callbacks
+    RESPONSE_START = 1    # SyncResponseStart frames
+    BULK = 2              # sync response chunks, end and cancel frames
+
+
+class OutboundQueue:
+    """
+    Priority lanes and a byte budget in front of the WebSocket.
+
+    While a connection is attached, :meth:`put` queues a message and returns;
+    the writer task sends :attr:`SendPriority.CONTROL` messages first, then
+    response starts, then bulk frames (FIFO within a lane, so the frames of
+    one response stay in order).
+
+    Response frames are accounted against ``max_buffered_bytes``: once the
+    queue holds that many bytes, :meth:`put` waits until the writer catches
+    up, which slows down handlers writing faster than the socket drains.
+    Control messages never wait.
+
+    A send taking longer than ``slow_send_threshold`` seconds (the socket
+    write buffer is full, i.e. SlimFaas is a slow consumer) is logged::
+
+        client.outbound.snapshot()
+        # {"queued": 3, "queued_bytes": 196650, "stall_seconds": 0.8, ...}
+    """
+
+    def __init__(
+        self,
+        max_buffered_bytes: int = DEFAULT_MAX_BUFFERED_BYTES,
+        slow_send_threshold: float = DEFAULT_SLOW_SEND_THRESHOLD,
+    ) -> None:
+        if max_buffered_bytes < 1:
+            raise ValueError("max_buffered_bytes must be at least 1")
+        self.max_buffered_bytes = max_buffered_bytes
+        self.slow_send_threshold = slow_send_threshold
+        self._lanes: tuple[deque, ...] = tuple(deque() for _ in SendPriority)
+        self._ws: Any = None
+        self._buffered = 0
+        self._not_empty: Optional[asyncio.Future] = None
+        self._budget_waiters: deque[asyncio.Future] = deque()
+        self._sent = 0
+        self._sent_bytes = 0
+        self._stall = 0.0
+        self._max_stall = 0.0
+        self._slow_sends = 0
+        self._backpressure_waits = 0
+
+    # ── Connection lifecycle (called by the client) ──────────────────────
+
+    def is_attached(self, ws: Any) -> bool:
+        """True if the writer currently sends to ``ws``."""
+        return ws is not None and ws is self._ws
+
+    def _attach(self, ws: Any) -> None:
+        self._ws = ws
+
+    def _detach(self) -> None:
+        """Drop queued messages (the connection is gone) and release blocked producers."""
+        self._ws = None
+        dropped = [item for lane in self._lanes for item in lane]
+        for lane in self._lanes:
+            lane.clear()
+        self._buffered = 0
+        self._wake_budget_waiters()
+        for item in dropped:
+            _notify_dropped(item)
+
+    async def _run(self) -> None:
+        """Writer loop: send queued messages in priority order until cancelled."""
+        loop = asyncio.get_running_loop()
+        ws = self._ws
+        try:
+            await self._drain(loop, ws)
+        except Exception as exc:
+            # Connection lost: the read loop notices it too and reconnects.
+            logger.debug("Outbound writer stopped: %s", exc)
+        finally:
+            # Whatever stopped the writer, the queue must not accept more work for ws.
+            if self._ws is ws:
+                self._detach()
+
+    async def _drain(self, loop: asyncio.AbstractEventLoop, ws: Any) -> None:
+        while True:
+            item = self._pop()
+            if item is None:
+                self._not_empty = loop.create_future()
+                try:
+                    await self._not_empty
+                finally:
+                    self._not_empty = None
+                continue
+            data, text, size, accounted, _ = item
+            started = loop.time()
+            try:
+                await ws.send(data, text=text)
+            except BaseException:
+                _notify_dropped(item)
+                raise
+            finally:
+                if accounted and self._ws is ws:
+                    self._buffered -= size
+                    self._wake_budget_waiters()
+            elapsed = loop.time() - started
+            self._sent += 1
+            self._sent_bytes += size
+            self._stall += elapsed
+            if elapsed > self._max_stall:
+                self._max_stall = elapsed
+            if elapsed >= self.slow_send_threshold:
+                self._slow_sends += 1
+                logger.warning(
+                    "Slow WebSocket consumer: a %d-byte send took %.2f s (%d messages queued)",
+                    size, elapsed, self.queued,
+                )
+
+    def _pop(self) -> Optional[tuple]:
+        for lane in self._lanes:
+            if lane:
+                return lane.popleft()
+        return None
+
+    # ── Producers ────────────────────────────────────────────────────────
+
+    async def put(
+        self,
+        data: Union[bytes, bytearray, memoryview, list],
+        priority: SendPriority = SendPriority.CONTROL,
+        *,
+        text: Optional[bool] = None,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Queue ``data`` (a message, or a list of fragments) for sending.
+
+        Non-control messages wait while the queue holds ``max_buffered_bytes``
+        or more. Raises :class:`RuntimeError` if no connection is attached.
+        ``on_drop`` is called if the message is discarded unsent because the
+        connection was lost.
+        """
+        size = sum(len(part) for part in data) if isinstance(data, list) else len(data)
+        accounted = priority != SendPriority.CONTROL
+        if accounted and self._buffered and self._buffered + size > self.max_buffered_bytes:
+            self._backpressure_waits += 1
+            loop = asyncio.get_running_loop()
+            while self._ws is not None and self._buffered and self._buffered + size > self.max_buffered_bytes:
+                waiter = loop.create_future()
+                self._budget_waiters.append(waiter)
+                await waiter
+        if self._ws is None:
+            raise RuntimeError("WebSocket is not connected")
+        if accounted:
+            self._buffered += size
+        self._lanes[priority].append((data, text, size, accounted, on_drop))
+        waiter = self._not_empty
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _wake_budget_waiters(self) -> None:
+        waiters = self._budget_waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # ── Metrics ──────────────────────────────────────────────────────────
+
+    @property
+    def queued(self) -> int:
+        """Messages waiting to be sent, all lanes together."""
+        return sum(len(lane) for lane in self._lanes)
+
+    @property
+    def queued_bytes(self) -> int:
+        """Bytes of response frames waiting to be sent (counted against the budget)."""
+        return self._buffered
+
+    @property
+    def stall_seconds(self) -> float:
+        """Total time spent waiting for the socket to accept messages."""
+        return self._stall
+
+    def snapshot(self) -> dict[str, Any]:
+        """Queue depth per lane, budget usage and send-stall statistics."""
+        return {
+            "queued": self.queued,
+            "queued_by_priority": {p.name.lower(): len(self._lanes[p]) for p in SendPriority},
+            "queued_bytes": self._buffered,
+            "max_buffered_bytes": self.max_buffered_bytes,
+            "backpressure_waits": self._backpressure_waits,
+            "sent": self._sent,
+            "sent_bytes": self._sent_bytes,
+            "stall_seconds": self._stall,
+            "max_stall_seconds": self._max_stall,
+            "slow_sends": self._slow_sends,
+        }
+
+
+def _notify_dropped(item: tuple) -> None:
+    on_drop = item[4]
+    if on_drop is None:
+        return
+    try:
+        on_drop()
+    except Exception as exc:
+        logger.warning("Outbound on_drop callback failed: %s", exc)
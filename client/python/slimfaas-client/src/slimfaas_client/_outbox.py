@@ -0,0 +1,153 @@
+"""
+Outbox for async callbacks that could not be sent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CALLBACKS = 10_000
+
+
+class CallbackOutbox:
+    """
+    Callbacks waiting for a connection.
+
+    When :meth:`SlimFaasClient.send_callback` (or the callback of a handler
+    that just finished) cannot be sent because the WebSocket is down, the
+    callback is kept here. SlimFaas answers the pending callbacks of a lost
+    connection with 503 and ignores callbacks for elements it no longer
+    waits for, so the callback is not replayed on the next connection:
+    the client answers the redelivery of that element from the outbox
+    instead of running its handler again. A newer callback for the same
+    element replaces the older one.
+
+    With a ``path``, the outbox is persisted to that file and reloaded on
+    start, so results survive a restart of the process. The file is
+    rewritten atomically off the event loop, once for a burst of changes;
+    :meth:`persist` waits for the last write::
+
+        client = SlimFaasClient(url, config, outbox=CallbackOutbox("/var/lib/my-job/outbox.json"))
+
+    Beyond ``max_callbacks`` pending entries the oldest ones are dropped.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_callbacks: int = DEFAULT_MAX_CALLBACKS) -> None:
+        if max_callbacks < 1:
+            raise ValueError("max_callbacks must be at least 1")
+        self.path = path
+        self.max_callbacks = max_callbacks
+        self._pending: dict[str, int] = {}
+        self._dropped = 0
+        self._replayed = 0
+        self._dirty = False
+        self._saving: Optional[asyncio.Task] = None
+        if path is not None and os.path.exists(path):
+            self._load(path)
+
+    def add(self, element_id: str, status_code: int) -> None:
+        """Queue a callback until the next connection."""
+        self._pending.pop(element_id, None)
+        self._pending[element_id] = status_code
+        while len(self._pending) > self.max_callbacks:
+            oldest = next(iter(self._pending))
+            del self._pending[oldest]
+            self._dropped += 1
+            logger.warning("Callback outbox full: dropped callback for elementId=%s", oldest)
+        self._changed()
+
+    def take(self, element_id: str) -> Optional[int]:
+        """Remove and return the pending status of ``element_id``, or ``None``."""
+        status_code = self._pending.pop(element_id, None)
+        if status_code is not None:
+            self._replayed += 1
+            self._changed()
+        return status_code
+
+    async def flush(self, send: Callable[[str, int], Awaitable[None]]) -> int:
+        """
+        Send every pending callback with ``send(element_id, status_code)``.
+
+        Stops at the first failure, keeping it and the following callbacks.
+        Returns the number of callbacks sent.
+        """
+        sent = 0
+        try:
+            for element_id, status_code in list(self._pending.items()):
+                await send(element_id, status_code)
+                if self._pending.get(element_id) == status_code:
+                    del self._pending[element_id]
+                sent += 1
+        finally:
+            if sent:
+                self._replayed += sent
+                self._changed()
+        return sent
+
+    async def persist(self) -> None:
+        """Wait until every change has been written to ``path`` (no-op without one)."""
+        while self._saving is not None:
+            await asyncio.shield(self._saving)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, element_id: object) -> bool:
+        return element_id in self._pending
+
+    def snapshot(self) -> dict[str, int]:
+        """Pending, replayed and dropped callback counts."""
+        return {"pending": len(self._pending), "replayed": self._replayed, "dropped": self._dropped}
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+            self._pending = {str(element_id): int(status) for element_id, status in entries}
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable callback outbox %s: %s", path, exc)
+
+    def _changed(self) -> None:
+        if self.path is None:
+            return
+        self._dirty = True
+        if self._saving is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (e.g. set up before the client starts): write now.
+            self._dirty = False
+            self._write(self.path, list(self._pending.items()))
+            return
+        self._saving = loop.create_task(self._save())
+
+    async def _save(self) -> None:
+        try:
+            while self._dirty and self.path is not None:
+                self._dirty = False
+                await asyncio.to_thread(self._write, self.path, list(self._pending.items()))
+        finally:
+            self._saving = None
+
+    @staticmethod
+    def _write(path: str, entries: list[tuple[str, int]]) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            fd, tmp = tempfile.mkstemp(prefix=".outbox-", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Failed to persist callback outbox %s: %s", path, exc)
@@ -0,0 +1,425 @@
+"""
+SlimFaasClientPool — one process hosting several virtual replicas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import signal
+from typing import Callable, Optional
+
+from slimfaas_client._client import (
+    DEFAULT_DRAIN_TIMEOUT,
+    H,
+    AsyncRequestHandler,
+    PublishEventHandler,
+    SlimFaasClient,
+    SyncRequestHandler,
+)
+from slimfaas_client._buffering import ResponseBuffering
+from slimfaas_client._compression import ResponseCompression
+from slimfaas_client._concurrency import DEFAULT_MAX_QUEUED, ConcurrencyLimiter
+from slimfaas_client._executors import as_async_handler, is_async_handler, run_handler_hooks
+from slimfaas_client._flow_control import SyncBodyFlowControl
+from slimfaas_client._idempotency import IdempotencyCache
+from slimfaas_client._outbox import CallbackOutbox
+from slimfaas_client._loop_monitor import LoopMonitor
+from slimfaas_client._metrics import ClientMetrics
+from slimfaas_client._response_cache import ResponseCache
+from slimfaas_client._router import Router
+from slimfaas_client._single_flight import SingleFlight
+from slimfaas_client._json import JsonCodec
+from slimfaas_client._spool import BodySpooler
+from slimfaas_client._tracing import Tracer
+from slimfaas_client._models import SlimFaasClientConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SlimFaasClientPool:
+    """
+    Pool of :class:`SlimFaasClient` connections sharing the same configuration.
+
+    SlimFaas treats every WebSocket connection as one pod and round-robins
+    between them, each connection receiving up to
+    ``number_parallel_request_per_pod`` requests. A pool of ``size``
+    connections therefore lets a single process absorb
+    ``size * number_parallel_request_per_pod`` parallel requests.
+
+    All connections share the same handlers and the same
+    :class:`ConcurrencyLimiter`; each one reconnects on its own. The
+    ``startup()``/``shutdown()`` hooks of the handlers (executors, ASGI
+    lifespan, …) are run once by the pool, not by each connection, so a
+    connection closing never shuts down a handler the others still use.
+
+    SlimFaas delivers publish/subscribe events to *every* connection of a
+    function. To run the event handler once per event, the pool only
+    accepts events received on its first connected client, when they are
+    received: the other copies never enter the concurrency limiter.
+
+    Usage:
+
+    .. code-block:: python
+
+        config = SlimFaasClientConfig(function_name="my-job", number_parallel_request_per_pod=10)
+        async with SlimFaasClientPool("ws://slimfaas:5003/ws", config, size=4) as pool:
+            pool.on_async_request(handle_request)
+            await pool.run_forever()
+
+    Parameters
+    ----------
+    url:
+        SlimFaas WebSocket URL, e.g. ``ws://slimfaas:5003/ws``.
+    config:
+        Function/job configuration, shared by every connection.
+    size:
+        Number of WebSocket connections (virtual replicas) to open.
+    reconnect_delay:
+        Delay before the first reconnection attempt (default: 5 s), then
+        exponential backoff with jitter.
+    max_reconnect_delay:
+        Upper bound of the reconnection delay (default: 60 s).
+    ping_interval:
+        Seconds between keepalive pings (default: 30 s, 0 to disable).
+    concurrency:
+        Admission controller shared by every connection. Defaults to
+        ``size * number_parallel_request_per_pod`` per kind of work.
+    handler_threads:
+        Size of the thread pool, shared by every connection, that runs
+        blocking (non-async) handlers.
+    flow_control:
+        Flow control for sync request bodies, shared by every connection so
+        the byte budget bounds the whole process.
+    json_codec:
+        JSON codec for control messages (default: fastest installed).
+    spooler:
+        Spools large request bodies to temporary files (disabled by default).
+    response_buffering:
+        Write coalescing for sync responses, shared by every connection
+        (disabled by default).
+    response_compression:
+        Compression of sync responses, shared by every connection (disabled
+        by default).
+    response_cache:
+        Cache of sync responses, shared by every connection (disabled by
+        default).
+    single_flight:
+        Coalescing of identical concurrent sync requests, shared by every
+        connection (disabled by default).
+    idempotency:
+        Status cache for redelivered async requests, shared by every
+        connection since SlimFaas may redeliver on any of them (disabled by
+        default).
+    outbox:
+        Callbacks that could not be sent, shared by every connection for the
+        same reason (default: a new in-memory :class:`CallbackOutbox`).
+    metrics:
+        Histograms and counters shared by every connection, so
+        :meth:`metrics` covers the whole process (default: a new
+        :class:`ClientMetrics`).
+    tracer:
+        Tracing hooks used by every connection (disabled by default).
+    loop_monitor:
+        Event loop lag monitor shared by every connection, recording into
+        the shared metrics (disabled by default).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        config: SlimFaasClientConfig,
+        size: int = 2,
+        *,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 60.0,
+        ping_interval: float = 30.0,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        handler_threads: Optional[int] = None,
+        flow_control: Optional[SyncBodyFlowControl] = None,
+        json_codec: Optional[JsonCodec] = None,
+        spooler: Optional[BodySpooler] = None,
+        response_buffering: Optional[ResponseBuffering] = None,
+        response_compression: Optional[ResponseCompression] = None,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        idempotency: Optional[IdempotencyCache] = None,
+        outbox: Optional[CallbackOutbox] = None,
+        metrics: Optional[ClientMetrics] = None,
+        tracer: Optional[Tracer] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._config = config
+        self._handler_threads = handler_threads
+        self._thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._concurrency = concurrency or self._default_concurrency(config, size)
+        self._flow_control = flow_control or SyncBodyFlowControl()
+        self._metrics = metrics if metrics is not None else ClientMetrics()
+        self._idempotency = idempotency
+        self._outbox = outbox if outbox is not None else CallbackOutbox()
+        self._drain_task: Optional[asyncio.Future] = None
+        self._handlers_started = False
+        self._router: Optional[Router] = None
+        self._async_request_handler: Optional[AsyncRequestHandler] = None
+        self._publish_event_handler: Optional[PublishEventHandler] = None
+        self._sync_request_handler: Optional[SyncRequestHandler] = None
+        self._clients = [
+            SlimFaasClient(
+                url,
+                config,
+                reconnect_delay=reconnect_delay,
+                max_reconnect_delay=max_reconnect_delay,
+                ping_interval=ping_interval,
+                concurrency=self._concurrency,
+                flow_control=self._flow_control,
+                json_codec=json_codec,
+                spooler=spooler,
+                response_buffering=response_buffering,
+                response_compression=response_compression,
+                response_cache=response_cache,
+                single_flight=single_flight,
+                idempotency=idempotency,
+                outbox=self._outbox,
+                metrics=self._metrics,
+                tracer=tracer,
+                loop_monitor=loop_monitor,
+            )
+            for _ in range(size)
+        ]
+        for client in self._clients:
+            client._event_gate = self._event_gate(client)
+            client._owns_shared_state = False
+
+    @staticmethod
+    def _default_concurrency(config: SlimFaasClientConfig, size: int) -> ConcurrencyLimiter:
+        limit = max(1, config.number_parallel_request_per_pod) * size
+        return ConcurrencyLimiter(limit, limit, limit, max_queued=DEFAULT_MAX_QUEUED)
+
+    # ------------------------------------------------------------------
+    # Async context manager
+    # ------------------------------------------------------------------
+
+    async def __aenter__(self) -> "SlimFaasClientPool":
+        for client in self._clients:
+            await client.__aenter__()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------
+    # Callback registration (shared by every connection)
+    # ------------------------------------------------------------------
+
+    def on_async_request(self, handler: AsyncRequestHandler) -> None:
+        """Register the asynchronous request handler on every connection."""
+        handler = self._as_async_handler(handler)
+        self._async_request_handler = handler
+        for client in self._clients:
+            client.on_async_request(handler)
+
+    def on_publish_event(self, handler: PublishEventHandler) -> None:
+        """Register the publish/subscribe event handler, invoked once per event."""
+        handler = self._as_async_handler(handler)
+        self._publish_event_handler = handler
+        for client in self._clients:
+            client.on_publish_event(handler)
+
+    def _as_async_handler(self, handler: Callable) -> Callable:
+        # Wrap blocking handlers once, so every connection shares one thread pool.
+        if is_async_handler(handler):
+            return handler
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._handler_threads, thread_name_prefix="slimfaas-handler"
+            )
+        return as_async_handler(handler, self._thread_pool)
+
+    def _event_gate(self, client: SlimFaasClient) -> Callable[[], bool]:
+        # Checked when the event is received, so a queued event still runs if its connection drops meanwhile.
+        return lambda: self._event_leader() is client
+
+    def _event_leader(self) -> Optional[SlimFaasClient]:
+        for client in self._clients:
+            if client.is_connected:
+                return client
+        return None
+
+    def on_sync_request(self, handler: SyncRequestHandler) -> None:
+        """Register the synchronous streaming request handler on every connection."""
+        handler = self._as_async_handler(handler)
+        self._sync_request_handler = handler
+        for client in self._clients:
+            client.on_sync_request(handler)
+
+    # ------------------------------------------------------------------
+    # Routing (shared by every connection, see SlimFaasClient.route)
+    # ------------------------------------------------------------------
+
+    def route(self, method: str, path: str) -> Callable[[H], H]:
+        """Decorator registering an async request handler for ``method`` and ``path``."""
+        def decorator(handler: H) -> H:
+            router = self.router
+            router.async_routes.add(method, path, self._as_async_handler(handler))
+            if self._async_request_handler is not router.async_handler:
+                router.async_fallback = self._async_request_handler
+                self.on_async_request(router.async_handler)
+            return handler
+        return decorator
+
+    def sync_route(self, method: str, path: str) -> Callable[[H], H]:
+        """Decorator registering a sync request handler for ``method`` and ``path``."""
+        def decorator(handler: H) -> H:
+            router = self.router
+            router.sync_routes.add(method, path, self._as_async_handler(handler))
+            if self._sync_request_handler is not router.sync_handler:
+                router.sync_fallback = self._sync_request_handler
+                self.on_sync_request(router.sync_handler)
+            return handler
+        return decorator
+
+    def on_event(self, event_name: str) -> Callable[[H], H]:
+        """Decorator registering the handler of one publish/subscribe event, invoked once per event."""
+        def decorator(handler: H) -> H:
+            router = self.router
+            if event_name in router.event_handlers:
+                raise ValueError(f"A handler for event '{event_name}' is already registered")
+            router.event_handlers[event_name] = self._as_async_handler(handler)
+            if self._publish_event_handler is not router.event_handler:
+                router.event_fallback = self._publish_event_handler
+                self.on_publish_event(router.event_handler)
+            return handler
+        return decorator
+
+    @property
+    def router(self) -> Router:
+        """Routes shared by every connection."""
+        if self._router is None:
+            self._router = Router()
+        return self._router
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    async def run_forever(self) -> None:
+        """
+        Run every connection's connection/reconnection loop concurrently.
+        Returns when :meth:`close` is called.
+        """
+        await self._start_handlers()
+        await asyncio.gather(*(client.run_forever() for client in self._clients))
+
+    async def close(self) -> None:
+        """Shut down every connection, then the handlers."""
+        await asyncio.gather(*(client.close() for client in self._clients), return_exceptions=True)
+        await self._release_shared()
+
+    async def _start_handlers(self) -> None:
+        if not self._handlers_started:
+            self._handlers_started = True
+            await run_handler_hooks(self._handlers(), "startup")
+
+    async def _release_shared(self) -> None:
+        if self._handlers_started:
+            self._handlers_started = False
+            await run_handler_hooks(self._handlers(), "shutdown")
+        if self._idempotency is not None:
+            self._idempotency.close()
+        await self._outbox.persist()
+        if self._thread_pool is not None:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            thread_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _handlers(self) -> tuple[Optional[Callable], ...]:
+        return self._async_request_handler, self._publish_event_handler, self._sync_request_handler
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> bool:
+        """
+        Drain every connection concurrently (see :meth:`SlimFaasClient.drain`).
+
+        Returns ``True`` if all of them finished their work within ``timeout``.
+        """
+        results = await asyncio.gather(*(client.drain(timeout) for client in self._clients))
+        await self._release_shared()
+        return all(results)
+
+    def drain_on_signals(
+        self,
+        timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        signals: tuple[signal.Signals, ...] = (signal.SIGTERM,),
+    ) -> None:
+        """Call :meth:`drain` when the process receives one of ``signals``."""
+        loop = asyncio.get_running_loop()
+        for sig in signals:
+            try:
+                loop.add_signal_handler(sig, self._on_drain_signal, sig, timeout)
+            except (NotImplementedError, RuntimeError) as exc:
+                logger.warning("Cannot install a handler for %s: %s", sig.name, exc)
+
+    def _on_drain_signal(self, sig: signal.Signals, timeout: float) -> None:
+        if self._drain_task is not None:
+            return
+        logger.info("Received %s: draining %d connection(s) for up to %.1f s", sig.name, len(self._clients), timeout)
+        self._drain_task = asyncio.ensure_future(self.drain(timeout))
+
+    async def send_callback(self, element_id: str, status_code: int = 200) -> None:
+        """
+        Send the result of an asynchronous request that returned 202.
+
+        SlimFaas tracks pending callbacks per connection, so the callback is
+        sent on the connection(s) that received the request. If no connection
+        owns it and none is connected, it waits in the shared outbox.
+        """
+        owners = [client for client in self._clients if client.owns_callback(element_id)]
+        if owners:
+            for client in owners:
+                await client.send_callback(element_id, status_code)
+            return
+        for client in self._clients:
+            if client.is_connected:
+                logger.debug("No connection owns elementId=%s, sending on %s", element_id, client.connection_id)
+                await client.send_callback(element_id, status_code)
+                return
+        await self._clients[0].send_callback(element_id, status_code)
+
+    def metrics(self) -> dict:
+        """Snapshot of the metrics of every connection (see :meth:`SlimFaasClient.metrics`)."""
+        return self._metrics.snapshot()
+
+    # ------------------------------------------------------------------
+    # Properties
+    # ------------------------------------------------------------------
+
+    @property
+    def clients(self) -> list[SlimFaasClient]:
+        """The underlying clients, one per connection."""
+        return list(self._clients)
+
+    @property
+    def size(self) -> int:
+        """Number of connections managed by the pool."""
+        return len(self._clients)
+
+    @property
+    def connected_count(self) -> int:
+        """Number of connections currently connected and registered."""
+        return sum(1 for client in self._clients if client.is_connected)
+
+    @property
+    def connection_ids(self) -> list[str]:
+        """Connection IDs of the registered connections."""
+        return [c.connection_id for c in self._clients if c.is_connected and c.connection_id]
+
+    @property
+    def concurrency(self) -> ConcurrencyLimiter:
+        """Admission controller shared by every connection."""
+        return self._concurrency
+
+    @property
+    def flow_control(self) -> SyncBodyFlowControl:
+        """Flow control for sync request bodies, shared by every connection."""
+        return self._flow_control
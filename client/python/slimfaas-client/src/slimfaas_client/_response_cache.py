@@ -0,0 +1,329 @@
+"""
+Response cache for synchronous requests.
+
+:class:`ResponseCache` sits in front of the sync handler: cacheable
+responses are recorded while they are streamed, and later identical
+requests are answered from the stored chunks without running the handler.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Optional
+
+from slimfaas_client._models import SyncResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+CacheKey = tuple[str, str, str, tuple[Optional[str], ...]]
+
+# Headers describing one transfer, not the stored representation.
+_HOP_HEADERS = frozenset({"age", "date", "connection", "keep-alive", "transfer-encoding"})
+
+
+def _header(headers: Mapping[str, list[str]], name: str) -> Optional[str]:
+    for key, values in headers.items():
+        if key.lower() == name and values:
+            return values[0]
+    return None
+
+
+def _vary(headers: Mapping[str, list[str]]) -> list[str]:
+    """Lower-cased header names listed by every ``Vary`` header of a response."""
+    return [
+        name.strip().lower()
+        for key, values in headers.items() if key.lower() == "vary"
+        for value in values
+        for name in value.split(",") if name.strip()
+    ]
+
+
+def _cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    directives: dict[str, Optional[str]] = {}
+    if value:
+        for item in value.split(","):
+            name, sep, arg = item.strip().partition("=")
+            if name:
+                directives[name.lower()] = arg.strip('"') if sep else None
+    return directives
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match.
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+class CachedResponse:
+    """A stored response: status, headers and body chunks."""
+
+    __slots__ = ("status_code", "headers", "chunks", "size", "etag", "stored_at", "expires")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict[str, list[str]],
+        chunks: list[bytes],
+        etag: str,
+        ttl: float,
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.chunks = chunks
+        self.size = sum(len(c) for c in chunks)
+        self.etag = etag
+        self.stored_at = time.monotonic()
+        self.expires = self.stored_at + ttl
+
+
+class ResponseCache:
+    """
+    Opt-in cache of sync responses, bounded by the total size of the stored bodies.
+
+    The key is the method, path, query string and the values of
+    ``key_headers`` (for example ``("Accept", "Authorization")``). A response
+    is stored when its status is in ``statuses`` (default: 200), its body is
+    at most ``max_entry_bytes``, and its ``Cache-Control`` allows shared
+    caching: ``s-maxage`` or ``max-age`` gives the lifetime, and without
+    either ``default_ttl`` applies (0, the default, means "not cached").
+    Responses marked ``no-store``, ``no-cache`` or ``private``, or carrying
+    ``Set-Cookie``, are never stored. Neither are responses whose ``Vary``
+    names a header outside ``key_headers`` (or ``*``), since the stored entry
+    could not tell those variants apart, nor responses to requests with an
+    ``Authorization`` header unless marked ``public`` or given ``s-maxage``.
+
+    Hits are streamed from the stored chunks without calling the handler,
+    with an ``Age`` header and an ``ETag`` (the handler's, or a hash of the
+    body). A hit whose ``If-None-Match`` matches the ETag gets
+    ``304 Not Modified``. Requests sent with ``Cache-Control: no-cache``
+    skip the lookup::
+
+        cache = ResponseCache(max_bytes=32 * 1024 * 1024, key_headers=("Accept",))
+        client = SlimFaasClient(url, config, response_cache=cache)
+
+        cache.snapshot()
+        # {"entries": 120, "bytes": 5242880, "hits": 900, "not_modified": 40, "misses": 130, ...}
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: Optional[int] = None,
+        default_ttl: float = 0.0,
+        key_headers: tuple[str, ...] = (),
+        methods: tuple[str, ...] = ("GET",),
+        statuses: tuple[int, ...] = (200,),
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_bytes, max_entry_bytes if max_entry_bytes is not None else max_bytes // 8 or 1)
+        self.default_ttl = default_ttl
+        self.key_headers = tuple(h.lower() for h in key_headers)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.statuses = statuses
+        self._entries: OrderedDict[CacheKey, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._not_modified = 0
+        self._misses = 0
+        self._stored = 0
+        self._evictions = 0
+
+    def key(self, method: str, path: str, query: str, headers: Mapping[str, list[str]]) -> Optional[CacheKey]:
+        """Cache key of a request, or ``None`` if its method is not cached."""
+        method = method.upper()
+        if method not in self.methods:
+            return None
+        return method, path, query, tuple(_header(headers, h) for h in self.key_headers)
+
+    def lookup(self, key: CacheKey, headers: Mapping[str, list[str]]) -> Optional[CachedResponse]:
+        """Fresh entry for ``key``, unless the request asks to bypass caches."""
+        directives = _cache_control(_header(headers, "cache-control"))
+        if "no-cache" in directives or "no-store" in directives:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def serve(
+        self,
+        entry: CachedResponse,
+        correlation_id: str,
+        headers: Mapping[str, list[str]],
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> None:
+        """Stream a stored response (or a 304 if ``If-None-Match`` matches)."""
+        response_headers = dict(entry.headers)
+        response_headers["Age"] = [str(int(time.monotonic() - entry.stored_at))]
+        if_none_match = _header(headers, "if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, entry.etag):
+            self._not_modified += 1
+            response_headers = {
+                k: v for k, v in response_headers.items()
+                if k.lower() not in ("content-length", "content-type", "content-encoding")
+            }
+            await send_start(correlation_id, SyncResponse(status_code=304, headers=response_headers))
+            await send_end(correlation_id)
+            return
+        self._hits += 1
+        await send_start(correlation_id, SyncResponse(status_code=entry.status_code, headers=response_headers))
+        for chunk in entry.chunks:
+            await send_chunk(correlation_id, chunk)
+        await send_end(correlation_id)
+
+    def for_request(
+        self,
+        key: CacheKey,
+        headers: Mapping[str, list[str]],
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> "CachingResponse":
+        """Wrap the senders of the response to a request so it is stored if cacheable."""
+        authorized = _header(headers, "authorization") is not None
+        return CachingResponse(self, key, authorized, send_start, send_chunk, send_end)
+
+    def ttl(self, status_code: int, headers: Mapping[str, list[str]], authorized: bool = False) -> float:
+        """
+        Lifetime of a response in seconds (0 if it must not be stored).
+
+        ``authorized`` tells whether the request carried an ``Authorization`` header.
+        """
+        if status_code not in self.statuses:
+            return 0.0
+        if _header(headers, "set-cookie") is not None:
+            return 0.0
+        if any(name not in self.key_headers for name in _vary(headers)):
+            return 0.0
+        directives = _cache_control(_header(headers, "cache-control"))
+        if "no-store" in directives or "no-cache" in directives or "private" in directives:
+            return 0.0
+        if authorized and "public" not in directives and "s-maxage" not in directives:
+            return 0.0
+        for name in ("s-maxage", "max-age"):
+            value = directives.get(name)
+            if value is not None:
+                try:
+                    return max(0.0, float(value))
+                except ValueError:
+                    return 0.0
+        return self.default_ttl
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop every entry, or only those of ``path``."""
+        for key in [k for k in self._entries if path is None or k[1] == path]:
+            self._remove(key)
+
+    def _store(self, key: CacheKey, entry: CachedResponse) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._stored += 1
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored bodies, in bytes."""
+        return self._bytes
+
+    def snapshot(self) -> dict[str, int]:
+        """Entry count, stored bytes and hit/304/miss/store/eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "not_modified": self._not_modified,
+            "misses": self._misses,
+            "stored": self._stored,
+            "evictions": self._evictions,
+        }
+
+
+class CachingResponse:
+    """
+    Recording state of one response, sitting between the writer and the client.
+
+    Frames are forwarded unchanged; when the response turns out to be
+    cacheable its chunks are also copied, and the entry is stored once the
+    response completes.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        key: CacheKey,
+        authorized: bool,
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> None:
+        self._cache = cache
+        self._key = key
+        self._authorized = authorized
+        self._send_start = send_start
+        self._send_chunk = send_chunk
+        self._send_end = send_end
+        self._status_code = 0
+        self._headers: dict[str, list[str]] = {}
+        self._ttl = 0.0
+        self._chunks: Optional[list[bytes]] = None
+        self._size = 0
+
+    async def start(self, correlation_id: str, response: Any) -> None:
+        self._ttl = self._cache.ttl(response.status_code, response.headers, self._authorized)
+        if self._ttl > 0:
+            self._status_code = response.status_code
+            self._headers = {k: list(v) for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS}
+            self._chunks = []
+        await self._send_start(correlation_id, response)
+
+    async def chunk(self, correlation_id: str, data: Any) -> None:
+        chunks = self._chunks
+        if chunks is not None:
+            self._size += len(data)
+            if self._size > self._cache.max_entry_bytes:
+                self._chunks = None
+            else:
+                chunks.append(bytes(data))
+        await self._send_chunk(correlation_id, data)
+
+    async def end(self, correlation_id: str) -> None:
+        await self._send_end(correlation_id)
+        chunks = self._chunks
+        if chunks is None:
+            return
+        etag = _header(self._headers, "etag")
+        if etag is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for chunk in chunks:
+                digest.update(chunk)
+            etag = f'"{digest.hexdigest()}"'
+            self._headers["ETag"] = [etag]
+        self._cache._store(self._key, CachedResponse(self._status_code, self._headers, chunks, etag, self._ttl))
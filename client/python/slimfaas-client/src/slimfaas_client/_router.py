@@ -0,0 +1,247 @@
+"""
+Method/path routing for requests and name routing for events.
+
+Routes are compiled into a segment trie when they are registered, so a
+lookup walks one node per path segment instead of trying every route in
+turn, and path parameters are extracted during that single walk.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import unquote
+
+from slimfaas_client._executors import run_handler_hooks
+from slimfaas_client._models import AsyncRequest, PublishEvent, SyncRequest
+
+logger = logging.getLogger(__name__)
+
+ANY_METHOD = "*"
+
+
+class _Node:
+    """One path segment of the route trie."""
+
+    __slots__ = ("static", "param", "param_name", "rest_name", "rest_handlers", "handlers")
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node] = {}
+        self.param: Optional[_Node] = None
+        self.param_name: Optional[str] = None
+        # "{name:path}" as last segment: matches the rest of the path.
+        self.rest_name: Optional[str] = None
+        self.rest_handlers: dict[str, Any] = {}
+        # HTTP method (or "*") -> handler, for routes ending at this node.
+        self.handlers: dict[str, Any] = {}
+
+
+def _split(path: str) -> list[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+class RouteTable:
+    """
+    Segment trie mapping ``(method, path)`` to a handler.
+
+    Path templates use ``{name}`` for one segment and ``{name:path}`` (last
+    segment only) for the remainder of the path, e.g.
+    ``/orders/{id}/items/{item}`` or ``/files/{path:path}``. Static segments
+    win over parameters. Trailing slashes are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._count = 0
+
+    def add(self, method: str, template: str, handler: Any) -> None:
+        method = method.upper()
+        node = self._root
+        segments = _split(template)
+        for index, segment in enumerate(segments):
+            if segment.startswith("{") and segment.endswith("}"):
+                name, _, converter = segment[1:-1].partition(":")
+                if converter == "path":
+                    if index != len(segments) - 1:
+                        raise ValueError(f"{{{name}:path}} must be the last segment of {template!r}")
+                    if node.rest_name not in (None, name):
+                        raise ValueError(f"Conflicting parameter names in {template!r}")
+                    node.rest_name = name
+                    self._set(node.rest_handlers, method, template, handler)
+                    return
+                if converter:
+                    raise ValueError(f"Unknown converter {converter!r} in {template!r}")
+                if node.param is None:
+                    node.param = _Node()
+                    node.param_name = name
+                elif node.param_name != name:
+                    raise ValueError(
+                        f"Conflicting parameter names {{{node.param_name}}} and {{{name}}} in {template!r}"
+                    )
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        self._set(node.handlers, method, template, handler)
+
+    def _set(self, handlers: dict[str, Any], method: str, template: str, handler: Any) -> None:
+        if method in handlers:
+            raise ValueError(f"Route {method} {template} is already registered")
+        handlers[method] = handler
+        self._count += 1
+
+    def match(self, method: str, path: str) -> tuple[Optional[Any], dict[str, str], bool]:
+        """
+        Find the handler for ``method`` and ``path``.
+
+        Returns ``(handler, path_params, path_matched)``: ``handler`` is
+        ``None`` if no route matches, and ``path_matched`` tells a wrong
+        method (405) from an unknown path (404).
+        """
+        params: dict[str, str] = {}
+        candidates = self._walk(self._root, _split(path), 0, params)
+        method = method.upper()
+        path_matched = False
+        for handlers, found in candidates:
+            path_matched = True
+            handler = handlers.get(method) or handlers.get(ANY_METHOD)
+            if handler is not None:
+                return handler, {k: unquote(v) for k, v in found.items()}, True
+        return None, {}, path_matched
+
+    def _walk(
+        self, node: _Node, segments: list[str], index: int, params: dict[str, str]
+    ) -> Iterator[tuple[dict[str, Any], dict[str, str]]]:
+        # Static segments first, then the parameter, then the rest-of-path
+        # parameter; candidates are produced lazily, most specific first.
+        if index == len(segments):
+            if node.handlers:
+                yield node.handlers, params
+            return
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            yield from self._walk(child, segments, index + 1, params)
+        if node.param is not None:
+            name = node.param_name
+            params[name] = segment  # type: ignore[index]
+            yield from self._walk(node.param, segments, index + 1, params)
+            del params[name]  # type: ignore[arg-type]
+        if node.rest_name is not None:
+            yield node.rest_handlers, {**params, node.rest_name: "/".join(segments[index:])}
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class Router:
+    """
+    Routes for async requests, sync requests and events.
+
+    Filled through :meth:`SlimFaasClient.route`, :meth:`SlimFaasClient.sync_route`
+    and :meth:`SlimFaasClient.on_event` (or the same methods of
+    :class:`SlimFaasClientPool`). The matching handler receives the request
+    with :attr:`path_params` set. Unmatched requests go to ``fallback``
+    handlers when set, otherwise async requests are answered with 404 (or
+    405) and sync requests get a 404 (or 405) response. Events without a
+    handler are ignored.
+
+    :attr:`async_handler`, :attr:`sync_handler` and :attr:`event_handler`
+    are what the client registers; they also forward the client's
+    ``startup()``/``shutdown()`` hooks to every routed handler, once for
+    the router however many of the three are registered.
+    """
+
+    def __init__(self) -> None:
+        self.async_routes = RouteTable()
+        self.sync_routes = RouteTable()
+        self.event_handlers: dict[str, Any] = {}
+        self.async_fallback: Optional[Any] = None
+        self.sync_fallback: Optional[Any] = None
+        self.event_fallback: Optional[Any] = None
+        self.async_handler = _Dispatch(self, self.handle_async)
+        self.sync_handler = _Dispatch(self, self.handle_sync)
+        self.event_handler = _Dispatch(self, self.handle_event)
+        self._handlers_started = False
+
+    async def handle_async(self, req: AsyncRequest) -> int:
+        handler, params, path_matched = self.async_routes.match(req.method, req.path)
+        if handler is None:
+            if self.async_fallback is not None:
+                return await self.async_fallback(req)
+            status = 405 if path_matched else 404
+            logger.warning("No route for AsyncRequest %s %s. Returning %d.", req.method, req.path, status)
+            return status
+        req.path_params = params
+        return await handler(req)
+
+    async def handle_sync(self, req: SyncRequest) -> None:
+        handler, params, path_matched = self.sync_routes.match(req.method, req.path)
+        if handler is None:
+            if self.sync_fallback is not None:
+                await self.sync_fallback(req)
+                return
+            await req.response.start(405 if path_matched else 404)
+            await req.response.complete()
+            return
+        req.path_params = params
+        await handler(req)
+
+    async def handle_event(self, evt: PublishEvent) -> None:
+        handler = self.event_handlers.get(evt.event_name, self.event_fallback)
+        if handler is None:
+            logger.debug("No handler for PublishEvent '%s'.", evt.event_name)
+            return
+        await handler(evt)
+
+    def _handlers(self) -> list[Any]:
+        handlers: list[Any] = []
+        for table in (self.async_routes, self.sync_routes):
+            handlers.extend(_table_handlers(table._root))
+        handlers.extend(self.event_handlers.values())
+        handlers.extend(h for h in (self.async_fallback, self.sync_fallback, self.event_fallback) if h is not None)
+        return handlers
+
+    async def startup(self) -> None:
+        """Run the ``startup()`` hook of every routed handler that has one (e.g. executors)."""
+        if self._handlers_started:
+            return
+        self._handlers_started = True
+        try:
+            await run_handler_hooks(self._handlers(), "startup")
+        except BaseException:
+            self._handlers_started = False
+            raise
+
+    async def shutdown(self) -> None:
+        """Run the ``shutdown()`` hook of every routed handler that has one."""
+        if self._handlers_started:
+            self._handlers_started = False
+            await run_handler_hooks(self._handlers(), "shutdown")
+
+
+class _Dispatch:
+    """Handler for one kind of message, as registered on the client."""
+
+    __slots__ = ("_router", "_handle")
+
+    def __init__(self, router: Router, handle: Callable[[Any], Any]) -> None:
+        self._router = router
+        self._handle = handle
+
+    async def __call__(self, message: Any) -> Any:
+        return await self._handle(message)
+
+    async def startup(self) -> None:
+        await self._router.startup()
+
+    async def shutdown(self) -> None:
+        await self._router.shutdown()
+
+
+def _table_handlers(node: _Node) -> list[Any]:
+    handlers = list(node.handlers.values()) + list(node.rest_handlers.values())
+    for child in node.static.values():
+        handlers.extend(_table_handlers(child))
+    if node.param is not None:
+        handlers.extend(_table_handlers(node.param))
+    return handlers
@@ -0,0 +1,242 @@
+"""
+Single-flight coalescing of identical concurrent sync requests.
+
+While a handler is producing the response to a request, identical requests
+arriving at the same time do not start the handler again: they join the
+running "flight" and receive a copy of every frame it sends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from slimfaas_client._models import SyncResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_REPLAY_BYTES = 1024 * 1024
+
+FlightKey = tuple[str, str, str, tuple[Optional[str], ...]]
+
+_START, _CHUNK, _END = range(3)
+
+# Request headers carrying the caller's identity: requests with them are only
+# coalesced when they are part of the key.
+_CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+
+def _header(headers: Mapping[str, list[str]], name: str) -> Optional[str]:
+    for key, values in headers.items():
+        if key.lower() == name and values:
+            return values[0]
+    return None
+
+
+class SingleFlight:
+    """
+    Share one handler execution between identical concurrent sync requests.
+
+    Requests are identical when their method (``methods``, default ``GET``
+    and ``HEAD``), path, query string and the values of ``key_headers`` are
+    equal. The first one runs the handler; the others join it and receive
+    the same status, headers and body chunks through their own response
+    writer (and their own compression, if enabled). Requests carrying
+    ``Authorization`` or ``Cookie`` are never coalesced unless that header is
+    in ``key_headers``, so one caller never receives another's response.
+
+    A request can join until the running response has sent more than
+    ``max_replay_bytes`` of body: up to that point the frames are kept to
+    be replayed to late joiners. Later requests start a new flight::
+
+        coalescing = SingleFlight(key_headers=("Authorization",))
+        client = SlimFaasClient(url, config, single_flight=coalescing)
+
+        coalescing.snapshot()
+        # {"flights": 12, "coalesced": 230, "in_flight": 1}
+    """
+
+    def __init__(
+        self,
+        key_headers: tuple[str, ...] = (),
+        methods: tuple[str, ...] = ("GET", "HEAD"),
+        max_replay_bytes: int = DEFAULT_MAX_REPLAY_BYTES,
+    ) -> None:
+        self.key_headers = tuple(h.lower() for h in key_headers)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.max_replay_bytes = max_replay_bytes
+        self._flights: dict[FlightKey, Flight] = {}
+        self._started = 0
+        self._coalesced = 0
+
+    def key(self, method: str, path: str, query: str, headers: Mapping[str, list[str]]) -> Optional[FlightKey]:
+        """Coalescing key of a request, or ``None`` if it must not be coalesced."""
+        method = method.upper()
+        if method not in self.methods:
+            return None
+        for name in _CREDENTIAL_HEADERS:
+            if name not in self.key_headers and _header(headers, name) is not None:
+                return None
+        return method, path, query, tuple(_header(headers, h) for h in self.key_headers)
+
+    def join(
+        self,
+        key: FlightKey,
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+        correlation_id: str,
+    ) -> bool:
+        """Attach a request to the running flight for ``key``; ``False`` if there is none."""
+        flight = self._flights.get(key)
+        if flight is None:
+            return False
+        self._coalesced += 1
+        flight._join(correlation_id, send_start, send_chunk, send_end)
+        return True
+
+    def lead(self, key: FlightKey, send_start: Callable, send_chunk: Callable, send_end: Callable) -> "Flight":
+        """Start a flight for ``key`` whose response is produced by the caller's handler."""
+        flight = Flight(self, key, send_start, send_chunk, send_end)
+        self._flights[key] = flight
+        self._started += 1
+        return flight
+
+    def _forget(self, flight: "Flight") -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def snapshot(self) -> dict[str, int]:
+        """Flights started, requests coalesced into them and flights running now."""
+        return {"flights": self._started, "coalesced": self._coalesced, "in_flight": len(self._flights)}
+
+
+class Flight:
+    """
+    One running response, sitting between the leader's writer and the client.
+
+    Every frame goes to the leader, then is queued for each follower. Each
+    follower is fed by its own task, so a slow or failing follower never
+    delays the leader or the other followers.
+    """
+
+    def __init__(
+        self,
+        group: SingleFlight,
+        key: FlightKey,
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+    ) -> None:
+        self.key = key
+        self._group = group
+        self._send_start = send_start
+        self._send_chunk = send_chunk
+        self._send_end = send_end
+        self._followers: list[_Follower] = []
+        # Frames sent so far, replayed to late joiners (None once too large).
+        self._replay: Optional[list[tuple[int, Any]]] = []
+        self._replay_bytes = 0
+        self._started = False
+        self._ended = False
+
+    @property
+    def followers(self) -> int:
+        """Number of requests attached to this flight."""
+        return len(self._followers)
+
+    def _join(self, correlation_id: str, send_start: Callable, send_chunk: Callable, send_end: Callable) -> None:
+        follower = _Follower(correlation_id, send_start, send_chunk, send_end, self._replay or ())
+        self._followers.append(follower)
+
+    async def start(self, correlation_id: str, response: Any) -> None:
+        await self._send_start(correlation_id, response)
+        self._started = True
+        self._fan_out(_START, response)
+
+    async def chunk(self, correlation_id: str, data: Any) -> None:
+        await self._send_chunk(correlation_id, data)
+        self._fan_out(_CHUNK, data)
+
+    async def end(self, correlation_id: str) -> None:
+        self._ended = True
+        self._group._forget(self)
+        self._fan_out(_END, None)
+        await self._send_end(correlation_id)
+
+    async def abandon(self) -> None:
+        """
+        End the followers' responses if the leader's handler stopped without
+        completing (with a ``502`` if it never started its response).
+        """
+        self._group._forget(self)
+        if not self._ended:
+            self._ended = True
+            if not self._started:
+                self._started = True
+                self._fan_out(_START, SyncResponse(status_code=502, headers={}))
+            self._fan_out(_END, None)
+
+    def _fan_out(self, kind: int, data: Any) -> None:
+        if kind == _CHUNK and (self._followers or self._replay is not None):
+            # The handler may reuse its buffer once write() returns.
+            data = bytes(data)
+        replay = self._replay
+        if replay is not None:
+            if kind == _CHUNK:
+                self._replay_bytes += len(data)
+            if self._replay_bytes > self._group.max_replay_bytes:
+                # Too late to replay from the start: new requests get their own flight.
+                self._replay = None
+                self._group._forget(self)
+            else:
+                replay.append((kind, data))
+        for follower in self._followers:
+            follower.push(kind, data)
+
+
+class _Follower:
+    """A coalesced request: frames queued for it and the task sending them."""
+
+    def __init__(
+        self,
+        correlation_id: str,
+        send_start: Callable,
+        send_chunk: Callable,
+        send_end: Callable,
+        replay: Iterable[tuple[int, Any]],
+    ) -> None:
+        self.correlation_id = correlation_id
+        self._senders = (send_start, send_chunk, send_end)
+        self._frames: deque[tuple[int, Any]] = deque(replay)
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._task = asyncio.ensure_future(self._pump())
+
+    def push(self, kind: int, data: Any) -> None:
+        if not self._task.done():
+            self._frames.append((kind, data))
+            self._wakeup.set()
+
+    async def _pump(self) -> None:
+        send_start, send_chunk, send_end = self._senders
+        correlation_id = self.correlation_id
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self._frames:
+                    kind, data = self._frames.popleft()
+                    if kind == _START:
+                        await send_start(correlation_id, data)
+                    elif kind == _CHUNK:
+                        await send_chunk(correlation_id, data)
+                    else:
+                        await send_end(correlation_id)
+                        return
+        except Exception as exc:
+            logger.debug("Coalesced request %s dropped: %s", correlation_id, exc)
+        finally:
+            self._frames.clear()
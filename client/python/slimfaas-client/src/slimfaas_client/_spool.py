@@ -0,0 +1,101 @@
+"""
+Spooling of large request bodies to disk.
+
+Above a configurable size, request bodies are written incrementally to a
+temporary file instead of being held in memory, and handed to the handler
+as a :class:`SpooledBody`: a read-only memory map of that file.
+"""
+
+from __future__ import annotations
+
+import binascii
+import mmap
+import tempfile
+from typing import IO, Any, Optional
+
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024
+
+# Base64 is decoded in slices of this many characters (a multiple of 4).
+_BASE64_SLICE = 4 * 256 * 1024
+
+
+class SpooledBody(mmap.mmap):
+    """
+    Request body spooled to a temporary file, exposed as a read-only ``mmap``.
+
+    It behaves both like ``bytes`` (``len()``, slicing, ``memoryview()``,
+    ``find()``) and like a binary file (``read()``, ``readline()``,
+    ``seek()``, ``tell()``), so it can be passed to most libraries as is.
+    :attr:`name` is the path of the temporary file for tools that need one.
+
+    The file is deleted by :meth:`close`, which the client calls once the
+    handler has returned (except for async requests answered with 202).
+    """
+
+    _file: IO[bytes]
+
+    def __new__(cls, file: IO[bytes]) -> "SpooledBody":
+        file.flush()
+        self = super().__new__(cls, file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._file = file
+        return self
+
+    @property
+    def name(self) -> str:
+        """Path of the temporary file backing the body."""
+        return self._file.name  # type: ignore[return-value]
+
+    @property
+    def file(self) -> IO[bytes]:
+        """The underlying temporary file object."""
+        return self._file
+
+    def close(self) -> None:
+        """Unmap the body and delete its temporary file. Idempotent."""
+        if not self.closed:
+            super().close()
+        if not self._file.closed:
+            self._file.close()
+
+    def __reduce__(self) -> Any:
+        # Memory maps cannot be pickled: send a bytes copy instead.
+        return (bytes, (self[:],))
+
+    def __repr__(self) -> str:
+        return f"<SpooledBody {self.name!r} {len(self) if not self.closed else 'closed'}>"
+
+
+class BodySpooler:
+    """
+    Decides which bodies are spooled and where.
+
+    Bodies larger than ``threshold`` bytes are written to a temporary file in
+    ``directory`` (default: the system temporary directory)::
+
+        client = SlimFaasClient(url, config, spooler=BodySpooler(threshold=16 * 1024 * 1024))
+    """
+
+    def __init__(self, threshold: int = DEFAULT_SPOOL_THRESHOLD, directory: Optional[str] = None) -> None:
+        if threshold < 0:
+            raise ValueError("threshold must be positive or zero")
+        self.threshold = threshold
+        self.directory = directory
+
+    def should_spool(self, size: int) -> bool:
+        """True if a body of ``size`` bytes must be spooled."""
+        return size > self.threshold
+
+    def open(self) -> IO[bytes]:
+        """Create a new temporary file, deleted when closed."""
+        return tempfile.NamedTemporaryFile(prefix="slimfaas-body-", dir=self.directory)
+
+    def spool_base64(self, data: str) -> SpooledBody:
+        """Decode a base64 body slice by slice into a spooled file."""
+        file = self.open()
+        try:
+            for start in range(0, len(data), _BASE64_SLICE):
+                file.write(binascii.a2b_base64(data[start:start + _BASE64_SLICE]))
+            return SpooledBody(file)
+        except BaseException:
+            file.close()
+            raise
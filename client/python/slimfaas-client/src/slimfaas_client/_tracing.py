@@ -0,0 +1,363 @@
+"""
+Trace context propagation and tracing hooks.
+
+SlimFaas forwards the caller's W3C ``traceparent``/``tracestate`` headers
+with every request. When a :class:`Tracer` is installed on the client, the
+context is parsed into a context variable (see :func:`get_trace_context`)
+and spans are emitted around each request; without one, the client skips
+all of this with a single ``is None`` check per message.
+"""
+
+from __future__ import annotations
+
+import abc
+import contextlib
+import contextvars
+import logging
+import time
+from typing import Any, ContextManager, Iterator, Mapping, Optional
+
+from slimfaas_client._models import Headers
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[Optional["TraceContext"]] = contextvars.ContextVar(
+    "slimfaas_trace_context", default=None
+)
+
+
+def _header(headers: Mapping[str, list[str]], name: str) -> Optional[str]:
+    if isinstance(headers, Headers):
+        return headers.get_first(name)
+    for key, values in headers.items():
+        if key.lower() == name and values:
+            return values[0]
+    return None
+
+
+def _is_hex(value: str, length: int) -> bool:
+    if len(value) != length:
+        return False
+    try:
+        int(value, 16)
+    except ValueError:
+        return False
+    return value != "0" * length
+
+
+class TraceContext:
+    """
+    W3C trace context received with a request.
+
+    ``trace_id`` and ``parent_id`` are lowercase hex strings (32 and 16
+    digits), ``flags`` the trace flags (bit 0: sampled) and ``tracestate``
+    the raw ``tracestate`` header, if any.
+    """
+
+    __slots__ = ("trace_id", "parent_id", "flags", "tracestate")
+
+    def __init__(self, trace_id: str, parent_id: str, flags: int = 1, tracestate: Optional[str] = None) -> None:
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.flags = flags
+        self.tracestate = tracestate
+
+    @classmethod
+    def parse(cls, traceparent: str, tracestate: Optional[str] = None) -> Optional["TraceContext"]:
+        """Parse a ``traceparent`` header; ``None`` if it is malformed."""
+        parts = traceparent.strip().lower().split("-")
+        if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+            return None
+        version, trace_id, parent_id, flags = parts[:4]
+        if version == "00" and len(parts) != 4:
+            return None
+        if not (_is_hex(trace_id, 32) and _is_hex(parent_id, 16) and len(flags) == 2):
+            return None
+        try:
+            return cls(trace_id, parent_id, int(flags, 16), tracestate or None)
+        except ValueError:
+            return None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, list[str]]) -> Optional["TraceContext"]:
+        """Trace context of a request's headers, or ``None``."""
+        traceparent = _header(headers, "traceparent")
+        if traceparent is None:
+            return None
+        return cls.parse(traceparent, _header(headers, "tracestate"))
+
+    @property
+    def sampled(self) -> bool:
+        return bool(self.flags & 1)
+
+    @property
+    def traceparent(self) -> str:
+        """The context as a ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.parent_id}-{self.flags:02x}"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TraceContext):
+            return NotImplemented
+        return (self.trace_id, self.parent_id, self.flags, self.tracestate) == (
+            other.trace_id, other.parent_id, other.flags, other.tracestate
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TraceContext({self.traceparent!r}, tracestate={self.tracestate!r})"
+
+
+def get_trace_context() -> Optional[TraceContext]:
+    """
+    Trace context of the request being handled, or ``None``.
+
+    Only set while a :class:`Tracer` is installed on the client.
+    """
+    return _current.get()
+
+
+class Tracer(abc.ABC):
+    """
+    Hooks called by the client around each request, when installed with
+    ``SlimFaasClient(..., tracer=...)``.
+
+    For every AsyncRequest, PublishEvent and sync request the client emits
+    a request span (parent: the caller's :class:`TraceContext`) with three
+    children: ``slimfaas.queue_wait`` (waiting for a concurrency slot),
+    ``slimfaas.handler`` (the handler, during which :meth:`activate` is in
+    effect) and, for sync requests, ``slimfaas.sync_response`` (from the
+    response start to its last frame).
+
+    :class:`OpenTelemetryTracer` implements these hooks on top of
+    OpenTelemetry. An exception raised by a hook is logged and the request
+    goes on untraced.
+    """
+
+    @abc.abstractmethod
+    def start_span(
+        self,
+        name: str,
+        parent: Any,
+        attributes: dict[str, Any],
+        start_time_ns: Optional[int] = None,
+        kind: str = "internal",
+    ) -> Any:
+        """
+        Start a span and return it.
+
+        ``parent`` is a :class:`TraceContext` (remote caller, or ``None``
+        if the request carried none) for request spans, a span returned by
+        this method for their children, or ``None`` for a child of the
+        span made current by :meth:`activate`. ``kind`` is ``"server"``,
+        ``"consumer"`` or ``"internal"``.
+        """
+
+    @abc.abstractmethod
+    def end_span(
+        self,
+        span: Any,
+        *,
+        attributes: Optional[dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+        end_time_ns: Optional[int] = None,
+    ) -> None:
+        """End ``span``, adding ``attributes`` and recording ``error`` if any."""
+
+    def activate(self, span: Any) -> ContextManager[Any]:
+        """Make ``span`` the current span while the handler runs (default: no-op)."""
+        return contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def request_span(
+    tracer: Tracer,
+    kind: str,
+    headers: Mapping[str, list[str]],
+    attributes: dict[str, Any],
+    submitted: Optional[float] = None,
+    span_kind: str = "server",
+) -> Iterator[dict[str, Any]]:
+    """
+    Emit the request, queue-wait and handler spans of one request and expose
+    its trace context through :func:`get_trace_context`.
+
+    ``submitted`` is the ``time.perf_counter()`` value at which the request
+    was handed to the concurrency limiter. Yields a dict of attributes to
+    add to the request span when it ends.
+    """
+    parent = TraceContext.from_headers(headers)
+    token = _current.set(parent)
+    now_ns = time.time_ns()
+    start_ns = now_ns if submitted is None else now_ns - int((time.perf_counter() - submitted) * 1e9)
+    span = _start_span(tracer, f"slimfaas.{kind}", parent, attributes, start_ns, span_kind)
+    handler = None
+    if span is not None:
+        if submitted is not None:
+            wait = _start_span(tracer, "slimfaas.queue_wait", span, {}, start_ns)
+            _end_span(tracer, wait, end_time_ns=now_ns)
+        handler = _start_span(tracer, "slimfaas.handler", span, {}, now_ns)
+    activation: Optional[ContextManager[Any]] = None
+    if handler is not None:
+        try:
+            activation = tracer.activate(handler)
+            activation.__enter__()
+        except Exception as exc:
+            logger.warning("Tracer.activate failed: %s", exc)
+            activation = None
+    outcome: dict[str, Any] = {}
+    error: Optional[BaseException] = None
+    try:
+        yield outcome
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        if activation is not None:
+            try:
+                if error is None:
+                    activation.__exit__(None, None, None)
+                else:
+                    activation.__exit__(type(error), error, error.__traceback__)
+            except Exception as exc:
+                logger.warning("Tracer.activate failed on exit: %s", exc)
+        _end_span(tracer, handler, error=error)
+        _end_span(tracer, span, attributes=outcome, error=error)
+        _current.reset(token)
+
+
+def _start_span(tracer: Tracer, *args: Any) -> Any:
+    """``tracer.start_span(*args)``, or ``None`` (logged) if the tracer fails."""
+    try:
+        return tracer.start_span(*args)
+    except Exception as exc:
+        logger.warning("Tracer.start_span failed: %s", exc)
+        return None
+
+
+def _end_span(tracer: Tracer, span: Any, **kwargs: Any) -> None:
+    """``tracer.end_span(span, **kwargs)`` unless ``span`` is ``None``; failures are logged."""
+    if span is None:
+        return
+    try:
+        tracer.end_span(span, **kwargs)
+    except Exception as exc:
+        logger.warning("Tracer.end_span failed: %s", exc)
+
+
+class TracedResponse:
+    """Sync response senders wrapped in a ``slimfaas.sync_response`` span."""
+
+    __slots__ = ("_tracer", "_send_start", "_send_chunk", "_send_end", "_span", "_bytes")
+
+    def __init__(self, tracer: Tracer, send_start: Any, send_chunk: Any, send_end: Any) -> None:
+        self._tracer = tracer
+        self._send_start = send_start
+        self._send_chunk = send_chunk
+        self._send_end = send_end
+        self._span: Any = None
+        self._bytes = 0
+
+    async def start(self, correlation_id: str, response: Any) -> None:
+        self._span = _start_span(
+            self._tracer, "slimfaas.sync_response", None, {"http.response.status_code": response.status_code}
+        )
+        await self._send_start(correlation_id, response)
+
+    async def chunk(self, correlation_id: str, data: Any) -> None:
+        self._bytes += memoryview(data).nbytes
+        await self._send_chunk(correlation_id, data)
+
+    async def end(self, correlation_id: str) -> None:
+        try:
+            await self._send_end(correlation_id)
+        finally:
+            self._finish(True)
+
+    def close(self) -> None:
+        """End the span if the handler stopped before completing the response."""
+        self._finish(False)
+
+    def _finish(self, completed: bool) -> None:
+        span, self._span = self._span, None
+        _end_span(
+            self._tracer,
+            span,
+            attributes={"slimfaas.response.bytes": self._bytes, "slimfaas.response.completed": completed},
+        )
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    :class:`Tracer` emitting OpenTelemetry spans (requires
+    ``opentelemetry-api``; spans are exported by the SDK configured in the
+    process)::
+
+        from slimfaas_client import OpenTelemetryTracer
+
+        client = SlimFaasClient(url, config, tracer=OpenTelemetryTracer())
+
+    Spans started by the handler (HTTP clients, database drivers, …) are
+    children of ``slimfaas.handler``, in the caller's trace.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("slimfaas_client")
+        self._kinds = {
+            "server": trace.SpanKind.SERVER,
+            "consumer": trace.SpanKind.CONSUMER,
+            "internal": trace.SpanKind.INTERNAL,
+        }
+
+    def start_span(
+        self,
+        name: str,
+        parent: Any,
+        attributes: dict[str, Any],
+        start_time_ns: Optional[int] = None,
+        kind: str = "internal",
+    ) -> Any:
+        trace = self._trace
+        context = None
+        if isinstance(parent, TraceContext):
+            span_context = trace.SpanContext(
+                trace_id=int(parent.trace_id, 16),
+                span_id=int(parent.parent_id, 16),
+                is_remote=True,
+                trace_flags=trace.TraceFlags(parent.flags),
+                trace_state=trace.TraceState.from_header([parent.tracestate]) if parent.tracestate else None,
+            )
+            context = trace.set_span_in_context(trace.NonRecordingSpan(span_context))
+        elif parent is not None:
+            context = trace.set_span_in_context(parent)
+        elif kind != "internal":
+            # Request without a trace context: start a new trace, not a child of whatever is current.
+            context = trace.set_span_in_context(trace.INVALID_SPAN)
+        return self._tracer.start_span(
+            name, context=context, kind=self._kinds.get(kind, trace.SpanKind.INTERNAL),
+            attributes=attributes, start_time=start_time_ns,
+        )
+
+    def end_span(
+        self,
+        span: Any,
+        *,
+        attributes: Optional[dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+        end_time_ns: Optional[int] = None,
+    ) -> None:
+        if attributes:
+            span.set_attributes(attributes)
+        status = (attributes or {}).get("http.response.status_code")
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        elif isinstance(status, int) and status >= 500:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end(end_time=end_time_ns)
+
+    def activate(self, span: Any) -> ContextManager[Any]:
+        return self._trace.use_span(span, end_on_exit=False)
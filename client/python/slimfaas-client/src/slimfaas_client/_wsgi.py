@@ -0,0 +1,215 @@
+"""
+WSGI adapter: serve a WSGI application (Flask, Django, …) through the
+synchronous streaming path.
+
+The application runs on a bounded thread pool. It reads the request body
+from ``wsgi.input`` while the chunks arrive, and each item of its response
+iterable is written back through the event loop before the next one is
+produced, so a slow connection slows the application down instead of
+piling the response up in memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import io
+import logging
+import os
+import sys
+import threading
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import unquote_to_bytes
+
+from slimfaas_client._executors import BlockingBodyReader, BlockingResponseWriter
+from slimfaas_client._models import SyncRequest
+
+logger = logging.getLogger(__name__)
+
+WSGIApp = Callable[[dict[str, Any], Callable[..., Any]], Iterable[bytes]]
+
+DEFAULT_WSGI_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _environ(req: SyncRequest, script_name: str) -> dict[str, Any]:
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": req.method.upper(),
+        "SCRIPT_NAME": script_name,
+        # PEP 3333: native strings holding the raw bytes, decoded as latin-1.
+        "PATH_INFO": unquote_to_bytes(req.path).decode("latin-1"),
+        "QUERY_STRING": req.query.lstrip("?"),
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        # The body stream ends with the request: reading to EOF is safe
+        # even without a Content-Length.
+        "wsgi.input_terminated": True,
+    }
+    for name, values in req.headers.items():
+        key = name.upper().replace("-", "_")
+        value = ",".join(values)
+        if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[key] = value
+        else:
+            environ["HTTP_" + key] = value
+    host = environ.get("HTTP_HOST")
+    if host:
+        name, _, port = host.partition(":")
+        environ["SERVER_NAME"] = name
+        environ["SERVER_PORT"] = port or "80"
+    return environ
+
+
+class WSGIHandler:
+    """
+    Sync request handler running a WSGI application on a bounded thread pool.
+
+    ::
+
+        from flask import Flask
+        from slimfaas_client import WSGIHandler
+
+        app = Flask(__name__)
+        client.on_sync_request(WSGIHandler(app, workers=16))
+
+    ``wsgi.input`` is a blocking reader over the request's
+    :class:`SyncBodyStream` and every item of the response iterable is
+    sent through the :class:`SyncResponseWriter`, waiting for the frame to
+    be handed to the WebSocket before the application produces the next
+    one. Requests beyond ``workers`` wait for a free thread; how often that
+    happens is reported by :meth:`snapshot`::
+
+        handler.snapshot()
+        # {"workers": 16, "busy": 16, "waiting": 3, "requests": 1200, "saturated": 41}
+
+    Parameters
+    ----------
+    app:
+        The WSGI application.
+    workers:
+        Size of the thread pool owned by this handler (default:
+        ``min(32, os.cpu_count() + 4)``).
+    script_name:
+        ``SCRIPT_NAME`` of every request, e.g. ``/function/my-function``
+        so the application builds URLs as seen through SlimFaas.
+    """
+
+    def __init__(self, app: WSGIApp, *, workers: Optional[int] = None, script_name: str = "") -> None:
+        self.app = app
+        self.workers = workers or DEFAULT_WSGI_WORKERS
+        self.script_name = script_name
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._busy = 0
+        self._requests = 0
+        self._saturated = 0
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="slimfaas-wsgi"
+            )
+        return self._executor
+
+    async def startup(self) -> None:
+        """Create the thread pool. Idempotent."""
+        self._get_executor()
+
+    async def shutdown(self) -> None:
+        """Stop the thread pool. Idempotent."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def __call__(self, req: SyncRequest) -> None:
+        loop = asyncio.get_running_loop()
+        environ = _environ(req, self.script_name)
+        environ["wsgi.input"] = io.BufferedReader(BlockingBodyReader(req.body, loop))  # type: ignore[arg-type]
+        writer = BlockingResponseWriter(req.response, loop)
+        with self._lock:
+            if self._pending >= self.workers:
+                self._saturated += 1
+            self._pending += 1
+            self._requests += 1
+        ctx = contextvars.copy_context()
+        try:
+            await loop.run_in_executor(self._get_executor(), ctx.run, self._run, environ, writer)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _run(self, environ: dict[str, Any], writer: BlockingResponseWriter) -> None:
+        with self._lock:
+            self._busy += 1
+        try:
+            self._serve(environ, writer)
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _serve(self, environ: dict[str, Any], writer: BlockingResponseWriter) -> None:
+        response: list[Any] = []  # [status_code, headers] once start_response is called
+        started = False
+
+        def send_headers() -> None:
+            nonlocal started
+            if not response:
+                raise RuntimeError("WSGI application did not call start_response()")
+            started = True
+            writer.start(*response)
+
+        def write(data: bytes) -> None:
+            if not started:
+                send_headers()
+            writer.write(data)
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info: Any = None) -> Callable:
+            if exc_info is not None:
+                try:
+                    if started:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            elif response:
+                raise RuntimeError("start_response() called twice without exc_info")
+            grouped: dict[str, list[str]] = {}
+            for name, value in headers:
+                grouped.setdefault(name, []).append(value)
+            response[:] = [int(status.split(" ", 1)[0]), grouped]
+            return write
+
+        result = self.app(environ, start_response)
+        try:
+            for data in result:
+                if data:
+                    write(data)
+            if not started:
+                send_headers()
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        writer.complete()
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Thread pool usage: threads, threads running the application now,
+        requests waiting for a thread, requests served and requests that
+        found every thread busy.
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "busy": self._busy,
+                "waiting": self._pending - self._busy,
+                "requests": self._requests,
+                "saturated": self._saturated,
+            }
@@ -0,0 +1,65 @@
+"""
+Fixtures partagées : WebSocket simulé et clients branchés dessus.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import SlimFaasClientConfig
+
+
+class MockWebSocket:
+    """Simule une connexion WebSocket : garde les messages envoyés."""
+
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.closed = False
+
+    async def send(self, data, text=None) -> None:
+        self.sent.append(data)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def make_ws() -> Callable[[], MockWebSocket]:
+    """Fabrique de WebSockets simulés, pour les tests qui en utilisent plusieurs."""
+    return MockWebSocket
+
+
+@pytest.fixture
+def ws() -> MockWebSocket:
+    return MockWebSocket()
+
+
+@pytest.fixture
+def make_client(ws: MockWebSocket) -> Callable[..., SlimFaasClient]:
+    """
+    Fabrique de clients déjà « connectés » au WebSocket simulé ``ws`` ;
+    les arguments nommés sont passés à :class:`SlimFaasClient`.
+    """
+
+    def factory(config: Optional[SlimFaasClientConfig] = None, **kwargs) -> SlimFaasClient:
+        client = SlimFaasClient("ws://fake", config or SlimFaasClientConfig(function_name="f"), **kwargs)
+        client._ws = ws  # type: ignore[assignment]
+        return client
+
+    return factory
+
+
+@pytest.fixture
+def connect(make_ws: Callable[[], MockWebSocket]) -> Callable[..., MockWebSocket]:
+    """Branche un client (d'un pool, typiquement) sur un nouveau WebSocket simulé et l'enregistre."""
+
+    def attach(client: SlimFaasClient, connection_id: Optional[str] = "conn") -> MockWebSocket:
+        socket = make_ws()
+        client._ws = socket  # type: ignore[assignment]
+        client._connection_id = connection_id
+        return socket
+
+    return attach
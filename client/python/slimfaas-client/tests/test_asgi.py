@@ -0,0 +1,200 @@
+"""
+Tests de l'adaptateur ASGI (application ASGI servie par le chemin synchrone).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._asgi import ASGIHandler
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType
+
+
+@pytest.fixture
+def mount(make_client):
+    def factory(app, **kwargs) -> tuple[SlimFaasClient, ASGIHandler]:
+        client = make_client()
+        handler = ASGIHandler(app, **kwargs)
+        client.on_sync_request(handler)
+        return client, handler
+
+    return factory
+
+
+async def serve(client: SlimFaasClient, ws, *, method="POST", path="/", query="", headers=None, chunks=()):
+    corr = "c" * 36
+    start = json.dumps({"method": method, "path": path, "query": query, "headers": headers or {}}).encode()
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+    for chunk in chunks:
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, corr, chunk)))  # type: ignore[arg-type]
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+    for task in list(client.concurrency.sync_requests._tasks):
+        await task
+
+    status, headers_out, body, ended, chunk_frames = 0, {}, b"", False, 0
+    for message in ws.sent:
+        msg_type, _, _, payload = BinaryFrame.decode(bytes(message))
+        if msg_type == MessageType.SYNC_RESPONSE_START:
+            start_payload = json.loads(bytes(payload))
+            status, headers_out = start_payload["statusCode"], start_payload["headers"]
+        elif msg_type == MessageType.SYNC_RESPONSE_CHUNK:
+            body += bytes(payload)
+            chunk_frames += 1
+        elif msg_type == MessageType.SYNC_RESPONSE_END:
+            ended = True
+    return status, headers_out, body, ended, chunk_frames
+
+
+async def echo_app(scope, receive, send):
+    assert scope["type"] == "http"
+    body = b""
+    while True:
+        message = await receive()
+        body += message["body"]
+        if not message["more_body"]:
+            break
+    await send({
+        "type": "http.response.start",
+        "status": 201,
+        "headers": [(b"content-type", b"text/plain"), (b"x-path", scope["path"].encode()), (b"x-query", scope["query_string"])],
+    })
+    await send({"type": "http.response.body", "body": body, "more_body": True})
+    await send({"type": "http.response.body", "body": b"|" + scope["method"].encode()})
+
+
+class TestASGIHandler:
+    @pytest.mark.asyncio
+    async def test_request_and_response_streamed(self, mount, ws):
+        client, _ = mount(echo_app)
+        status, headers, body, ended, frames = await serve(
+            client, ws, path="/a%20b", query="?x=1", chunks=(b"hello ", b"world")
+        )
+        assert status == 201
+        assert headers == {"content-type": ["text/plain"], "x-path": ["/a b"], "x-query": ["x=1"]}
+        assert body == b"hello world|POST"
+        assert ended
+        # Un message http.response.body = une trame : rien n'est mis en tampon.
+        assert frames == 2
+
+    @pytest.mark.asyncio
+    async def test_scope(self, mount, ws):
+        scopes: list[dict] = []
+
+        async def app(scope, receive, send):
+            scopes.append(scope)
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body"})
+
+        client, _ = mount(app, root_path="/function/f")
+        await serve(client, ws, method="get", path="/items/1", headers={"X-Multi": ["a", "b"]})
+        scope = scopes[0]
+        assert scope["method"] == "GET"
+        assert scope["raw_path"] == b"/items/1"
+        assert scope["root_path"] == "/function/f"
+        assert scope["headers"] == [(b"x-multi", b"a"), (b"x-multi", b"b")]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_after_response(self, mount, ws):
+        received: list[str] = []
+
+        async def app(scope, receive, send):
+            received.append((await receive())["type"])
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"ok"})
+            received.append((await receive())["type"])
+
+        client, _ = mount(app)
+        status, _, body, ended, _ = await serve(client, ws)
+        assert (status, body, ended) == (200, b"ok", True)
+        assert received == ["http.request", "http.disconnect"]
+
+    @pytest.mark.asyncio
+    async def test_app_error_before_start_returns_500(self, mount, ws):
+        async def app(scope, receive, send):
+            raise RuntimeError("boom")
+
+        client, _ = mount(app)
+        status, _, _, ended, _ = await serve(client, ws)
+        assert (status, ended) == (500, True)
+
+
+def lifespan_app(events: list[str], fail: bool = False):
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    events.append("startup")
+                    if fail:
+                        await send({"type": "lifespan.startup.failed", "message": "no database"})
+                        return
+                    scope["state"]["db"] = "connected"
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    events.append("shutdown")
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        await send({"type": "http.response.start", "status": 200})
+        await send({"type": "http.response.body", "body": scope["state"]["db"].encode()})
+
+    return app
+
+
+class TestLifespan:
+    @pytest.mark.asyncio
+    async def test_startup_state_and_shutdown(self, mount, ws):
+        events: list[str] = []
+        client, handler = mount(lifespan_app(events))
+
+        await client._run_handler_hooks("startup")
+        await handler.startup()  # idempotent
+        assert events == ["startup"]
+        _, _, body, _, _ = await serve(client, ws)
+        assert body == b"connected"
+
+        await client._run_handler_hooks("shutdown")
+        assert events == ["startup", "shutdown"]
+
+    @pytest.mark.asyncio
+    async def test_startup_failure(self):
+        handler = ASGIHandler(lifespan_app([], fail=True))
+        with pytest.raises(RuntimeError, match="no database"):
+            await handler.startup()
+
+    @pytest.mark.asyncio
+    async def test_lifespan_not_supported(self):
+        async def app(scope, receive, send):
+            assert scope["type"] == "http"
+
+        await ASGIHandler(app).startup()
+        with pytest.raises(AssertionError):
+            await ASGIHandler(app, lifespan="on").startup()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_startup_waits_for_completion(self):
+        release = asyncio.Event()
+        done: list[str] = []
+
+        async def app(scope, receive, send):
+            await receive()
+            await release.wait()
+            await send({"type": "lifespan.startup.complete"})
+            await receive()
+
+        handler = ASGIHandler(app)
+        first = asyncio.ensure_future(handler.startup())
+        second = asyncio.ensure_future(handler.startup())
+        second.add_done_callback(lambda _: done.append("second"))
+        await asyncio.sleep(0.01)
+        assert done == []
+        release.set()
+        await asyncio.gather(first, second)
+        await handler.shutdown()
+
+    def test_invalid_lifespan_mode(self):
+        with pytest.raises(ValueError):
+            ASGIHandler(echo_app, lifespan="maybe")
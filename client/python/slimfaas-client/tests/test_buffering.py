@@ -0,0 +1,104 @@
+"""
+Tests de la coalescence des écritures de réponse synchrone (ResponseBuffering).
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from slimfaas_client._buffering import ResponseBuffering
+from slimfaas_client._models import SyncResponseWriter
+
+
+class Recorder:
+    def __init__(self):
+        self.events: list = []
+
+    async def start(self, corr, response) -> None:
+        self.events.append(("start", response.status_code))
+
+    async def chunk(self, corr, data) -> None:
+        self.events.append(("chunk", bytes(data)))
+
+    async def end(self, corr) -> None:
+        self.events.append(("end",))
+
+    @property
+    def chunks(self) -> list[bytes]:
+        return [e[1] for e in self.events if e[0] == "chunk"]
+
+
+def make_writer(buffering: ResponseBuffering | None) -> tuple[SyncResponseWriter, Recorder]:
+    rec = Recorder()
+    return SyncResponseWriter("c" * 36, rec.start, rec.chunk, rec.end, buffering=buffering), rec
+
+
+class TestResponseBuffering:
+    @pytest.mark.asyncio
+    async def test_small_writes_are_coalesced(self):
+        buffering = ResponseBuffering(frame_size=10, max_frame_size=10, flush_interval=None)
+        writer, rec = make_writer(buffering)
+
+        for piece in (b"abc", b"def", b"ghi", b"jkl", b"m"):
+            await writer.write(piece)
+        assert rec.chunks == [b"abcdefghij"]
+
+        await writer.complete()
+        assert rec.chunks == [b"abcdefghij", b"klm"]
+        assert rec.events[-1] == ("end",)
+        assert writer.frames_sent == 2
+        assert buffering.snapshot()["frames_per_response"] == 2.0
+        assert buffering.bytes_per_frame == 6.5
+
+    @pytest.mark.asyncio
+    async def test_large_write_is_split(self):
+        writer, rec = make_writer(ResponseBuffering(frame_size=4, max_frame_size=8, flush_interval=None))
+
+        await writer.write(b"ab")
+        await writer.write(b"0123456789abcdefXYZ")
+        await writer.complete()
+
+        assert rec.chunks == [b"ab01", b"23456789", b"abcdefXY", b"Z"]
+        assert b"".join(rec.chunks) == b"ab0123456789abcdefXYZ"
+        assert all(len(c) <= 8 for c in rec.chunks)
+
+    @pytest.mark.asyncio
+    async def test_explicit_flush(self):
+        writer, rec = make_writer(ResponseBuffering(frame_size=1024, flush_interval=None))
+        await writer.write(b"hello")
+        assert rec.chunks == []
+        await writer.flush()
+        assert rec.chunks == [b"hello"]
+
+    @pytest.mark.asyncio
+    async def test_auto_flush_timer(self):
+        """Les octets en attente partent après flush_interval sans appel explicite."""
+        writer, rec = make_writer(ResponseBuffering(frame_size=1024, flush_interval=0.01))
+        await writer.write(b"tick")
+        await asyncio.sleep(0.05)
+        assert rec.chunks == [b"tick"]
+
+    @pytest.mark.asyncio
+    async def test_buffer_does_not_alias_caller_data(self):
+        writer, rec = make_writer(ResponseBuffering(frame_size=1024, flush_interval=None))
+        data = bytearray(b"abc")
+        await writer.write(data)
+        data[:] = b"xyz"
+        await writer.complete()
+        assert rec.chunks == [b"abc"]
+
+    @pytest.mark.asyncio
+    async def test_unbuffered_writer_counts_frames(self):
+        writer, rec = make_writer(None)
+        await writer.write(b"a")
+        await writer.write(b"bc")
+        await writer.flush()
+        await writer.complete()
+        assert rec.chunks == [b"a", b"bc"]
+        assert (writer.frames_sent, writer.bytes_sent) == (2, 3)
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            ResponseBuffering(frame_size=10, max_frame_size=5)
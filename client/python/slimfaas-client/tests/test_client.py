@@ -12,6 +12,7 @@ import pytest
 
 from slimfaas_client._models import (
     AsyncRequest,
+    BinaryFrame,
     FunctionVisibility,
     FunctionTrust,
     MessageType,
@@ -19,7 +20,9 @@ from slimfaas_client._models import (
     SlimFaasClientConfig,
     SubscribeEventConfig,
     PathVisibilityConfig,
+    SyncBodyStream,
 )
+from slimfaas_client._flow_control import SyncBodyFlowControl
 from slimfaas_client._client import SlimFaasClient, SlimFaasRegistrationError
 
 
@@ -88,6 +91,41 @@ class TestAsyncRequest:
         assert req.try_number == 2
 
 
+    def test_body_decoded_lazily(self):
+        import base64
+        encoded = base64.b64encode(b"payload").decode()
+        req = AsyncRequest.from_payload({
+            "elementId": "e3", "method": "POST", "path": "/", "headers": {}, "body": encoded,
+        })
+        assert req.body_base64 == encoded
+        assert req._body_decoded is False
+        assert req.body == b"payload"
+        assert req._body_decoded is True
+
+    def test_headers_case_insensitive_read_only(self):
+        req = AsyncRequest.from_payload({
+            "elementId": "e4", "method": "GET", "path": "/",
+            "headers": {"Content-Type": ["application/json"]},
+        })
+        assert req.headers["content-type"] == ["application/json"]
+        assert req.headers.get_first("CONTENT-TYPE") == "application/json"
+        assert "content-TYPE" in req.headers
+        assert req.headers == {"Content-Type": ["application/json"]}
+        with pytest.raises(TypeError):
+            req.headers["X-New"] = ["1"]  # type: ignore[index]
+
+    def test_slots_and_pickle(self):
+        import pickle
+        req = AsyncRequest(
+            element_id="e5", method="GET", path="/", query="",
+            headers={"A": ["1"]}, body=b"x", is_last_try=False, try_number=1,
+        )
+        assert not hasattr(req, "__dict__")
+        clone = pickle.loads(pickle.dumps(req))
+        assert clone == req
+        assert clone.body_base64 == "eA=="
+
+
 class TestPublishEvent:
     def test_from_payload(self):
         payload = {
@@ -103,6 +141,262 @@ class TestPublishEvent:
         assert evt.body is None
 
 
+class TestBinaryFrame:
+    def test_encode_decode_roundtrip(self):
+        corr = "0123456789abcdef0123456789abcdef0123"
+        frame = BinaryFrame.encode(MessageType.SYNC_RESPONSE_CHUNK, corr, b"payload", flags=1)
+        assert len(frame) == BinaryFrame.HEADER_SIZE + 7
+        msg_type, cid, flags, payload = BinaryFrame.decode(bytes(frame))
+        assert (msg_type, cid, flags) == (MessageType.SYNC_RESPONSE_CHUNK, corr, 1)
+        assert isinstance(payload, memoryview)
+        assert payload == b"payload"
+
+    def test_header_layout(self):
+        """Le format doit rester compatible avec le côté C# (id complété par des espaces)."""
+        frame = BinaryFrame.encode(0x21, "abc", b"xy")
+        assert frame[0] == 0x21
+        assert frame[1:37] == b"abc".ljust(36)
+        assert frame[37] == 0
+        assert frame[38:42] == (2).to_bytes(4, "big")
+        assert frame[42:] == b"xy"
+
+    def test_encode_fragments_does_not_copy_payload(self):
+        payload = bytearray(b"x" * 100)
+        header, body = BinaryFrame.encode_fragments(0x21, "c", payload)
+        assert body is payload
+        assert header == bytes(BinaryFrame.encode(0x21, "c", payload))[:BinaryFrame.HEADER_SIZE]
+
+    def test_encode_accepts_buffer_protocol(self):
+        import array
+        data = array.array("i", [1, 2, 3])
+        frame = BinaryFrame.encode(0x21, "c", data)
+        assert frame[BinaryFrame.HEADER_SIZE:] == data.tobytes()
+
+
+def make_stream(*chunks: bytes, close: bool = True) -> SyncBodyStream:
+    stream = SyncBodyStream()
+    for chunk in chunks:
+        stream._feed(memoryview(chunk))
+    if close:
+        stream._close()
+    return stream
+
+
+class TestSyncBodyStream:
+    @pytest.mark.asyncio
+    async def test_read_small_pieces(self):
+        stream = make_stream(b"hello ", b"wor", b"ld")
+        parts = []
+        while True:
+            piece = await stream.read(4)
+            if not piece:
+                break
+            parts.append(piece)
+        assert parts == [b"hell", b"o wo", b"rld"]
+        assert stream.at_eof()
+
+    @pytest.mark.asyncio
+    async def test_async_for_after_partial_read(self):
+        stream = make_stream(b"abcdef", b"gh")
+        assert await stream.read(2) == b"ab"
+        chunks = [c async for c in stream]
+        assert chunks == [b"cdef", b"gh"]
+        assert all(type(c) is bytes for c in chunks)
+
+    @pytest.mark.asyncio
+    async def test_iter_views_zero_copy(self):
+        frame = bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, "c1", b"abcdef"))
+        stream = SyncBodyStream()
+        stream._feed(BinaryFrame.decode(frame)[3])
+        stream._close()
+        assert await stream.read(2) == b"ab"
+        views = [v async for v in stream.iter_views()]
+        assert isinstance(views[0], memoryview)
+        assert views[0].obj is frame
+        assert bytes(views[0]) == b"cdef"
+
+    @pytest.mark.asyncio
+    async def test_readall(self):
+        stream = make_stream(b"a", b"b", b"c")
+        assert await stream.readall() == b"abc"
+        assert await stream.read() == b""
+
+    @pytest.mark.asyncio
+    async def test_readinto(self):
+        stream = make_stream(b"abc", b"defg")
+        buf = bytearray(5)
+        assert await stream.readinto(buf) == 5
+        assert buf == b"abcde"
+        assert await stream.readinto(buf) == 2
+        assert buf[:2] == b"fg"
+        assert await stream.readinto(buf) == 0
+
+    @pytest.mark.asyncio
+    async def test_readexactly(self):
+        stream = make_stream(b"abc", b"de")
+        assert await stream.readexactly(4) == b"abcd"
+        with pytest.raises(asyncio.IncompleteReadError) as exc:
+            await stream.readexactly(3)
+        assert exc.value.partial == b"e"
+
+    @pytest.mark.asyncio
+    async def test_readuntil_across_chunks(self):
+        stream = make_stream(b"line1\r", b"\nline", b"2\r\nrest")
+        assert await stream.readuntil(b"\r\n") == b"line1\r\n"
+        assert await stream.readuntil(b"\r\n") == b"line2\r\n"
+        with pytest.raises(asyncio.IncompleteReadError) as exc:
+            await stream.readuntil(b"\r\n")
+        assert exc.value.partial == b"rest"
+
+    @pytest.mark.asyncio
+    async def test_read_waits_for_feed(self):
+        stream = SyncBodyStream()
+        reader = asyncio.create_task(stream.readexactly(6))
+        await asyncio.sleep(0)
+        stream._feed(b"abc")
+        await asyncio.sleep(0)
+        assert not reader.done()
+        stream._feed(b"def")
+        assert await reader == b"abcdef"
+
+
+class TestSyncBodyFlowControl:
+    @pytest.mark.asyncio
+    async def test_pause_until_low_watermark(self):
+        flow = SyncBodyFlowControl(high_watermark=10, low_watermark=4, max_buffered_bytes=1000)
+        stream = SyncBodyStream(flow)
+        stream._start_reading()
+        stream._feed(b"x" * 12)
+        assert stream._needs_pause()
+        assert flow.buffered_bytes == 12
+
+        waiter = asyncio.create_task(stream._wait_drained())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await stream.read(6)
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await stream.read(2)
+        await asyncio.wait_for(waiter, 1)
+        assert flow.buffered_bytes == 4
+        assert flow.peak_buffered_bytes == 12
+        assert flow.pauses == 1
+
+    def test_no_pause_before_handler_reads(self):
+        """Tant que le handler n'a pas démarré, on ne bloque pas la boucle de lecture."""
+        flow = SyncBodyFlowControl(high_watermark=10, low_watermark=4, max_buffered_bytes=1000)
+        stream = SyncBodyStream(flow)
+        stream._feed(b"x" * 50)
+        assert not stream._needs_pause()
+
+    def test_global_budget_and_discard(self):
+        flow = SyncBodyFlowControl(high_watermark=100, low_watermark=10, max_buffered_bytes=20)
+        first, second = SyncBodyStream(flow), SyncBodyStream(flow)
+        first._feed(b"x" * 15)
+        second._start_reading()
+        second._feed(b"y" * 8)
+        assert flow.over_budget
+        assert second._needs_pause()
+        first._discard()
+        assert flow.buffered_bytes == 8
+        assert not second._needs_pause()
+        first._feed(b"ignored")
+        assert flow.buffered_bytes == 8
+
+    @pytest.mark.asyncio
+    async def test_client_pauses_read_loop_on_congested_stream(self):
+        flow = SyncBodyFlowControl(high_watermark=4, low_watermark=0, max_buffered_bytes=1000)
+        client = SlimFaasClient("ws://fake", make_config(), flow_control=flow)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(req) -> None:
+            started.set()
+            await release.wait()
+            await req.body.readall()
+
+        client.on_sync_request(handler)
+        ws = MockWebSocket([])
+        start = json.dumps({"method": "POST", "path": "/", "query": "", "headers": {}}).encode()
+        assert client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, "c1", start))) is None  # type: ignore
+        await started.wait()
+        congested = client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, "c1", b"12345")))  # type: ignore
+        assert congested is not None
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, "c1")))  # type: ignore
+        release.set()
+        await asyncio.wait_for(congested._wait_drained(), 1)
+        assert flow.buffered_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_stream_over_budget_is_rejected(self, make_client, ws):
+        """Une requête en attente de slot ne peut pas bufferiser au-delà du budget global."""
+        from slimfaas_client._concurrency import ConcurrencyLimiter
+
+        flow = SyncBodyFlowControl(high_watermark=100, low_watermark=10, max_buffered_bytes=8)
+        client = make_client(flow_control=flow, concurrency=ConcurrencyLimiter(sync_requests=1))
+        release = asyncio.Event()
+        seen: list[str] = []
+
+        async def handler(req) -> None:
+            seen.append(req.correlation_id)
+            await release.wait()
+
+        client.on_sync_request(handler)
+        start = json.dumps({"method": "POST", "path": "/", "query": "", "headers": {}}).encode()
+        for cid in ("c1", "c2"):
+            client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, cid, start)))  # type: ignore
+        await asyncio.sleep(0)
+        assert client.concurrency.sync_requests.queued == 1
+
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, "c2", b"x" * 5)))  # type: ignore
+        assert flow.buffered_bytes == 5
+        assert client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, "c2", b"x" * 5))) is None  # type: ignore
+        assert flow.buffered_bytes == 0
+        assert "c2" not in client._pending_sync_bodies
+
+        release.set()
+        for _ in range(3):
+            for task in list(client.concurrency.sync_requests._tasks) + list(client._background_tasks):
+                await task
+        assert seen == ["c1"]
+        frames = [BinaryFrame.decode(bytes(m)) for m in ws.sent]
+        rejected = [f for f in frames if f[1] == "c2" and f[0] == MessageType.SYNC_RESPONSE_START]
+        assert json.loads(bytes(rejected[0][3]))["statusCode"] == 503
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("read", ["readall", "readexactly", "readuntil"])
+    async def test_body_over_watermark_read_at_once(self, make_client, ws, read):
+        """Un handler qui attend tout le corps ne bloque pas la boucle de lecture au-delà du seuil."""
+        flow = SyncBodyFlowControl(high_watermark=1024, low_watermark=256, max_buffered_bytes=1024 * 1024)
+        client = make_client(flow_control=flow)
+        body = b"x" * 10 * 1024 + b"\n"
+        received: list[bytes] = []
+
+        async def handler(req) -> None:
+            if read == "readall":
+                received.append(await req.body.readall())
+            elif read == "readexactly":
+                received.append(await req.body.readexactly(len(body)))
+            else:
+                received.append(await req.body.readuntil(b"\n"))
+
+        client.on_sync_request(handler)
+        start = json.dumps({"method": "POST", "path": "/", "query": "", "headers": {}}).encode()
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, "c1", start)))  # type: ignore
+        await asyncio.sleep(0)
+        for i in range(0, len(body), 512):
+            frame = BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, "c1", body[i:i + 512])
+            congested = client._handle_binary_frame(ws, bytes(frame))  # type: ignore
+            if congested is not None:
+                await asyncio.wait_for(congested._wait_drained(), 1)
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, "c1")))  # type: ignore
+        for task in list(client.concurrency.sync_requests._tasks):
+            await asyncio.wait_for(task, 1)
+        assert received == [body]
+        assert flow.buffered_bytes == 0
+
+
 class TestSlimFaasClientConfig:
     def test_to_register_payload(self):
         config = make_config(
@@ -153,7 +447,7 @@ class MockWebSocket:
         self._messages = iter(messages)
         self.sent: list[str] = []
 
-    async def send(self, data: str) -> None:
+    async def send(self, data: str, text: bool | None = None) -> None:
         self.sent.append(data)
 
     def __aiter__(self):
@@ -294,3 +588,22 @@ class TestSlimFaasClientDispatch:
         # Aucun callback automatique
         assert len(ws.sent) == 0
 
+
+    @pytest.mark.asyncio
+    async def test_sync_response_large_chunk_sent_as_fragments(self):
+        """Les gros chunks partent en fragments [en-tête, payload] sans copie."""
+        import array
+        config = make_config()
+        client = SlimFaasClient("ws://fake", config)
+        ws = MockWebSocket([])
+        client._ws = ws  # type: ignore[assignment]
+
+        small = array.array("d", [1.0, 2.0])
+        await client.send_sync_response_chunk("c1", small)
+        big = bytearray(BinaryFrame.FRAGMENT_THRESHOLD)
+        await client.send_sync_response_chunk("c1", big)
+
+        assert bytes(ws.sent[0][BinaryFrame.HEADER_SIZE:]) == small.tobytes()
+        header, payload = ws.sent[1]
+        assert BinaryFrame.decode_header(header)[3] == len(big)
+        assert payload is big
@@ -0,0 +1,179 @@
+"""
+Tests de la compression des réponses synchrones (ResponseCompression).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+
+import pytest
+
+from slimfaas_client._compression import ResponseCompression
+from slimfaas_client._models import BinaryFrame, MessageType, SyncResponseWriter
+
+
+class Recorder:
+    def __init__(self):
+        self.status = None
+        self.headers: dict = {}
+        self.chunks: list[bytes] = []
+        self.ended = False
+
+    async def start(self, corr, response) -> None:
+        self.status = response.status_code
+        self.headers = response.headers
+
+    async def chunk(self, corr, data) -> None:
+        self.chunks.append(bytes(data))
+
+    async def end(self, corr) -> None:
+        self.ended = True
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+
+def make_writer(compression: ResponseCompression, accept: str = "gzip", method: str = "GET"):
+    rec = Recorder()
+    compressed = compression.for_request(method, {"Accept-Encoding": [accept]}, rec.start, rec.chunk, rec.end)
+    if compressed is None:
+        return SyncResponseWriter("c" * 36, rec.start, rec.chunk, rec.end), rec
+    writer = SyncResponseWriter(
+        "c" * 36, compressed.start, compressed.chunk, compressed.end, send_flush=compressed.flush
+    )
+    return writer, rec
+
+
+PAYLOAD = json.dumps([{"id": i, "name": f"item-{i}"} for i in range(500)]).encode()
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("gzip, deflate", "gzip"),
+            ("deflate", None),
+            ("gzip;q=0", None),
+            ("*", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("", None),
+        ],
+    )
+    def test_negotiate(self, accept, expected):
+        assert ResponseCompression(encodings=("gzip",)).negotiate(accept) == expected
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            ResponseCompression(encodings=("zstd",))
+
+
+class TestCompressedResponse:
+    @pytest.mark.asyncio
+    async def test_streaming_gzip(self):
+        compression = ResponseCompression(encodings=("gzip",))
+        writer, rec = make_writer(compression)
+
+        await writer.start(200, {"Content-Type": ["application/json"]})
+        for i in range(0, len(PAYLOAD), 1000):
+            await writer.write(PAYLOAD[i:i + 1000])
+        await writer.complete()
+
+        assert rec.headers["Content-Encoding"] == ["gzip"]
+        assert rec.headers["Vary"] == ["Accept-Encoding"]
+        assert gzip.decompress(rec.body) == PAYLOAD
+        assert rec.ended
+        snapshot = compression.snapshot()
+        assert snapshot["compressed"] == 1
+        assert snapshot["bytes_in"] == len(PAYLOAD)
+        assert snapshot["ratio"] < 0.5
+
+    @pytest.mark.asyncio
+    async def test_flush_emits_decodable_bytes(self):
+        """Après flush(), le client peut décompresser tout ce qui a été écrit."""
+        writer, rec = make_writer(ResponseCompression(encodings=("gzip",), min_size=1024))
+        decoder = zlib.decompressobj(31)
+
+        await writer.write(b"event: 1\n\n")
+        await writer.flush()
+        assert rec.headers["Content-Encoding"] == ["gzip"]
+        assert decoder.decompress(rec.body) == b"event: 1\n\n"
+
+        sent = len(rec.body)
+        await writer.write(b"event: 2\n\n")
+        await writer.flush()
+        assert decoder.decompress(rec.body[sent:]) == b"event: 2\n\n"
+
+        await writer.complete()
+        assert gzip.decompress(rec.body) == b"event: 1\n\nevent: 2\n\n"
+
+    @pytest.mark.asyncio
+    async def test_small_body_sent_uncompressed(self):
+        writer, rec = make_writer(ResponseCompression(encodings=("gzip",), min_size=1024))
+        await writer.write(b"tiny")
+        await writer.complete()
+        assert "Content-Encoding" not in rec.headers
+        assert rec.body == b"tiny"
+
+    @pytest.mark.asyncio
+    async def test_known_length_drops_content_length(self):
+        writer, rec = make_writer(ResponseCompression(encodings=("gzip",)))
+        await writer.start(200, {"Content-Length": [str(len(PAYLOAD))]})
+        await writer.write(PAYLOAD)
+        await writer.complete()
+        assert "Content-Length" not in rec.headers
+        assert gzip.decompress(rec.body) == PAYLOAD
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"Content-Type": ["image/png"]},
+            {"Content-Type": ["application/zip"]},
+            {"Content-Encoding": ["br"]},
+        ],
+    )
+    async def test_incompressible_responses_untouched(self, headers):
+        writer, rec = make_writer(ResponseCompression(encodings=("gzip",), min_size=0))
+        await writer.start(200, headers)
+        await writer.write(PAYLOAD)
+        await writer.complete()
+        assert rec.headers == headers
+        assert rec.body == PAYLOAD
+
+    @pytest.mark.asyncio
+    async def test_large_chunks_offloaded(self):
+        writer, rec = make_writer(ResponseCompression(encodings=("gzip",), offload_threshold=1))
+        await writer.write(PAYLOAD)
+        await writer.complete()
+        assert gzip.decompress(rec.body) == PAYLOAD
+
+    def test_head_request_not_compressed(self):
+        compression = ResponseCompression(encodings=("gzip",))
+        assert compression.for_request("HEAD", {"Accept-Encoding": ["gzip"]}, None, None, None) is None
+
+
+class TestClientCompression:
+    @pytest.mark.asyncio
+    async def test_handler_unchanged_response_compressed(self, make_client, ws):
+        """Le handler écrit du texte brut ; le client compresse selon Accept-Encoding."""
+        client = make_client(response_compression=ResponseCompression(encodings=("gzip",)))
+
+        async def handler(req) -> None:
+            await req.response.write(PAYLOAD)
+
+        client.on_sync_request(handler)
+        corr = "d" * 36
+        start = json.dumps({"method": "GET", "path": "/", "query": "", "headers": {"Accept-Encoding": ["gzip"]}})
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start.encode())))  # type: ignore[arg-type]
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+        for task in list(client.concurrency.sync_requests._tasks):
+            await task
+
+        frames = [BinaryFrame.decode(bytes(m) if not isinstance(m, list) else b"".join(m)) for m in ws.sent]
+        start_frame = json.loads(bytes(frames[0][3]))
+        assert start_frame["headers"]["Content-Encoding"] == ["gzip"]
+        body = b"".join(bytes(f[3]) for f in frames if f[0] == MessageType.SYNC_RESPONSE_CHUNK)
+        assert gzip.decompress(body) == PAYLOAD
@@ -0,0 +1,135 @@
+"""
+Tests du contrôle d'admission (ConcurrencyLimiter).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._concurrency import ConcurrencyBudget, ConcurrencyLimiter
+from slimfaas_client._models import MessageType, SlimFaasClientConfig
+
+
+def make_envelope(msg_type: int, payload: dict) -> str:
+    return json.dumps({"type": msg_type, "correlationId": "c", "payload": payload})
+
+
+def async_payload(element_id: str) -> dict:
+    return {
+        "elementId": element_id,
+        "method": "POST",
+        "path": "/",
+        "query": "",
+        "headers": {},
+        "body": None,
+        "isLastTry": False,
+        "tryNumber": 1,
+    }
+
+
+class TestConcurrencyBudget:
+    @pytest.mark.asyncio
+    async def test_limits_in_flight_and_queues_excess(self):
+        budget = ConcurrencyBudget(limit=2, max_queued=10)
+        release = asyncio.Event()
+        started: list[int] = []
+
+        def work(i: int):
+            async def run() -> None:
+                started.append(i)
+                await release.wait()
+            return run
+
+        for i in range(5):
+            assert budget.submit(work(i))
+        await asyncio.sleep(0)
+
+        assert started == [0, 1]
+        assert budget.in_flight == 2
+        assert budget.queued == 3
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert started == [0, 1, 2, 3, 4]
+        assert budget.in_flight == 0
+        assert budget.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        budget = ConcurrencyBudget(limit=1, max_queued=1)
+        release = asyncio.Event()
+
+        async def run() -> None:
+            await release.wait()
+
+        assert budget.submit(run)
+        assert budget.submit(run)
+        assert not budget.submit(run)
+        assert budget.rejected == 1
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert budget.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_releases_slot(self):
+        budget = ConcurrencyBudget(limit=1)
+        done = asyncio.Event()
+
+        async def boom() -> None:
+            raise ValueError("boom")
+
+        async def ok() -> None:
+            done.set()
+
+        budget.submit(boom)
+        budget.submit(ok)
+        await asyncio.wait_for(done.wait(), 1)
+        assert budget.in_flight <= 1
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            ConcurrencyBudget(limit=0)
+
+
+class TestConcurrencyLimiter:
+    def test_from_config_uses_number_parallel_request_per_pod(self):
+        config = SlimFaasClientConfig(function_name="f", number_parallel_request_per_pod=3)
+        limiter = ConcurrencyLimiter.from_config(config)
+        snapshot = limiter.snapshot()
+        assert snapshot["async_requests"]["limit"] == 3
+        assert snapshot["publish_events"]["limit"] == 3
+        assert snapshot["sync_requests"]["limit"] == 3
+
+    @pytest.mark.asyncio
+    async def test_client_rejects_async_request_with_503_when_full(self, make_client, ws):
+        """Au-delà de la file d'attente, l'AsyncRequest reçoit un callback 503."""
+        limiter = ConcurrencyLimiter(async_requests=1, max_queued=0)
+        client = make_client(concurrency=limiter)
+        release = asyncio.Event()
+
+        async def handler(req) -> int:
+            await release.wait()
+            return 200
+
+        client.on_async_request(handler)
+
+        await client._handle_message(ws, make_envelope(MessageType.ASYNC_REQUEST, async_payload("e1")))  # type: ignore
+        await client._handle_message(ws, make_envelope(MessageType.ASYNC_REQUEST, async_payload("e2")))  # type: ignore
+        await asyncio.sleep(0)
+
+        assert limiter.in_flight == 1
+        assert len(ws.sent) == 1
+        rejected = json.loads(ws.sent[0])
+        assert rejected["payload"] == {"elementId": "e2", "statusCode": 503}
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert json.loads(ws.sent[1])["payload"] == {"elementId": "e1", "statusCode": 200}
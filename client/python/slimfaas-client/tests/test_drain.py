@@ -0,0 +1,136 @@
+"""
+Tests du mode drain (arrêt gracieux pour les déploiements progressifs).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType, SlimFaasClientConfig
+from slimfaas_client._pool import SlimFaasClientPool
+
+
+@pytest.fixture
+def client(make_client) -> SlimFaasClient:
+    client = make_client()
+    client._running = True
+    return client
+
+
+def async_request(element_id: str) -> str:
+    return json.dumps({
+        "type": MessageType.ASYNC_REQUEST,
+        "correlationId": element_id,
+        "payload": {"elementId": element_id, "method": "POST", "path": "/", "query": "", "headers": {}},
+    })
+
+
+def callbacks(ws) -> dict[str, int]:
+    messages = [json.loads(m) for m in ws.sent]
+    return {m["payload"]["elementId"]: m["payload"]["statusCode"] for m in messages if m["type"] == MessageType.ASYNC_CALLBACK}
+
+
+class TestDrain:
+    @pytest.mark.asyncio
+    async def test_waits_for_in_flight_handler(self, client, ws):
+        release = asyncio.Event()
+
+        async def handler(req) -> int:
+            await release.wait()
+            return 200
+
+        client.on_async_request(handler)
+        await client._handle_message(ws, async_request("e1"))  # type: ignore[arg-type]
+        await asyncio.sleep(0)
+
+        drain = asyncio.create_task(client.drain(timeout=5))
+        await asyncio.sleep(0.01)
+        assert client.is_draining
+        assert not drain.done()
+        assert not ws.closed
+
+        release.set()
+        assert await drain is True
+        assert callbacks(ws) == {"e1": 200}
+        assert ws.closed
+
+    @pytest.mark.asyncio
+    async def test_new_requests_refused_with_503(self, client, ws):
+        called: list[str] = []
+
+        async def handler(req) -> int:
+            called.append(req.element_id)
+            return 200
+
+        client.on_async_request(handler)
+        client._draining = True
+        await client._handle_message(ws, async_request("late"))  # type: ignore[arg-type]
+
+        assert called == []
+        assert callbacks(ws) == {"late": 503}
+
+    @pytest.mark.asyncio
+    async def test_new_sync_request_refused_with_503(self, client, ws):
+        client.on_sync_request(lambda req: None)
+        client._draining = True
+        start = json.dumps({"method": "GET", "path": "/", "query": "", "headers": {}}).encode()
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, "s" * 36, start)))  # type: ignore[arg-type]
+        for task in list(client._background_tasks):
+            await task
+
+        frame = BinaryFrame.decode(bytes(ws.sent[0]))
+        assert frame[0] == MessageType.SYNC_RESPONSE_START
+        assert json.loads(bytes(frame[3]))["statusCode"] == 503
+        assert client._pending_sync_bodies == {}
+
+    @pytest.mark.asyncio
+    async def test_waits_for_deferred_callback(self, client, ws):
+        client._deferred_callbacks.add("long")
+
+        drain = asyncio.create_task(client.drain(timeout=5))
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+
+        await client.send_callback("long", 200)
+        assert await drain is True
+        assert callbacks(ws) == {"long": 200}
+
+    @pytest.mark.asyncio
+    async def test_timeout_closes_anyway(self, client, ws):
+        client._deferred_callbacks.add("never")
+
+        assert await client.drain(timeout=0.05) is False
+        assert ws.closed
+        assert not client._running
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name == "nt", reason="add_signal_handler n'existe pas sous Windows")
+    async def test_sigterm_triggers_drain(self, client, ws):
+        client.drain_on_signals(timeout=1, signals=(signal.SIGUSR1,))
+        try:
+            os.kill(os.getpid(), signal.SIGUSR1)
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if ws.closed:
+                    break
+            assert client.is_draining
+            assert ws.closed
+        finally:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+
+class TestPoolDrain:
+    @pytest.mark.asyncio
+    async def test_drains_every_connection(self, connect):
+        pool = SlimFaasClientPool("ws://fake", SlimFaasClientConfig(function_name="f"), size=2)
+        sockets = [connect(client, None) for client in pool.clients]
+
+        assert await pool.drain(timeout=1) is True
+        assert all(c.is_draining for c in pool.clients)
+        assert all(ws.closed for ws in sockets)
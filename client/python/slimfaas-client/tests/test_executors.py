@@ -0,0 +1,179 @@
+"""
+Tests des modes d'exécution hors boucle d'événements.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from slimfaas_client._executors import ProcessPoolHandler
+from slimfaas_client._models import AsyncRequest
+
+
+def body_checksum(req: AsyncRequest) -> int:
+    """Exécuté dans un processus worker."""
+    if req.body is None:
+        return 204
+    assert os.getpid() != PARENT_PID
+    return 200 + sum(req.body[:10]) % 100
+
+
+def failing(req: AsyncRequest) -> int:
+    raise ValueError("boom")
+
+
+PARENT_PID = os.getpid()
+
+
+def make_request(body: bytes | None) -> AsyncRequest:
+    return AsyncRequest(
+        element_id="e1", method="POST", path="/", query="",
+        headers={}, body=body, is_last_try=False, try_number=1,
+    )
+
+
+class TestProcessPoolHandler:
+    @pytest.mark.asyncio
+    async def test_small_and_shared_memory_bodies(self):
+        handler = ProcessPoolHandler(body_checksum, workers=2, shared_memory_threshold=1024)
+        await handler.startup()
+        try:
+            # Chaque worker est lancé par startup(), pas à la première requête.
+            assert len(handler._executor._processes) == 2  # type: ignore[union-attr]
+            assert await handler(make_request(None)) == 204
+            small = bytes(range(10))
+            assert await handler(make_request(small)) == 200 + sum(small) % 100
+            large = bytes([7]) * 4096
+            req = make_request(large)
+            assert await handler(req) == 200 + 70
+            # Le message d'origine n'est pas modifié
+            assert req.body == large
+        finally:
+            await handler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates(self):
+        handler = ProcessPoolHandler(failing, workers=1)
+        try:
+            with pytest.raises(ValueError):
+                await handler(make_request(b"x"))
+        finally:
+            await handler.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_client_runs_startup_and_shutdown_hooks(self):
+        """Le client démarre les workers avant de se connecter et les arrête à la fermeture."""
+        from slimfaas_client._client import SlimFaasClient
+        from slimfaas_client._models import SlimFaasClientConfig
+
+        handler = ProcessPoolHandler(body_checksum, workers=1)
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        client.on_async_request(handler)
+
+        await client._run_handler_hooks("startup")
+        assert handler._executor is not None
+        await client.close()
+        assert handler._executor is None
+
+
+class TestThreadPoolHandler:
+    @pytest.mark.asyncio
+    async def test_blocking_async_request_handler(self, make_client, ws):
+        """Une fonction bloquante passée à on_async_request tourne dans un thread."""
+        import asyncio
+        import json
+        import threading
+
+        threads: list[str] = []
+
+        def handler(req: AsyncRequest) -> int:
+            threads.append(threading.current_thread().name)
+            return 201
+
+        client = make_client(handler_threads=2)
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request(None))  # type: ignore
+        await asyncio.sleep(0)
+
+        assert threads and threads[0].startswith("slimfaas-handler")
+        assert json.loads(ws.sent[0])["payload"]["statusCode"] == 201
+
+        thread_pool = client._thread_pool
+        await client.close()
+        assert client._thread_pool is None
+        assert thread_pool._shutdown  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_blocking_sync_request_bridges_body_and_response(self):
+        import asyncio
+
+        from slimfaas_client._executors import ThreadPoolHandler
+        from slimfaas_client._models import SyncBodyStream, SyncRequest, SyncResponseWriter
+
+        sent: list = []
+
+        async def send_start(cid, response):
+            sent.append(("start", response.status_code))
+
+        async def send_chunk(cid, chunk):
+            sent.append(("chunk", bytes(chunk)))
+
+        async def send_end(cid):
+            sent.append(("end",))
+
+        body = SyncBodyStream()
+        body._feed(b"hello ")
+        body._feed(b"world")
+        body._close()
+        req = SyncRequest(
+            correlation_id="c1", method="POST", path="/", query="", headers={},
+            body=body, response=SyncResponseWriter("c1", send_start, send_chunk, send_end),
+        )
+
+        def handler(r: SyncRequest) -> None:
+            first = r.body.read(6)
+            rest = r.body.read()
+            r.response.start(201, {})
+            r.response.write(rest + b" " + first)
+            r.response.complete()
+
+        wrapped = ThreadPoolHandler(handler, workers=1)
+        try:
+            await wrapped(req)
+        finally:
+            await wrapped.shutdown()
+
+        assert sent == [("start", 201), ("chunk", b"world hello "), ("end",)]
+
+    @pytest.mark.asyncio
+    async def test_plain_callable_returning_coroutine(self, make_client, ws):
+        """Une lambda qui renvoie une coroutine reste prise en charge : le résultat est attendu."""
+        import json
+
+        async def handle(req: AsyncRequest, code: int) -> int:
+            return 200 + code
+
+        client = make_client()
+        client.on_async_request(lambda req: handle(req, 1))
+        await client._dispatch_async_request(ws, make_request(None))  # type: ignore
+        assert json.loads(ws.sent[0])["payload"]["statusCode"] == 201
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_blocking_reader_readinto_returns_available_bytes(self):
+        """readinto n'attend pas que le tampon soit plein : io.BufferedReader ne bloque pas."""
+        import asyncio
+
+        from slimfaas_client._executors import BlockingBodyReader
+        from slimfaas_client._models import SyncBodyStream
+
+        body = SyncBodyStream()
+        body._feed(b"abc")
+        reader = BlockingBodyReader(body, asyncio.get_running_loop())
+        buffer = bytearray(16)
+        assert await asyncio.to_thread(reader.readinto, buffer) == 3
+        assert bytes(buffer[:3]) == b"abc"
+        body._close()
+        assert await asyncio.to_thread(reader.readinto, buffer) == 0
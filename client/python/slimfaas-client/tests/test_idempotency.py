@@ -0,0 +1,207 @@
+"""
+Tests du cache d'idempotence des requêtes asynchrones (IdempotencyCache).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from slimfaas_client._idempotency import IdempotencyCache
+from slimfaas_client._models import AsyncRequest, MessageType
+
+
+def make_request(element_id: str, try_number: int = 1) -> AsyncRequest:
+    return AsyncRequest.from_payload({
+        "elementId": element_id,
+        "method": "POST",
+        "path": "/work",
+        "query": "",
+        "headers": {},
+        "tryNumber": try_number,
+    })
+
+
+def callbacks(ws) -> list[tuple[str, int]]:
+    messages = [json.loads(m) for m in ws.sent]
+    return [
+        (m["payload"]["elementId"], m["payload"]["statusCode"])
+        for m in messages
+        if m["type"] == MessageType.ASYNC_CALLBACK
+    ]
+
+
+class TestIdempotencyCache:
+    def test_lru_eviction(self):
+        cache = IdempotencyCache(max_entries=2)
+        cache.put("a", 200)
+        cache.put("b", 200)
+        assert cache.get("a") == 200  # "a" devient le plus récent
+        cache.put("c", 200)
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        cache = IdempotencyCache(ttl=10)
+        cache.put("a", 200)
+        now = time.time()
+        monkeypatch.setattr("slimfaas_client._idempotency.time.time", lambda: now + 11)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_deferred_entries_expire(self, monkeypatch):
+        """Un 202 dont le callback n'arrive jamais expire et reste borné."""
+        cache = IdempotencyCache(max_entries=2, ttl=10)
+        cache.put("a", 202)
+        cache.put("b", 202)
+        cache.put("c", 202)
+        assert not cache.is_running("a")
+        assert cache.snapshot()["evictions"] == 1
+        now = time.time()
+        monkeypatch.setattr("slimfaas_client._idempotency.time.time", lambda: now + 11)
+        assert cache.lookup("b") is None
+        assert not cache.is_running("c")
+        assert len(cache._deferred) == 0
+
+    def test_failures_not_cached(self):
+        cache = IdempotencyCache()
+        cache.put("a", 500)
+        cache.put("b", 202)
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.is_running("b")
+
+    def test_on_disk_backend(self, tmp_path):
+        path = str(tmp_path / "done")
+        cache = IdempotencyCache(path=path)
+        cache.put("a", 200)
+        cache.put("b", 204)
+        cache.close()
+
+        reloaded = IdempotencyCache(path=path)
+        assert reloaded.get("a") == 200
+        assert reloaded.get("b") == 204
+        reloaded.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_redelivery_attaches(self):
+        cache = IdempotencyCache()
+        release = asyncio.Event()
+        calls = 0
+
+        async def attempt() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 200
+
+        first = asyncio.create_task(cache.run("a", attempt))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.run("a", attempt))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == 200
+        assert await second == 200
+        assert calls == 1
+        assert cache.snapshot() == {"entries": 1, "hits": 0, "attached": 1, "misses": 1, "evictions": 0}
+
+
+class TestClientIdempotency:
+    @pytest.mark.asyncio
+    async def test_redelivery_answered_from_cache(self, make_client, ws):
+        client = make_client(idempotency=IdempotencyCache())
+        calls: list[int] = []
+
+        async def handler(req: AsyncRequest) -> int:
+            calls.append(req.try_number)
+            return 200
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request("e1", 1))  # type: ignore[arg-type]
+        await client._dispatch_async_request(ws, make_request("e1", 2))  # type: ignore[arg-type]
+
+        assert calls == [1]
+        assert callbacks(ws) == [("e1", 200), ("e1", 200)]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_retried(self, make_client, ws):
+        client = make_client(idempotency=IdempotencyCache())
+        calls: list[int] = []
+
+        async def handler(req: AsyncRequest) -> int:
+            calls.append(req.try_number)
+            return 500 if req.try_number == 1 else 200
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request("e1", 1))  # type: ignore[arg-type]
+        await client._dispatch_async_request(ws, make_request("e1", 2))  # type: ignore[arg-type]
+
+        assert calls == [1, 2]
+        assert callbacks(ws) == [("e1", 500), ("e1", 200)]
+
+    @pytest.mark.asyncio
+    async def test_redelivery_of_deferred_request(self, make_client, ws):
+        """Une redélivrance après un 202 attend le send_callback() du premier essai."""
+        client = make_client(idempotency=IdempotencyCache())
+        calls = 0
+
+        async def handler(req: AsyncRequest) -> int:
+            nonlocal calls
+            calls += 1
+            return 202
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request("long", 1))  # type: ignore[arg-type]
+        await client._dispatch_async_request(ws, make_request("long", 2))  # type: ignore[arg-type]
+        assert calls == 1
+        assert callbacks(ws) == []
+
+        await client.send_callback("long", 200)
+        assert callbacks(ws) == [("long", 200)]
+        assert client.idempotency.get("long") == 200  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio
+    async def test_redelivery_answered_before_concurrency_slot(self, make_client, ws):
+        """Une redélivrance déjà traitée n'attend pas qu'un slot se libère."""
+        from slimfaas_client._concurrency import ConcurrencyLimiter
+
+        cache = IdempotencyCache()
+        cache.put("done", 200)
+        client = make_client(idempotency=cache, concurrency=ConcurrencyLimiter(async_requests=1))
+        release = asyncio.Event()
+
+        async def handler(req: AsyncRequest) -> int:
+            await release.wait()
+            return 200
+
+        client.on_async_request(handler)
+        for element_id in ("busy", "done"):
+            message = json.dumps({
+                "type": MessageType.ASYNC_REQUEST,
+                "correlationId": element_id,
+                "payload": {"elementId": element_id, "method": "POST", "path": "/", "query": "",
+                            "headers": {}, "tryNumber": 2},
+            })
+            await client._handle_message(ws, message)  # type: ignore[arg-type]
+
+        assert callbacks(ws) == [("done", 200)]
+        assert client.concurrency.async_requests.queued == 0
+        release.set()
+        for task in list(client.concurrency.async_requests._tasks):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_on_disk_cache(self, make_client, tmp_path):
+        path = str(tmp_path / "done")
+        client = make_client(idempotency=IdempotencyCache(path=path))
+        await client.send_callback("e1", 200)
+        await client.close()
+
+        reloaded = IdempotencyCache(path=path)
+        assert reloaded.get("e1") == 200
+        reloaded.close()
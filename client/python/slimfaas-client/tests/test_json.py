@@ -0,0 +1,67 @@
+"""
+Tests des codecs JSON.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from slimfaas_client._json import (
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    default_json_codec,
+)
+from slimfaas_client._models import MessageType
+
+
+def available_codecs():
+    codecs = [StdlibJsonCodec()]
+    for codec in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            codecs.append(codec())
+        except ImportError:
+            pass
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda c: c.name)
+class TestJsonCodecs:
+    def test_roundtrip(self, codec):
+        message = {
+            "type": MessageType.ASYNC_CALLBACK,
+            "correlationId": "é-1",
+            "payload": {"elementId": "é-1", "statusCode": 200},
+        }
+        encoded = codec.dumps(message)
+        assert isinstance(encoded, bytes)
+        decoded = codec.loads(encoded)
+        assert decoded == {
+            "type": 3,
+            "correlationId": "é-1",
+            "payload": {"elementId": "é-1", "statusCode": 200},
+        }
+
+    def test_loads_str_and_memoryview(self, codec):
+        assert codec.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+        assert codec.loads(memoryview(b'{"a": null}')) == {"a": None}
+
+    def test_invalid_json_raises_value_error(self, codec):
+        with pytest.raises(ValueError):
+            codec.loads("{not json")
+
+
+def test_default_codec_prefers_fast_implementation():
+    codec = default_json_codec()
+    try:
+        import orjson  # noqa: F401
+        assert codec.name == "orjson"
+    except ImportError:
+        assert codec.name in ("msgspec", "json")
+
+
+def test_codec_interface_is_abstract():
+    from slimfaas_client._json import JsonCodec
+
+    with pytest.raises(TypeError):
+        JsonCodec()  # type: ignore[abstract]
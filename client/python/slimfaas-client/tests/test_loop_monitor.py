@@ -0,0 +1,105 @@
+"""
+Tests du moniteur de latence de la boucle d'événements (LoopMonitor).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._loop_monitor import LoopMonitor
+from slimfaas_client._metrics import ClientMetrics
+from slimfaas_client._models import AsyncRequest
+
+
+def make_request(element_id: str = "e1", path: str = "/resize") -> AsyncRequest:
+    return AsyncRequest.from_payload({"elementId": element_id, "method": "POST", "path": path, "query": "", "headers": {}})
+
+
+async def monitored(make_client, monitor: LoopMonitor, handler) -> SlimFaasClient:
+    client = make_client(loop_monitor=monitor)
+    client.on_async_request(handler)
+    await monitor.start(client._metrics)
+    return client
+
+
+class TestLoopMonitor:
+    @pytest.mark.asyncio
+    async def test_blocking_handler_reported_with_stack(self, make_client, ws):
+        monitor = LoopMonitor(interval=0.02, lag_threshold=0.05, slow_handler_threshold=None)
+
+        async def blocking_handler(req) -> int:
+            time.sleep(0.3)  # bloque la boucle
+            return 200
+
+        client = await monitored(make_client, monitor, blocking_handler)
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.create_task(client._dispatch_async_request(ws, make_request()))  # type: ignore[arg-type]
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+        metrics = client.metrics()
+        assert metrics["loop_stalls"] >= 1
+        assert metrics["loop_lag_seconds"]["count"] > 0
+        report = next(r for r in metrics["slow_reports"] if r["kind"] == "loop_stall")
+        assert report["seconds"] >= 0.2
+        assert (report["message"], report["id"], report["path"]) == ("async_request", "e1", "/resize")
+        assert "blocking_handler" in report["stack"]
+
+    @pytest.mark.asyncio
+    async def test_slow_async_handler_reported_once(self, make_client, ws):
+        monitor = LoopMonitor(interval=0.01, lag_threshold=1.0, slow_handler_threshold=0.05)
+
+        async def slow_handler(req) -> int:
+            await asyncio.sleep(0.2)
+            return 200
+
+        client = await monitored(make_client, monitor, slow_handler)
+        try:
+            task = asyncio.create_task(client._dispatch_async_request(ws, make_request("e2", "/slow")))  # type: ignore[arg-type]
+            await asyncio.sleep(0.1)
+            assert monitor.running_handlers == 1
+            await task
+        finally:
+            await monitor.stop()
+
+        metrics = client.metrics()
+        assert metrics["slow_handlers"] == 1
+        assert metrics["loop_stalls"] == 0
+        (report,) = metrics["slow_reports"]
+        assert (report["kind"], report["id"], report["path"]) == ("slow_handler", "e2", "/slow")
+        assert "slow_handler" in report["stack"]
+        assert monitor.running_handlers == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_monitor_stops_with_last_user(self):
+        monitor = LoopMonitor()
+        metrics = ClientMetrics()
+        await monitor.start(metrics)
+        await monitor.start(metrics)
+        await monitor.stop()
+        assert monitor._task is not None
+        await monitor.stop()
+        assert monitor._task is None
+        assert monitor._stopped.is_set()
+
+    @pytest.mark.asyncio
+    async def test_not_tracking_when_stopped(self, make_client, ws):
+        monitor = LoopMonitor()
+
+        async def handler(req) -> int:
+            return 200
+
+        client = make_client(loop_monitor=monitor)
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request())  # type: ignore[arg-type]
+        assert monitor.running_handlers == 0
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            LoopMonitor(interval=0)
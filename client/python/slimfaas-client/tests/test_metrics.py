@@ -0,0 +1,134 @@
+"""
+Tests des métriques du client (histogrammes à seaux fixes, compteurs, export Prometheus).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._metrics import ClientMetrics, Histogram
+from slimfaas_client._models import BinaryFrame, MessageType, SlimFaasClientConfig
+from slimfaas_client._pool import SlimFaasClientPool
+
+
+async def finish(client: SlimFaasClient) -> None:
+    for budget in (client.concurrency.async_requests, client.concurrency.publish_events, client.concurrency.sync_requests):
+        for task in list(budget._tasks):
+            await task
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert histogram.snapshot() == {"count": 4, "sum": pytest.approx(2.65), "buckets": {0.1: 2, 1.0: 3, math.inf: 4}}
+
+    def test_unsorted_bounds(self):
+        with pytest.raises(ValueError):
+            Histogram((1.0, 0.1))
+
+
+class TestClientMetrics:
+    @pytest.mark.asyncio
+    async def test_async_request_and_event(self, make_client, ws):
+        client = make_client()
+        client.on_async_request(lambda req: 200)
+
+        async def on_event(evt) -> None:
+            pass
+
+        client.on_publish_event(on_event)
+        request = json.dumps({
+            "type": MessageType.ASYNC_REQUEST,
+            "correlationId": "e1",
+            "payload": {"elementId": "e1", "method": "POST", "path": "/", "query": "", "headers": {}},
+        })
+        # Les compteurs sont en octets, pas en caractères.
+        event = json.dumps({
+            "type": MessageType.PUBLISH_EVENT,
+            "correlationId": "p1",
+            "payload": {"eventName": "évènement", "method": "POST", "path": "/", "query": "", "headers": {}},
+        }, ensure_ascii=False)
+        await client._handle_message(ws, request)  # type: ignore[arg-type]
+        await client._handle_message(ws, event)  # type: ignore[arg-type]
+        await finish(client)
+
+        metrics = client.metrics()
+        async_request = metrics["async_request"]
+        for name in ("decode_seconds", "slot_wait_seconds", "handler_seconds", "callback_send_seconds"):
+            assert async_request[name]["count"] == 1, name
+        assert async_request["bytes_in"] == len(request)
+        assert async_request["bytes_out"] == len(ws.sent[0])
+        assert metrics["publish_event"]["handler_seconds"]["count"] == 1
+        assert metrics["publish_event"]["callback_send_seconds"]["count"] == 0
+        assert metrics["publish_event"]["bytes_in"] == len(event.encode()) > len(event)
+
+    @pytest.mark.asyncio
+    async def test_sync_request(self, make_client, ws):
+        client = make_client()
+
+        async def handler(req) -> None:
+            await req.body.readall()
+            await req.response.write(b"0123456789")
+
+        client.on_sync_request(handler)
+        corr = "c" * 36
+        frames = [
+            bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, json.dumps({"method": "POST", "path": "/"}).encode())),
+            bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, corr, b"abc")),
+            bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)),
+        ]
+        for frame in frames:
+            client._handle_binary_frame(ws, frame)  # type: ignore[arg-type]
+        await finish(client)
+
+        sync = client.metrics()["sync_request"]
+        assert sync["decode_seconds"]["count"] == sync["handler_seconds"]["count"] == 1
+        assert sync["bytes_in"] == sum(len(f) for f in frames)
+        assert sync["bytes_out"] == 10
+
+    def test_pool_shares_metrics(self):
+        pool = SlimFaasClientPool("ws://fake", SlimFaasClientConfig(function_name="f"), size=2)
+        for client in pool.clients:
+            client._metrics.reconnects += 1
+        assert pool.metrics()["reconnects"] == 2
+
+    @pytest.mark.asyncio
+    async def test_prometheus_endpoint(self):
+        metrics = ClientMetrics((0.5,), prometheus_port=0)
+        metrics.async_request.handler.observe(0.2)
+        metrics.sync_request.bytes_out = 42
+        metrics.reconnects = 3
+        await metrics.start()
+        try:
+            host, port = metrics.prometheus_address  # type: ignore[misc]
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+            response = (await reader.read()).decode()
+            writer.close()
+        finally:
+            await metrics.stop()
+        assert metrics.prometheus_address is None
+
+        assert response.startswith("HTTP/1.1 200 OK")
+        assert 'slimfaas_client_handler_seconds_bucket{kind="async_request",le="0.5"} 1' in response
+        assert 'slimfaas_client_handler_seconds_bucket{kind="async_request",le="+Inf"} 1' in response
+        assert 'slimfaas_client_handler_seconds_count{kind="async_request"} 1' in response
+        assert 'slimfaas_client_bytes_out_total{kind="sync_request"} 42' in response
+        assert "slimfaas_client_reconnects_total 3" in response
+
+    @pytest.mark.asyncio
+    async def test_prometheus_endpoint_stops_with_last_user(self):
+        metrics = ClientMetrics(prometheus_port=0)
+        await metrics.start()
+        await metrics.start()
+        await metrics.stop()
+        assert metrics.prometheus_address is not None
+        await metrics.stop()
+        assert metrics.prometheus_address is None
@@ -0,0 +1,158 @@
+"""
+Tests de la file d'envoi à écrivain unique (OutboundQueue).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType, SlimFaasClientConfig
+from slimfaas_client._outbound import OutboundQueue, SendPriority
+
+
+class GatedWebSocket:
+    """WebSocket factice dont chaque envoi attend l'ouverture d'une barrière."""
+
+    def __init__(self):
+        self.sent: list = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def send(self, data, text=None) -> None:
+        await self.gate.wait()
+        self.sent.append(data)
+
+
+async def settle(n: int = 10) -> None:
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+class TestOutboundQueue:
+    @pytest.mark.asyncio
+    async def test_control_messages_overtake_bulk(self):
+        ws = GatedWebSocket()
+        queue = OutboundQueue()
+        queue._attach(ws)
+        writer = asyncio.create_task(queue._run())
+
+        ws.gate.clear()
+        await queue.put(b"chunk-0", SendPriority.BULK)
+        await settle()  # chunk-0 est en cours d'envoi
+        await queue.put(b"chunk-1", SendPriority.BULK)
+        await queue.put(b"start", SendPriority.RESPONSE_START)
+        await queue.put(b"callback", SendPriority.CONTROL)
+        assert queue.snapshot()["queued_by_priority"] == {"control": 1, "response_start": 1, "bulk": 1}
+
+        ws.gate.set()
+        await settle()
+        assert ws.sent == [b"chunk-0", b"callback", b"start", b"chunk-1"]
+        assert queue.queued == 0
+        assert queue.snapshot()["sent"] == 4
+
+        writer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_blocks_bulk_writers(self):
+        ws = GatedWebSocket()
+        queue = OutboundQueue(max_buffered_bytes=10)
+        queue._attach(ws)
+        writer = asyncio.create_task(queue._run())
+        ws.gate.clear()
+
+        await queue.put(b"x" * 8, SendPriority.BULK)
+        blocked = asyncio.create_task(queue.put(b"y" * 8, SendPriority.BULK))
+        await settle()
+        assert not blocked.done()
+        assert queue.queued_bytes == 8
+
+        # Les messages de contrôle ne sont jamais bloqués par le budget.
+        await asyncio.wait_for(queue.put(b"ping", SendPriority.CONTROL), 1)
+
+        ws.gate.set()
+        await asyncio.wait_for(blocked, 1)
+        await settle()
+        assert ws.sent == [b"x" * 8, b"ping", b"y" * 8]
+        assert queue.snapshot()["backpressure_waits"] == 1
+        assert queue.queued_bytes == 0
+
+        writer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_detach_releases_blocked_writers(self):
+        ws = GatedWebSocket()
+        queue = OutboundQueue(max_buffered_bytes=4)
+        queue._attach(ws)
+        ws.gate.clear()
+        await queue.put(b"abcd", SendPriority.BULK)
+        blocked = asyncio.create_task(queue.put(b"efgh", SendPriority.BULK))
+        await settle()
+
+        queue._detach()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(blocked, 1)
+        assert queue.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_send_is_counted(self):
+        ws = GatedWebSocket()
+        queue = OutboundQueue(slow_send_threshold=0.0)
+        queue._attach(ws)
+        writer = asyncio.create_task(queue._run())
+        await queue.put(b"data")
+        await settle()
+
+        snapshot = queue.snapshot()
+        assert snapshot["slow_sends"] == 1
+        assert snapshot["stall_seconds"] >= 0.0
+        writer.cancel()
+
+
+class TestClientOutbound:
+    @pytest.mark.asyncio
+    async def test_client_routes_through_attached_queue(self):
+        """Une fois l'écrivain démarré, le client passe par la file et respecte les priorités."""
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        ws = GatedWebSocket()
+        client._ws = ws  # type: ignore[assignment]
+        client._connection_id = "conn"
+        client._outbound._attach(ws)
+        writer = asyncio.create_task(client.outbound._run())
+
+        corr = "c" * 36
+        ws.gate.clear()
+        await client.send_sync_response_chunk(corr, b"body")
+        await settle()
+        await client.send_sync_response_chunk(corr, b"more")
+        await client.send_callback("elem", 200)
+        ws.gate.set()
+        await settle()
+
+        assert BinaryFrame.decode(ws.sent[0])[0] == MessageType.SYNC_RESPONSE_CHUNK
+        assert json.loads(ws.sent[1])["payload"] == {"elementId": "elem", "statusCode": 200}
+        assert bytes(BinaryFrame.decode(ws.sent[2])[3]) == b"more"
+        writer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_queued_writable_buffer_is_not_aliased(self):
+        """Un tampon modifiable réutilisé après write() ne corrompt pas la trame en file."""
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        ws = GatedWebSocket()
+        client._ws = ws  # type: ignore[assignment]
+        client._outbound._attach(ws)
+        writer = asyncio.create_task(client.outbound._run())
+
+        ws.gate.clear()
+        buffer = bytearray(BinaryFrame.FRAGMENT_THRESHOLD)
+        await client.send_sync_response_chunk("c" * 36, buffer)
+        buffer[:] = b"\xff" * len(buffer)
+        ws.gate.set()
+        await settle()
+
+        header, payload = ws.sent[0]
+        assert bytes(payload) == bytes(BinaryFrame.FRAGMENT_THRESHOLD)
+        writer.cancel()
@@ -0,0 +1,185 @@
+"""
+Tests de l'outbox des callbacks et du backoff de reconnexion.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._backoff import ExponentialBackoff
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import AsyncRequest, MessageType, SlimFaasClientConfig
+from slimfaas_client._outbox import CallbackOutbox
+from slimfaas_client._pool import SlimFaasClientPool
+
+
+class ClosedWebSocket:
+    async def send(self, data, text=None) -> None:
+        raise OSError("connection reset")
+
+
+def make_request(element_id: str) -> AsyncRequest:
+    return AsyncRequest(
+        element_id=element_id, method="POST", path="/", query="",
+        headers={}, body=None, is_last_try=False, try_number=1,
+    )
+
+
+class TestCallbackOutbox:
+    @pytest.mark.asyncio
+    async def test_flush_in_order_and_stop_on_failure(self):
+        outbox = CallbackOutbox()
+        outbox.add("a", 200)
+        outbox.add("b", 500)
+        outbox.add("c", 200)
+        sent: list = []
+
+        async def send(element_id: str, status: int) -> None:
+            if element_id == "c":
+                raise RuntimeError("down")
+            sent.append((element_id, status))
+
+        with pytest.raises(RuntimeError):
+            await outbox.flush(send)
+        assert sent == [("a", 200), ("b", 500)]
+        assert len(outbox) == 1 and "c" in outbox
+        assert outbox.snapshot()["replayed"] == 2
+
+    def test_latest_callback_wins_and_oldest_dropped(self):
+        outbox = CallbackOutbox(max_callbacks=2)
+        outbox.add("a", 500)
+        outbox.add("a", 200)
+        outbox.add("b", 200)
+        outbox.add("c", 200)
+        assert "a" not in outbox
+        assert outbox.snapshot() == {"pending": 2, "replayed": 0, "dropped": 1}
+
+    @pytest.mark.asyncio
+    async def test_persisted_to_file(self, tmp_path):
+        path = str(tmp_path / "outbox.json")
+        outbox = CallbackOutbox(path)
+        outbox.add("job-1", 200)
+        await outbox.persist()
+
+        restored = CallbackOutbox(path)
+        assert "job-1" in restored
+
+        async def send(element_id: str, status: int) -> None:
+            pass
+
+        await restored.flush(send)
+        await restored.persist()
+        assert len(CallbackOutbox(path)) == 0
+
+    @pytest.mark.asyncio
+    async def test_file_written_off_the_event_loop(self, tmp_path, monkeypatch):
+        """L'écriture du fichier passe par un thread et regroupe les changements."""
+        path = str(tmp_path / "outbox.json")
+        outbox = CallbackOutbox(path)
+        writes: list = []
+        write = CallbackOutbox._write
+
+        def recording_write(target: str, entries: list) -> None:
+            writes.append(list(entries))
+            write(target, entries)
+
+        monkeypatch.setattr(CallbackOutbox, "_write", staticmethod(recording_write))
+        for element_id in ("a", "b", "c"):
+            outbox.add(element_id, 200)
+        assert writes == []  # rien n'est écrit depuis la boucle
+        await outbox.persist()
+
+        assert writes == [[("a", 200), ("b", 200), ("c", 200)]]
+        assert len(CallbackOutbox(path)) == 3
+
+    def test_take_removes_entry(self):
+        outbox = CallbackOutbox()
+        outbox.add("a", 201)
+        assert outbox.take("a") == 201
+        assert outbox.take("a") is None
+        assert outbox.snapshot()["replayed"] == 1
+
+
+class TestClientOutbox:
+    @pytest.mark.asyncio
+    async def test_send_callback_while_disconnected_is_queued(self):
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        await client.send_callback("long-job", 200)
+        assert "long-job" in client.outbox
+
+    @pytest.mark.asyncio
+    async def test_handler_result_on_dead_connection_is_queued(self):
+        """Le handler se termine après la perte de connexion : le callback va dans l'outbox."""
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+
+        async def handler(req: AsyncRequest) -> int:
+            return 200
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ClosedWebSocket(), make_request("e1"))  # type: ignore[arg-type]
+        assert "e1" in client.outbox
+
+    @pytest.mark.asyncio
+    async def test_callback_dropped_from_outbound_queue_is_requeued(self, make_client, ws):
+        client = make_client()
+        client._outbound._attach(ws)
+
+        await client.send_callback("e2", 200)  # en file, jamais envoyé (pas d'écrivain)
+        client._outbound._detach()
+        assert "e2" in client.outbox
+
+    @pytest.mark.asyncio
+    async def test_replay_after_registration(self, ws):
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        client.outbox.add("e3", 201)
+        sent = await client.outbox.flush(lambda eid, status: client._deliver_callback(ws, eid, status))  # type: ignore[arg-type]
+        assert sent == 1
+        assert json.loads(ws.sent[0])["payload"] == {"elementId": "e3", "statusCode": 201}
+        assert len(client.outbox) == 0
+
+
+    @pytest.mark.asyncio
+    async def test_redelivery_answered_from_outbox(self, make_client, ws):
+        """Une redélivrance d'un élément en attente dans l'outbox n'exécute pas le handler."""
+        client = make_client()
+        client.outbox.add("e4", 201)
+        calls: list = []
+
+        async def handler(req: AsyncRequest) -> int:
+            calls.append(req.element_id)
+            return 500
+
+        client.on_async_request(handler)
+        message = json.dumps({
+            "type": MessageType.ASYNC_REQUEST,
+            "correlationId": "e4",
+            "payload": {"elementId": "e4", "method": "POST", "path": "/", "query": "",
+                        "headers": {}, "tryNumber": 2},
+        })
+        await client._handle_message(ws, message)  # type: ignore[arg-type]
+        await asyncio.sleep(0)
+
+        assert calls == []
+        assert json.loads(ws.sent[-1])["payload"] == {"elementId": "e4", "statusCode": 201}
+        assert "e4" not in client.outbox
+
+    def test_pool_shares_one_outbox(self):
+        pool = SlimFaasClientPool("ws://fake", SlimFaasClientConfig(function_name="f"), size=3)
+        outboxes = {id(client.outbox) for client in pool.clients}
+        assert len(outboxes) == 1
+
+
+class TestExponentialBackoff:
+    def test_grows_and_caps(self):
+        backoff = ExponentialBackoff(initial=1.0, maximum=8.0, jitter=0.0)
+        assert [backoff.next_delay() for _ in range(5)] == [1.0, 2.0, 4.0, 8.0, 8.0]
+        backoff.reset()
+        assert backoff.next_delay() == 1.0
+
+    def test_jitter_stays_in_bounds(self):
+        backoff = ExponentialBackoff(initial=4.0, maximum=4.0, jitter=0.5)
+        delays = [backoff.next_delay() for _ in range(50)]
+        assert all(2.0 <= d <= 4.0 for d in delays)
@@ -0,0 +1,194 @@
+"""
+Tests du pool de connexions (SlimFaasClientPool).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._concurrency import ConcurrencyLimiter
+from slimfaas_client._models import AsyncRequest, MessageType, PublishEvent, SlimFaasClientConfig
+from slimfaas_client._pool import SlimFaasClientPool
+
+
+def make_pool(size: int = 3) -> SlimFaasClientPool:
+    config = SlimFaasClientConfig(function_name="pooled", number_parallel_request_per_pod=4)
+    return SlimFaasClientPool("ws://fake", config, size=size)
+
+
+def publish_event(name: str) -> str:
+    return json.dumps({
+        "type": MessageType.PUBLISH_EVENT,
+        "correlationId": name,
+        "payload": {"eventName": name, "method": "POST", "path": "/", "query": "", "headers": {}},
+    })
+
+
+async def finish(pool: SlimFaasClientPool) -> None:
+    for _ in range(3):
+        for task in list(pool.concurrency.publish_events._tasks):
+            await task
+        await asyncio.sleep(0)
+
+
+class TestSlimFaasClientPool:
+    def test_shares_one_concurrency_budget(self):
+        pool = make_pool(size=3)
+        assert all(c.concurrency is pool.concurrency for c in pool.clients)
+        assert pool.concurrency.async_requests.limit == 12
+
+    @pytest.mark.asyncio
+    async def test_handlers_registered_on_every_connection(self, connect):
+        pool = make_pool(size=2)
+        seen: list[str] = []
+
+        async def handler(req: AsyncRequest) -> int:
+            seen.append(req.element_id)
+            return 200
+
+        pool.on_async_request(handler)
+        for i, client in enumerate(pool.clients):
+            ws = connect(client, f"conn-{i}")
+            req = AsyncRequest(
+                element_id=f"e{i}", method="GET", path="/", query="",
+                headers={}, body=None, is_last_try=False, try_number=1,
+            )
+            await client._dispatch_async_request(ws, req)  # type: ignore
+        assert seen == ["e0", "e1"]
+
+    @pytest.mark.asyncio
+    async def test_publish_event_dispatched_once(self, connect):
+        """Les événements arrivent sur chaque connexion mais ne sont traités qu'une fois."""
+        pool = make_pool(size=3)
+        sockets = [connect(client, f"conn-{i}") for i, client in enumerate(pool.clients)]
+        seen: list[str] = []
+
+        async def handler(evt: PublishEvent) -> None:
+            seen.append(evt.event_name)
+
+        pool.on_publish_event(handler)
+        for client, ws in zip(pool.clients, sockets):
+            await client._handle_message(ws, publish_event("ev"))  # type: ignore[arg-type]
+        # Les copies des autres connexions ne prennent pas de place dans le limiteur.
+        assert pool.concurrency.publish_events.in_flight + pool.concurrency.publish_events.queued == 1
+        await finish(pool)
+        assert seen == ["ev"]
+        assert pool.metrics()["publish_event"]["decode_seconds"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_event_survives_leader_disconnect(self, connect):
+        """Le leader est choisi à la réception : une copie en file reste traitée s'il se déconnecte."""
+        config = SlimFaasClientConfig(function_name="pooled")
+        pool = SlimFaasClientPool("ws://fake", config, size=2, concurrency=ConcurrencyLimiter(publish_events=1))
+        sockets = [connect(client, f"conn-{i}") for i, client in enumerate(pool.clients)]
+        release = asyncio.Event()
+        seen: list[str] = []
+
+        async def handler(evt: PublishEvent) -> None:
+            await release.wait()
+            seen.append(evt.event_name)
+
+        pool.on_publish_event(handler)
+        for name in ("first", "second"):
+            for client, ws in zip(pool.clients, sockets):
+                await client._handle_message(ws, publish_event(name))  # type: ignore[arg-type]
+        assert pool.concurrency.publish_events.queued == 1
+
+        pool.clients[0]._ws = None  # le leader perd sa connexion pendant que "second" attend
+        release.set()
+        await finish(pool)
+        assert seen == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_send_callback_uses_owning_connection(self, connect):
+        pool = make_pool(size=2)
+        ws0 = connect(pool.clients[0], "conn-0")
+        ws1 = connect(pool.clients[1], "conn-1")
+
+        async def handler(req: AsyncRequest) -> int:
+            return 202
+
+        pool.on_async_request(handler)
+        req = AsyncRequest(
+            element_id="long", method="POST", path="/", query="",
+            headers={}, body=None, is_last_try=False, try_number=1,
+        )
+        await pool.clients[1]._dispatch_async_request(ws1, req)  # type: ignore
+        await pool.send_callback("long", 200)
+
+        assert ws0.sent == []
+        assert json.loads(ws1.sent[0])["payload"] == {"elementId": "long", "statusCode": 200}
+        assert not pool.clients[1].owns_callback("long")
+
+    @pytest.mark.asyncio
+    async def test_send_callback_without_connection_goes_to_outbox(self):
+        """Sans connexion, le callback attend dans l'outbox au lieu de lever une erreur."""
+        pool = make_pool(size=2)
+        await pool.send_callback("x", 200)
+        assert "x" in pool.clients[0].outbox
+
+    @pytest.mark.asyncio
+    async def test_handler_hooks_owned_by_pool(self, connect):
+        """Une connexion qui se ferme n'arrête pas un handler encore utilisé par les autres."""
+        pool = make_pool(size=2)
+        ws1 = connect(pool.clients[1], "conn-1")
+
+        class Handler:
+            def __init__(self):
+                self.running = False
+                self.hooks: list[str] = []
+
+            async def startup(self) -> None:
+                self.hooks.append("startup")
+                self.running = True
+
+            async def shutdown(self) -> None:
+                self.hooks.append("shutdown")
+                self.running = False
+
+            async def __call__(self, req: AsyncRequest) -> int:
+                return 200 if self.running else 500
+
+        handler = Handler()
+        pool.on_async_request(handler)
+        await pool._start_handlers()
+        await pool._start_handlers()
+
+        await pool.clients[0].close()
+        req = AsyncRequest(
+            element_id="e1", method="POST", path="/", query="",
+            headers={}, body=None, is_last_try=False, try_number=1,
+        )
+        await pool.clients[1]._dispatch_async_request(ws1, req)  # type: ignore[arg-type]
+        assert json.loads(ws1.sent[-1])["payload"]["statusCode"] == 200
+
+        await pool.close()
+        await pool.close()
+        assert handler.hooks == ["startup", "shutdown"]
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_handler_thread_pool(self):
+        pool = make_pool(size=2)
+        pool.on_async_request(lambda req: 200)
+        thread_pool = pool._thread_pool
+        assert thread_pool is not None
+
+        await pool.close()
+        assert pool._thread_pool is None
+        assert thread_pool._shutdown
+
+    @pytest.mark.asyncio
+    async def test_close_closes_shared_idempotency_cache(self, tmp_path):
+        from slimfaas_client._idempotency import IdempotencyCache
+
+        cache = IdempotencyCache(path=str(tmp_path / "done"))
+        config = SlimFaasClientConfig(function_name="pooled")
+        pool = SlimFaasClientPool("ws://fake", config, size=2, idempotency=cache)
+
+        await pool.clients[0].close()
+        assert cache._db is not None
+        await pool.close()
+        assert cache._db is None
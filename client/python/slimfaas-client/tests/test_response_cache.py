@@ -0,0 +1,176 @@
+"""
+Tests du cache de réponses synchrones (ResponseCache).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType
+from slimfaas_client._response_cache import ResponseCache
+
+
+@pytest.fixture
+def cached_client(make_client):
+    def factory(cache: ResponseCache, headers: dict, body: bytes = b"hello") -> tuple[SlimFaasClient, list[str]]:
+        client = make_client(response_cache=cache)
+        calls: list[str] = []
+
+        async def handler(req) -> None:
+            calls.append(req.path)
+            await req.response.start(200, headers)
+            await req.response.write(body[:2])
+            await req.response.write(body[2:])
+
+        client.on_sync_request(handler)
+        return client, calls
+
+    return factory
+
+
+async def request(client: SlimFaasClient, path: str = "/items", headers: dict | None = None) -> tuple[int, dict, bytes]:
+    """Envoie une requête GET synchrone et renvoie (statut, en-têtes, corps)."""
+    ws = client._ws
+    ws.sent.clear()
+    corr = "c" * 36
+    start = json.dumps({"method": "GET", "path": path, "query": "", "headers": headers or {}}).encode()
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    for task in list(client.concurrency.sync_requests._tasks) + list(client._background_tasks):
+        await task
+
+    frames = [BinaryFrame.decode(bytes(m) if not isinstance(m, list) else b"".join(m)) for m in ws.sent]
+    start_frame = json.loads(bytes(frames[0][3]))
+    body = b"".join(bytes(f[3]) for f in frames if f[0] == MessageType.SYNC_RESPONSE_CHUNK)
+    assert frames[-1][0] == MessageType.SYNC_RESPONSE_END
+    return start_frame["statusCode"], start_frame["headers"], body
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_hit_served_without_handler(self, cached_client):
+        cache = ResponseCache()
+        client, calls = cached_client(cache, {"Cache-Control": ["max-age=60"]})
+
+        first = await request(client)
+        second = await request(client)
+
+        assert calls == ["/items"]
+        assert first[2] == second[2] == b"hello"
+        assert second[0] == 200
+        assert "ETag" in second[1]
+        assert second[1]["Age"] == ["0"]
+        assert cache.snapshot()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_304(self, cached_client):
+        cache = ResponseCache()
+        client, _ = cached_client(cache, {"Cache-Control": ["max-age=60"], "ETag": ['"v1"']})
+
+        await request(client)
+        status, headers, body = await request(client, headers={"If-None-Match": ['W/"v1"']})
+
+        assert status == 304
+        assert body == b""
+        assert headers["ETag"] == ['"v1"']
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {},
+            {"Cache-Control": ["no-store"]},
+            {"Cache-Control": ["private, max-age=60"]},
+            {"Cache-Control": ["max-age=60"], "Set-Cookie": ["a=b"]},
+        ],
+    )
+    async def test_uncacheable_responses(self, cached_client, headers):
+        client, calls = cached_client(ResponseCache(), headers)
+        await request(client)
+        await request(client)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_key_includes_path_and_selected_headers(self, cached_client):
+        client, calls = cached_client(ResponseCache(key_headers=("Accept",)), {"Cache-Control": ["max-age=60"]})
+        await request(client, "/a", {"Accept": ["application/json"]})
+        await request(client, "/a", {"Accept": ["text/html"]})
+        await request(client, "/b", {"Accept": ["application/json"]})
+        await request(client, "/a", {"Accept": ["application/json"], "X-Other": ["1"]})
+        assert calls == ["/a", "/a", "/b"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("response_headers", "stored"),
+        [
+            ({"Cache-Control": ["max-age=60"]}, False),
+            ({"Cache-Control": ["public, max-age=60"]}, True),
+            ({"Cache-Control": ["s-maxage=60"]}, True),
+        ],
+    )
+    async def test_authorized_request_needs_explicit_shared_caching(self, cached_client, response_headers, stored):
+        cache = ResponseCache()
+        client, calls = cached_client(cache, response_headers)
+        await request(client, headers={"Authorization": ["Bearer alice"]})
+        assert (len(cache) == 1) is stored
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("vary", "stored"),
+        [
+            (["Accept"], True),
+            (["accept-language"], False),
+            (["Accept", "Accept-Language"], False),
+            (["*"], False),
+        ],
+    )
+    async def test_vary_must_be_covered_by_key_headers(self, cached_client, vary, stored):
+        """Une réponse qui varie selon un en-tête absent de la clé n'est pas stockée."""
+        cache = ResponseCache(key_headers=("Accept",))
+        client, calls = cached_client(cache, {"Cache-Control": ["max-age=60"], "Vary": vary})
+        await request(client, headers={"Accept": ["text/html"], "Accept-Language": ["fr"]})
+        await request(client, headers={"Accept": ["text/html"], "Accept-Language": ["en"]})
+        assert len(calls) == (1 if stored else 2)
+
+    @pytest.mark.asyncio
+    async def test_request_no_cache_bypasses_lookup(self, cached_client):
+        client, calls = cached_client(ResponseCache(), {"Cache-Control": ["max-age=60"]})
+        await request(client)
+        await request(client, headers={"Cache-Control": ["no-cache"]})
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry(self, cached_client, monkeypatch):
+        client, calls = cached_client(ResponseCache(default_ttl=5), {})
+        await request(client)
+        now = time.monotonic()
+        monkeypatch.setattr("slimfaas_client._response_cache.time.monotonic", lambda: now + 6)
+        await request(client)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_bounded_by_bytes(self, cached_client):
+        cache = ResponseCache(max_bytes=12, max_entry_bytes=10)
+        client, calls = cached_client(cache, {"Cache-Control": ["max-age=60"]}, body=b"0123456789")
+        await request(client, "/a")
+        await request(client, "/b")
+        assert len(cache) == 1
+        assert cache.size == 10
+        await request(client, "/b")
+        await request(client, "/a")
+        assert calls == ["/a", "/b", "/a"]
+        assert cache.snapshot()["evictions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_oversized_body_not_stored(self, cached_client):
+        cache = ResponseCache(max_bytes=100, max_entry_bytes=4)
+        client, calls = cached_client(cache, {"Cache-Control": ["max-age=60"]})
+        assert (await request(client))[2] == b"hello"
+        assert len(cache) == 0
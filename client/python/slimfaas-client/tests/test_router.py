@@ -0,0 +1,207 @@
+"""
+Tests du routeur intégré (routes méthode/chemin et handlers par événement).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import AsyncRequest, BinaryFrame, MessageType, PublishEvent, SlimFaasClientConfig
+from slimfaas_client._pool import SlimFaasClientPool
+from slimfaas_client._router import RouteTable
+
+
+def make_request(method: str, path: str) -> AsyncRequest:
+    return AsyncRequest.from_payload({"elementId": "e1", "method": method, "path": path, "query": "", "headers": {}})
+
+
+def make_event(name: str) -> PublishEvent:
+    return PublishEvent.from_payload({"eventName": name, "method": "POST", "path": "/", "query": "", "headers": {}})
+
+
+def last_callback_status(ws) -> int:
+    return json.loads(ws.sent[-1])["payload"]["statusCode"]
+
+
+class TestRouteTable:
+    def setup_method(self):
+        self.table = RouteTable()
+        self.table.add("GET", "/orders", "list")
+        self.table.add("GET", "/orders/{id}", "get")
+        self.table.add("DELETE", "/orders/{id}", "delete")
+        self.table.add("GET", "/orders/latest", "latest")
+        self.table.add("GET", "/orders/{id}/items/{item}", "item")
+        self.table.add("*", "/files/{path:path}", "files")
+
+    @pytest.mark.parametrize(
+        ("method", "path", "handler", "params"),
+        [
+            ("GET", "/orders", "list", {}),
+            ("GET", "/orders/", "list", {}),
+            ("GET", "/orders/42", "get", {"id": "42"}),
+            ("delete", "/orders/42", "delete", {"id": "42"}),
+            ("GET", "/orders/latest", "latest", {}),
+            ("GET", "/orders/7/items/a%20b", "item", {"id": "7", "item": "a b"}),
+            ("PUT", "/files/a/b/c.txt", "files", {"path": "a/b/c.txt"}),
+        ],
+    )
+    def test_match(self, method, path, handler, params):
+        assert self.table.match(method, path) == (handler, params, True)
+
+    def test_static_segment_falls_back_to_parameter(self):
+        # "latest" n'a pas de route DELETE : le paramètre {id} prend le relais.
+        assert self.table.match("DELETE", "/orders/latest") == ("delete", {"id": "latest"}, True)
+
+    def test_unknown_path_and_method(self):
+        assert self.table.match("GET", "/unknown") == (None, {}, False)
+        assert self.table.match("POST", "/orders/42") == (None, {}, True)
+
+    def test_duplicate_route(self):
+        with pytest.raises(ValueError):
+            self.table.add("GET", "/orders/{id}", "again")
+
+    def test_conflicting_parameter_names(self):
+        with pytest.raises(ValueError):
+            self.table.add("PUT", "/orders/{order_id}", "put")
+
+
+class TestClientRouting:
+    @pytest.mark.asyncio
+    async def test_async_route_with_params(self, make_client, ws):
+        client = make_client()
+        seen: list[dict] = []
+
+        @client.route("POST", "/orders/{id}")
+        async def create(req: AsyncRequest) -> int:
+            seen.append(req.path_params)
+            return 201
+
+        await client._dispatch_async_request(ws, make_request("POST", "/orders/9"))  # type: ignore[arg-type]
+        assert seen == [{"id": "9"}]
+        assert last_callback_status(ws) == 201
+
+        await client._dispatch_async_request(ws, make_request("POST", "/nowhere"))  # type: ignore[arg-type]
+        assert last_callback_status(ws) == 404
+        await client._dispatch_async_request(ws, make_request("GET", "/orders/9"))  # type: ignore[arg-type]
+        assert last_callback_status(ws) == 405
+
+    @pytest.mark.asyncio
+    async def test_previous_handler_becomes_fallback(self, make_client, ws):
+        client = make_client()
+
+        async def legacy(req: AsyncRequest) -> int:
+            return 299
+
+        client.on_async_request(legacy)
+
+        @client.route("GET", "/health")
+        def health(req: AsyncRequest) -> int:  # handler bloquant : exécuté sur le pool de threads
+            return 200
+
+        await client._dispatch_async_request(ws, make_request("GET", "/health"))  # type: ignore[arg-type]
+        assert last_callback_status(ws) == 200
+        await client._dispatch_async_request(ws, make_request("GET", "/other"))  # type: ignore[arg-type]
+        assert last_callback_status(ws) == 299
+
+    @pytest.mark.asyncio
+    async def test_sync_route(self, make_client, ws):
+        client = make_client()
+
+        @client.sync_route("GET", "/items/{id}")
+        async def get_item(req) -> None:
+            await req.response.write(req.path_params["id"].encode())
+
+        for corr, path in (("a" * 36, "/items/5"), ("b" * 36, "/missing")):
+            start = json.dumps({"method": "GET", "path": path, "query": "", "headers": {}}).encode()
+            client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+            client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+        for task in list(client.concurrency.sync_requests._tasks):
+            await task
+
+        frames = [BinaryFrame.decode(bytes(m)) for m in ws.sent]
+        bodies = {corr: bytes(p) for t, corr, _, p in frames if t == MessageType.SYNC_RESPONSE_CHUNK}
+        statuses = {corr: json.loads(bytes(p))["statusCode"] for t, corr, _, p in frames if t == MessageType.SYNC_RESPONSE_START}
+        assert bodies == {"a" * 36: b"5"}
+        assert statuses == {"a" * 36: 200, "b" * 36: 404}
+
+    @pytest.mark.asyncio
+    async def test_event_handlers_by_name(self):
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        received: list[str] = []
+
+        @client.on_event("order-created")
+        async def created(evt: PublishEvent) -> None:
+            received.append("created")
+
+        @client.on_event("order-updated")
+        async def updated(evt: PublishEvent) -> None:
+            received.append("updated")
+
+        for name in ("order-updated", "order-created", "unknown"):
+            await client._dispatch_publish_event(make_event(name))
+        assert received == ["updated", "created"]
+
+        with pytest.raises(ValueError):
+            client.on_event("order-created")(created)
+
+    @pytest.mark.asyncio
+    async def test_startup_hooks_reach_routed_handlers(self):
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        calls: list[str] = []
+
+        class Handler:
+            async def __call__(self, req) -> int:
+                return 200
+
+            async def startup(self) -> None:
+                calls.append("startup")
+
+            async def shutdown(self) -> None:
+                calls.append("shutdown")
+
+        client.route("GET", "/")(Handler())
+        await client._run_handler_hooks("startup")
+        await client._run_handler_hooks("shutdown")
+        assert calls == ["startup", "shutdown"]
+
+    @pytest.mark.asyncio
+    async def test_hooks_run_once_with_every_kind_of_route(self):
+        """Les trois dispatchs du routeur ne lancent les hooks qu'une fois."""
+        client = SlimFaasClient("ws://fake", SlimFaasClientConfig(function_name="f"))
+        calls: list[str] = []
+
+        class Handler:
+            async def __call__(self, message) -> int:
+                return 200
+
+            async def startup(self) -> None:
+                calls.append("startup")
+
+            async def shutdown(self) -> None:
+                calls.append("shutdown")
+
+        handler = Handler()
+        client.route("GET", "/")(handler)
+        client.sync_route("GET", "/")(handler)
+        client.on_event("order-created")(handler)
+        await client._run_handler_hooks("startup")
+        await client._run_handler_hooks("shutdown")
+        assert calls == ["startup", "shutdown"]
+
+
+class TestPoolRouting:
+    @pytest.mark.asyncio
+    async def test_routes_shared_by_every_connection(self, make_ws):
+        pool = SlimFaasClientPool("ws://fake", SlimFaasClientConfig(function_name="f"), size=2)
+
+        @pool.route("GET", "/ping")
+        async def ping(req: AsyncRequest) -> int:
+            return 204
+
+        for client in pool.clients:
+            ws = make_ws()
+            await client._dispatch_async_request(ws, make_request("GET", "/ping"))  # type: ignore[arg-type]
+            assert last_callback_status(ws) == 204
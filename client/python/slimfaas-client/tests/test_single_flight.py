@@ -0,0 +1,177 @@
+"""
+Tests de la fusion des requêtes synchrones identiques et simultanées (SingleFlight).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType
+from slimfaas_client._single_flight import SingleFlight
+
+
+def start_request(
+    client: SlimFaasClient, ws, corr: str, path: str = "/items", method: str = "GET", headers: dict | None = None
+) -> None:
+    start = json.dumps({"method": method, "path": path, "query": "", "headers": headers or {}}).encode()
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+
+
+def responses(ws) -> dict[str, tuple[int, bytes, bool]]:
+    """Regroupe les trames envoyées par correlationId : (statut, corps, terminé)."""
+    result: dict[str, list] = {}
+    for message in ws.sent:
+        msg_type, corr, _, payload = BinaryFrame.decode(bytes(message) if not isinstance(message, list) else b"".join(message))
+        entry = result.setdefault(corr, [0, b"", False])
+        if msg_type == MessageType.SYNC_RESPONSE_START:
+            entry[0] = json.loads(bytes(payload))["statusCode"]
+        elif msg_type == MessageType.SYNC_RESPONSE_CHUNK:
+            entry[1] += bytes(payload)
+        elif msg_type == MessageType.SYNC_RESPONSE_END:
+            entry[2] = True
+    return {corr: tuple(entry) for corr, entry in result.items()}  # type: ignore[misc]
+
+
+async def settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def coalescing_client(make_client):
+    def factory(single_flight: SingleFlight) -> tuple[SlimFaasClient, asyncio.Event, list[str]]:
+        client = make_client(single_flight=single_flight)
+        release = asyncio.Event()
+        calls: list[str] = []
+
+        async def handler(req) -> None:
+            calls.append(req.correlation_id)
+            await req.response.start(200, {"Content-Type": ["text/plain"]})
+            await req.response.write(b"part1-")
+            await release.wait()
+            await req.response.write(bytearray(b"part2"))
+
+        client.on_sync_request(handler)
+        return client, release, calls
+
+    return factory
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_execution(self, coalescing_client, ws):
+        coalescing = SingleFlight()
+        client, release, calls = coalescing_client(coalescing)
+        corrs = [str(i) * 36 for i in range(3)]
+
+        start_request(client, ws, corrs[0])
+        await settle()
+        # Arrivent après que le leader a déjà envoyé une partie du corps.
+        start_request(client, ws, corrs[1])
+        start_request(client, ws, corrs[2])
+        await settle()
+        release.set()
+        await settle()
+
+        assert calls == [corrs[0]]
+        result = responses(ws)
+        assert all(result[c] == (200, b"part1-part2", True) for c in corrs)
+        assert coalescing.snapshot() == {"flights": 1, "coalesced": 2, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_run_separately(self, coalescing_client, ws):
+        client, release, calls = coalescing_client(SingleFlight())
+        release.set()
+        start_request(client, ws, "a" * 36)
+        await settle()
+        start_request(client, ws, "b" * 36)
+        await settle()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_paths_and_methods_not_coalesced(self, coalescing_client, ws):
+        client, release, calls = coalescing_client(SingleFlight())
+        start_request(client, ws, "a" * 36, "/a")
+        start_request(client, ws, "b" * 36, "/b")
+        start_request(client, ws, "c" * 36, "/a", method="POST")
+        await settle()
+        release.set()
+        await settle()
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_no_join_after_replay_limit(self, coalescing_client, ws):
+        client, release, calls = coalescing_client(SingleFlight(max_replay_bytes=4))
+        start_request(client, ws, "a" * 36)
+        await settle()
+        start_request(client, ws, "b" * 36)
+        await settle()
+        release.set()
+        await settle()
+        assert len(calls) == 2
+        assert responses(ws)["b" * 36] == (200, b"part1-part2", True)
+
+    @pytest.mark.asyncio
+    async def test_followers_ended_when_leader_fails(self, make_client, ws):
+        client = make_client(single_flight=SingleFlight())
+        release = asyncio.Event()
+
+        async def handler(req) -> None:
+            await req.response.start(200)
+            await release.wait()
+            raise RuntimeError("boom")
+
+        client.on_sync_request(handler)
+        start_request(client, ws, "a" * 36)
+        await settle()
+        start_request(client, ws, "b" * 36)
+        release.set()
+        await settle()
+
+        assert responses(ws)["b" * 36] == (200, b"", True)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("key_headers", "headers", "executions"),
+        [
+            ((), {"Authorization": ["Bearer alice"]}, 2),
+            ((), {"Cookie": ["session=alice"]}, 2),
+            (("Authorization",), {"Authorization": ["Bearer alice"]}, 1),
+        ],
+    )
+    async def test_credentials_not_shared(self, coalescing_client, ws, key_headers, headers, executions):
+        """Deux appelants authentifiés ne partagent une réponse que si l'en-tête fait partie de la clé."""
+        client, release, calls = coalescing_client(SingleFlight(key_headers=key_headers))
+        start_request(client, ws, "a" * 36, headers=headers)
+        await settle()
+        start_request(client, ws, "b" * 36, headers=headers)
+        await settle()
+        release.set()
+        await settle()
+        assert len(calls) == executions
+
+    @pytest.mark.asyncio
+    async def test_abandon_before_start_sends_502(self):
+        sent: list = []
+
+        async def send_start(corr, response) -> None:
+            sent.append((corr, "start", response.status_code))
+
+        async def send_chunk(corr, data) -> None:
+            sent.append((corr, "chunk", bytes(data)))
+
+        async def send_end(corr) -> None:
+            sent.append((corr, "end"))
+
+        coalescing = SingleFlight()
+        key = coalescing.key("GET", "/items", "", {})
+        flight = coalescing.lead(key, send_start, send_chunk, send_end)  # type: ignore[arg-type]
+        assert coalescing.join(key, send_start, send_chunk, send_end, "follower")  # type: ignore[arg-type]
+        await flight.abandon()
+        await settle()
+        assert sent == [("follower", "start", 502), ("follower", "end")]
@@ -0,0 +1,148 @@
+"""
+Tests du spooling des corps de requête volumineux sur disque.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import pickle
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import (
+    AsyncRequest,
+    MessageType,
+    PublishEvent,
+    SlimFaasClientConfig,
+    SyncBodyStream,
+)
+from slimfaas_client._spool import BodySpooler, SpooledBody
+
+
+def async_payload(body: bytes) -> dict:
+    return {
+        "elementId": "e1",
+        "method": "POST",
+        "path": "/upload",
+        "query": "",
+        "headers": {},
+        "body": base64.b64encode(body).decode(),
+        "isLastTry": False,
+        "tryNumber": 1,
+    }
+
+
+class TestSpooledBody:
+    def test_bytes_and_file_interfaces(self, tmp_path):
+        data = os.urandom(5000)
+        body = BodySpooler(threshold=10, directory=str(tmp_path)).spool_base64(base64.b64encode(data).decode())
+
+        assert isinstance(body, SpooledBody)
+        assert len(body) == 5000
+        assert body[:10] == data[:10]
+        assert bytes(memoryview(body)) == data
+        assert body.read(100) == data[:100]
+        body.seek(0)
+        with open(body.name, "rb") as f:
+            assert f.read() == data
+
+        body.close()
+        body.close()
+        assert not os.path.exists(body.name)
+
+    def test_pickles_as_bytes(self, tmp_path):
+        body = BodySpooler(threshold=0, directory=str(tmp_path)).spool_base64(base64.b64encode(b"abc").decode())
+        assert pickle.loads(pickle.dumps(body)) == b"abc"
+        body.close()
+
+
+class TestLazyBodySpooling:
+    def test_large_async_body_is_spooled(self, tmp_path):
+        data = os.urandom(3000)
+        req = AsyncRequest.from_payload(async_payload(data), BodySpooler(threshold=1000, directory=str(tmp_path)))
+
+        assert isinstance(req.body, SpooledBody)
+        assert req.body[:] == data
+        assert base64.b64decode(req.body_base64) == data
+        req._release_body()
+        assert os.listdir(tmp_path) == []
+
+    def test_small_async_body_stays_in_memory(self, tmp_path):
+        req = AsyncRequest.from_payload(async_payload(b"small"), BodySpooler(threshold=1000, directory=str(tmp_path)))
+        assert req.body == b"small"
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_client_deletes_spooled_event_body_after_handler(self, tmp_path):
+        client = SlimFaasClient(
+            "ws://fake",
+            SlimFaasClientConfig(function_name="f"),
+            spooler=BodySpooler(threshold=10, directory=str(tmp_path)),
+        )
+        seen: list[int] = []
+
+        async def handler(evt: PublishEvent) -> None:
+            seen.append(len(evt.body))
+            assert len(os.listdir(tmp_path)) == 1
+
+        client.on_publish_event(handler)
+        evt = PublishEvent.from_payload(
+            {"eventName": "ev", "method": "POST", "path": "/", "body": base64.b64encode(bytes(100)).decode()},
+            client._spooler,
+        )
+        await client._dispatch_publish_event(evt)
+
+        assert seen == [100]
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_spooled_body_kept_for_deferred_callback(self, tmp_path, make_client, ws):
+        """Avec un statut 202, le handler garde l'accès au corps après son retour."""
+        client = make_client(spooler=BodySpooler(threshold=10, directory=str(tmp_path)))
+        kept: list[AsyncRequest] = []
+
+        async def handler(req: AsyncRequest) -> int:
+            kept.append(req)
+            return 202 if len(req.body) else 200
+
+        client.on_async_request(handler)
+        await client._handle_message(  # type: ignore[arg-type]
+            ws, json.dumps({"type": MessageType.ASYNC_REQUEST, "correlationId": "e1", "payload": async_payload(bytes(64))})
+        )
+        for client_task in list(client.concurrency.async_requests._tasks):
+            await client_task
+
+        assert ws.sent == []
+        assert kept[0].body[:] == bytes(64)
+        kept[0]._release_body()
+
+
+class TestSyncBodyStreamSpooling:
+    @pytest.mark.asyncio
+    async def test_readall_spools_above_threshold(self, tmp_path):
+        stream = SyncBodyStream(spooler=BodySpooler(threshold=8, directory=str(tmp_path)))
+        for chunk in (b"hello ", b"spooled ", b"world"):
+            stream._feed(memoryview(chunk))
+        stream._close()
+
+        body = await stream.readall()
+        assert isinstance(body, SpooledBody)
+        assert body[:] == b"hello spooled world"
+        assert stream.at_eof()
+
+        stream._discard()
+        assert body.closed
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_readall_below_threshold_returns_bytes(self, tmp_path):
+        stream = SyncBodyStream(spooler=BodySpooler(threshold=100, directory=str(tmp_path)))
+        stream._feed(memoryview(b"abc"))
+        stream._feed(memoryview(b"def"))
+        stream._close()
+
+        assert await stream.read() == b"abcdef"
+        assert os.listdir(tmp_path) == []
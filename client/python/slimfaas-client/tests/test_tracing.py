@@ -0,0 +1,258 @@
+"""
+Tests de la propagation du contexte de trace W3C et des hooks de tracing.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+
+import pytest
+
+from slimfaas_client._models import AsyncRequest, BinaryFrame, Headers, MessageType, PublishEvent
+from slimfaas_client._tracing import TraceContext, Tracer, get_trace_context
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class Span:
+    def __init__(self, name, parent, attributes, kind):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes)
+        self.kind = kind
+        self.error = None
+        self.ended = False
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.active: list[Span] = []
+
+    def start_span(self, name, parent, attributes, start_time_ns=None, kind="internal"):
+        if parent is None and kind == "internal" and self.active:
+            parent = self.active[-1]
+        span = Span(name, parent, attributes, kind)
+        self.spans.append(span)
+        return span
+
+    def end_span(self, span, *, attributes=None, error=None, end_time_ns=None):
+        span.attributes.update(attributes or {})
+        span.error = error
+        span.ended = True
+
+    @contextlib.contextmanager
+    def activate(self, span):
+        self.active.append(span)
+        try:
+            yield span
+        finally:
+            self.active.pop()
+
+    def by_name(self) -> dict[str, Span]:
+        return {span.name: span for span in self.spans}
+
+
+class FailingTracer(Tracer):
+    """Tracer dont chaque hook lève une exception."""
+
+    def __init__(self, failing: str):
+        self.failing = failing
+        self.spans: list[Span] = []
+
+    def start_span(self, name, parent, attributes, start_time_ns=None, kind="internal"):
+        if self.failing == "start_span":
+            raise RuntimeError("exporter down")
+        span = Span(name, parent, attributes, kind)
+        self.spans.append(span)
+        return span
+
+    def end_span(self, span, *, attributes=None, error=None, end_time_ns=None):
+        if self.failing == "end_span":
+            raise RuntimeError("exporter down")
+        span.ended = True
+
+    def activate(self, span):
+        if self.failing == "activate":
+            raise RuntimeError("exporter down")
+        return contextlib.nullcontext()
+
+
+def make_request(headers: dict) -> AsyncRequest:
+    return AsyncRequest.from_payload({"elementId": "e1", "method": "POST", "path": "/orders", "query": "", "headers": headers})
+
+
+class TestTraceContext:
+    def test_parse(self):
+        context = TraceContext.parse(TRACEPARENT, "vendor=value")
+        assert context is not None
+        assert (context.trace_id, context.parent_id, context.sampled) == (
+            "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True
+        )
+        assert context.traceparent == TRACEPARENT
+        assert context.tracestate == "vendor=value"
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "garbage",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7",
+            "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01",
+            "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01-extra",
+            "00-xyz92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+        ],
+    )
+    def test_invalid(self, value):
+        assert TraceContext.parse(value) is None
+
+    def test_from_headers_case_insensitive(self):
+        raw = {"TraceParent": [TRACEPARENT], "TRACESTATE": ["a=1"]}
+        assert TraceContext.from_headers(raw) == TraceContext.parse(TRACEPARENT, "a=1")
+        assert TraceContext.from_headers(Headers(raw)) == TraceContext.parse(TRACEPARENT, "a=1")
+        assert TraceContext.from_headers({}) is None
+
+
+class TestClientTracing:
+    @pytest.mark.asyncio
+    async def test_no_tracer_no_context(self, make_client, ws):
+        client = make_client()
+        seen: list = []
+
+        async def handler(req) -> int:
+            seen.append(get_trace_context())
+            return 200
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request({"traceparent": [TRACEPARENT]}))  # type: ignore[arg-type]
+        assert seen == [None]
+
+    @pytest.mark.asyncio
+    async def test_async_request_spans(self, make_client, ws):
+        tracer = RecordingTracer()
+        client = make_client(tracer=tracer)
+        seen: list = []
+
+        async def handler(req) -> int:
+            seen.append((get_trace_context(), tracer.active[-1].name))
+            return 201
+
+        client.on_async_request(handler)
+        await client._dispatch_async_request(ws, make_request({"traceparent": [TRACEPARENT]}), 0.0)  # type: ignore[arg-type]
+
+        assert seen == [(TraceContext.parse(TRACEPARENT), "slimfaas.handler")]
+        assert get_trace_context() is None
+        spans = tracer.by_name()
+        request = spans["slimfaas.async_request"]
+        assert request.parent == TraceContext.parse(TRACEPARENT)
+        assert request.kind == "consumer"
+        assert request.attributes["slimfaas.element_id"] == "e1"
+        assert request.attributes["http.response.status_code"] == 201
+        assert spans["slimfaas.queue_wait"].parent is request
+        assert spans["slimfaas.handler"].parent is request
+        assert all(span.ended for span in tracer.spans)
+
+    @pytest.mark.asyncio
+    async def test_event_handler_error_recorded(self, make_client):
+        tracer = RecordingTracer()
+        client = make_client(tracer=tracer)
+
+        async def handler(evt) -> None:
+            raise RuntimeError("boom")
+
+        client.on_publish_event(handler)
+        evt = PublishEvent.from_payload({"eventName": "evt", "method": "POST", "path": "/", "query": "", "headers": {}})
+        await client._dispatch_publish_event(evt)
+
+        spans = tracer.by_name()
+        assert spans["slimfaas.publish_event"].parent is None
+        assert isinstance(spans["slimfaas.handler"].error, RuntimeError)
+        assert "slimfaas.queue_wait" not in spans
+
+    @pytest.mark.asyncio
+    async def test_sync_response_span(self, make_client, ws):
+        tracer = RecordingTracer()
+        client = make_client(tracer=tracer)
+
+        async def handler(req) -> None:
+            await req.response.start(200)
+            await req.response.write(b"hello")
+            await req.response.write(memoryview(b"world"))
+
+        client.on_sync_request(handler)
+        corr = "c" * 36
+        start = json.dumps({"method": "GET", "path": "/", "query": "", "headers": {"traceparent": [TRACEPARENT]}}).encode()
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+        for task in list(client.concurrency.sync_requests._tasks):
+            await task
+
+        spans = tracer.by_name()
+        response = spans["slimfaas.sync_response"]
+        assert response.parent is spans["slimfaas.handler"]
+        assert response.attributes == {
+            "http.response.status_code": 200,
+            "slimfaas.response.bytes": 10,
+            "slimfaas.response.completed": True,
+        }
+        assert spans["slimfaas.sync_request"].parent == TraceContext.parse(TRACEPARENT)
+        assert all(span.ended for span in tracer.spans)
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failing", ["start_span", "end_span", "activate"])
+    async def test_failing_tracer_does_not_break_requests(self, make_client, ws, failing, caplog):
+        """Une erreur du tracer est journalisée ; la requête et sa réponse continuent."""
+        tracer = FailingTracer(failing)
+        client = make_client(tracer=tracer)
+        client.on_async_request(lambda req: 201)
+
+        async def handler(req) -> None:
+            await req.response.start(200)
+            await req.response.write(b"ok")
+
+        client.on_sync_request(handler)
+        await client._dispatch_async_request(ws, make_request({"traceparent": [TRACEPARENT]}), 0.0)  # type: ignore[arg-type]
+        corr = "c" * 36
+        start = json.dumps({"method": "GET", "path": "/", "query": "", "headers": {}}).encode()
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))  # type: ignore[arg-type]
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))  # type: ignore[arg-type]
+        for task in list(client.concurrency.sync_requests._tasks):
+            await task
+
+        assert json.loads(ws.sent[0])["payload"]["statusCode"] == 201
+        frames = [BinaryFrame.decode(bytes(m)) for m in ws.sent[1:]]
+        assert [f[0] for f in frames] == [
+            MessageType.SYNC_RESPONSE_START, MessageType.SYNC_RESPONSE_CHUNK, MessageType.SYNC_RESPONSE_END
+        ]
+        assert get_trace_context() is None
+        assert f"Tracer.{failing} failed" in caplog.text
+
+    def test_tracer_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            Tracer()  # type: ignore[abstract]
+
+
+class TestOpenTelemetryTracer:
+    @pytest.mark.asyncio
+    async def test_spans_join_caller_trace(self, make_client, ws):
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        from slimfaas_client._tracing import OpenTelemetryTracer
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        client = make_client(tracer=OpenTelemetryTracer(provider.get_tracer("test")))
+        client.on_async_request(lambda req: 200)
+        await client._dispatch_async_request(ws, make_request({"traceparent": [TRACEPARENT]}), 0.0)  # type: ignore[arg-type]
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {"slimfaas.async_request", "slimfaas.queue_wait", "slimfaas.handler"}
+        assert all(format(s.context.trace_id, "032x") == "4bf92f3577b34da6a3ce929d0e0e4736" for s in spans.values())
+        assert spans["slimfaas.handler"].parent.span_id == spans["slimfaas.async_request"].context.span_id
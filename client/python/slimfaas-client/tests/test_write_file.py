@@ -0,0 +1,125 @@
+"""
+Tests de SyncResponseWriter.write_file (envoi de fichiers par fenêtres).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+
+import pytest
+
+from slimfaas_client._buffering import ResponseBuffering
+from slimfaas_client._models import SyncResponseWriter, _parse_byte_range
+
+
+class Recorder:
+    def __init__(self):
+        self.status = None
+        self.headers: dict = {}
+        self.chunks: list[bytes] = []
+
+    async def start(self, corr, response) -> None:
+        self.status = response.status_code
+        self.headers = response.headers
+
+    async def chunk(self, corr, data) -> None:
+        self.chunks.append(bytes(data))
+
+    async def end(self, corr) -> None:
+        pass
+
+
+def make_writer(buffering=None) -> tuple[SyncResponseWriter, Recorder]:
+    rec = Recorder()
+    return SyncResponseWriter("c" * 36, rec.start, rec.chunk, rec.end, buffering=buffering), rec
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    data = os.urandom(100_000)
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(data)
+    return path, data
+
+
+class TestWriteFile:
+    @pytest.mark.asyncio
+    async def test_streams_path_in_windows(self, data_file):
+        path, data = data_file
+        writer, rec = make_writer()
+
+        sent = await writer.write_file(str(path), window_size=30_000)
+
+        assert sent == len(data)
+        assert rec.status == 200
+        assert rec.headers["Content-Length"] == [str(len(data))]
+        assert rec.headers["Accept-Ranges"] == ["bytes"]
+        assert [len(c) for c in rec.chunks] == [30_000, 30_000, 30_000, 10_000]
+        assert b"".join(rec.chunks) == data
+
+    @pytest.mark.asyncio
+    async def test_offset_and_length_unaligned(self, data_file):
+        path, data = data_file
+        writer, rec = make_writer()
+        with open(path, "rb") as f:
+            sent = await writer.write_file(f, offset=12_345, length=50_000, window_size=8192)
+        assert sent == 50_000
+        assert b"".join(rec.chunks) == data[12_345:62_345]
+
+    @pytest.mark.asyncio
+    async def test_range_request(self, data_file):
+        path, data = data_file
+        writer, rec = make_writer()
+        sent = await writer.write_file(path, range_header="bytes=100-199")
+        assert rec.status == 206
+        assert rec.headers["Content-Range"] == [f"bytes 100-199/{len(data)}"]
+        assert rec.headers["Content-Length"] == ["100"]
+        assert sent == 100
+        assert b"".join(rec.chunks) == data[100:200]
+
+    @pytest.mark.asyncio
+    async def test_unsatisfiable_range(self, data_file):
+        path, data = data_file
+        writer, rec = make_writer()
+        assert await writer.write_file(path, range_header=f"bytes={len(data)}-") == 0
+        assert rec.status == 416
+        assert rec.headers["Content-Range"] == [f"bytes */{len(data)}"]
+        assert rec.chunks == []
+
+    @pytest.mark.asyncio
+    async def test_in_memory_file_object(self):
+        """Un objet fichier sans descripteur est lu par fenêtres."""
+        writer, rec = make_writer()
+        sent = await writer.write_file(io.BytesIO(b"0123456789"), offset=2, window_size=3)
+        assert sent == 8
+        assert rec.chunks == [b"234", b"567", b"89"]
+
+    @pytest.mark.asyncio
+    async def test_flushes_buffered_writes_first(self, data_file):
+        path, data = data_file
+        writer, rec = make_writer(ResponseBuffering(frame_size=1024, max_frame_size=50_000, flush_interval=None))
+        await writer.start(200)
+        await writer.write(b"prefix")
+        await writer.write_file(path)
+        assert rec.chunks[0] == b"prefix"
+        assert max(len(c) for c in rec.chunks) <= 50_000
+        assert b"".join(rec.chunks[1:]) == data
+
+
+class TestParseByteRange:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=90-", (90, 99)),
+            ("bytes=-10", (90, 99)),
+            ("bytes=50-500", (50, 99)),
+            ("bytes=100-", ()),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+            ("bytes=abc", None),
+        ],
+    )
+    def test_parse(self, header, expected):
+        assert _parse_byte_range(header, 100) == expected
@@ -0,0 +1,155 @@
+"""
+Tests de l'adaptateur WSGI (application WSGI sur un pool de threads borné).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from slimfaas_client._client import SlimFaasClient
+from slimfaas_client._models import BinaryFrame, MessageType
+from slimfaas_client._wsgi import WSGIHandler
+
+
+@pytest.fixture
+def mount(make_client):
+    def factory(app, **kwargs) -> tuple[SlimFaasClient, WSGIHandler]:
+        client = make_client()
+        handler = WSGIHandler(app, **kwargs)
+        client.on_sync_request(handler)
+        return client, handler
+
+    return factory
+
+
+def start_request(client, ws, corr: str, *, method="POST", path="/", query="", headers=None, chunks=()) -> None:
+    start = json.dumps({"method": method, "path": path, "query": query, "headers": headers or {}}).encode()
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_START, corr, start)))
+    for chunk in chunks:
+        client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_CHUNK, corr, chunk)))
+    client._handle_binary_frame(ws, bytes(BinaryFrame.encode(MessageType.SYNC_REQUEST_END, corr, b"", 1)))
+
+
+async def finish(client: SlimFaasClient) -> None:
+    for task in list(client.concurrency.sync_requests._tasks):
+        await task
+
+
+def responses(ws) -> dict[str, dict]:
+    result: dict[str, dict] = {}
+    for message in ws.sent:
+        msg_type, corr, _, payload = BinaryFrame.decode(bytes(message))
+        entry = result.setdefault(corr, {"status": 0, "headers": {}, "chunks": [], "ended": False})
+        if msg_type == MessageType.SYNC_RESPONSE_START:
+            start = json.loads(bytes(payload))
+            entry["status"], entry["headers"] = start["statusCode"], start["headers"]
+        elif msg_type == MessageType.SYNC_RESPONSE_CHUNK:
+            entry["chunks"].append(bytes(payload))
+        elif msg_type == MessageType.SYNC_RESPONSE_END:
+            entry["ended"] = True
+    return result
+
+
+def echo_app(environ, start_response):
+    first_line = environ["wsgi.input"].readline()
+    rest = environ["wsgi.input"].read()
+    start_response("201 Created", [("Content-Type", "text/plain"), ("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")])
+    yield first_line
+    yield b""
+    yield rest
+    yield f"|{environ['REQUEST_METHOD']} {environ['PATH_INFO']}?{environ['QUERY_STRING']} {environ['HTTP_X_TOKEN']}".encode()
+
+
+class TestWSGIHandler:
+    @pytest.mark.asyncio
+    async def test_request_and_response_streamed(self, mount, ws):
+        client, _ = mount(echo_app)
+        start_request(
+            client, ws, "a" * 36, path="/a%20b", query="?x=1",
+            headers={"X-Token": ["t"], "Content-Type": ["text/plain"]}, chunks=(b"line1\nli", b"ne2"),
+        )
+        await finish(client)
+        response = responses(ws)["a" * 36]
+        assert response["status"] == 201
+        assert response["headers"] == {"Content-Type": ["text/plain"], "Set-Cookie": ["a=1", "b=2"]}
+        # Un élément de l'itérable = une trame, les éléments vides sont ignorés.
+        assert response["chunks"] == [b"line1\n", b"line2", b"|POST /a b?x=1 t"]
+        assert response["ended"]
+
+    @pytest.mark.asyncio
+    async def test_environ(self, mount, ws):
+        environs: list[dict] = []
+
+        def app(environ, start_response):
+            environs.append(environ)
+            start_response("204 No Content", [])
+            return []
+
+        client, _ = mount(app, script_name="/function/f")
+        start_request(client, ws, "a" * 36, method="get", headers={"Host": ["example.org:8080"], "Content-Length": ["0"]})
+        await finish(client)
+        environ = environs[0]
+        assert (environ["REQUEST_METHOD"], environ["SCRIPT_NAME"]) == ("GET", "/function/f")
+        assert (environ["SERVER_NAME"], environ["SERVER_PORT"]) == ("example.org", "8080")
+        assert environ["CONTENT_LENGTH"] == "0"
+        assert responses(ws)["a" * 36]["status"] == 204
+
+    @pytest.mark.asyncio
+    async def test_iterable_closed(self, mount, ws):
+        closed: list[bool] = []
+
+        class Body:
+            def __iter__(self):
+                yield b"x"
+
+            def close(self):
+                closed.append(True)
+
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            return Body()
+
+        client, _ = mount(app)
+        start_request(client, ws, "a" * 36)
+        await finish(client)
+        assert closed == [True]
+        assert responses(ws)["a" * 36]["chunks"] == [b"x"]
+
+    @pytest.mark.asyncio
+    async def test_error_before_start_returns_500(self, mount, ws):
+        def app(environ, start_response):
+            raise RuntimeError("boom")
+
+        client, _ = mount(app)
+        start_request(client, ws, "a" * 36)
+        await finish(client)
+        response = responses(ws)["a" * 36]
+        assert (response["status"], response["ended"]) == (500, True)
+
+    @pytest.mark.asyncio
+    async def test_saturation_metrics(self, mount, ws):
+        release = threading.Event()
+
+        def app(environ, start_response):
+            release.wait(5)
+            start_response("200 OK", [])
+            return [b"ok"]
+
+        client, handler = mount(app, workers=1)
+        for corr in ("a" * 36, "b" * 36, "c" * 36):
+            start_request(client, ws, corr)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if handler.snapshot()["busy"] == 1:
+                break
+        assert handler.snapshot() == {"workers": 1, "busy": 1, "waiting": 2, "requests": 3, "saturated": 2}
+
+        release.set()
+        await finish(client)
+        assert handler.snapshot()["busy"] == handler.snapshot()["waiting"] == 0
+        assert all(r["chunks"] == [b"ok"] for r in responses(ws).values())
+        await handler.shutdown()